@@ -0,0 +1,84 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import ActivityLog, ActivityLogArchive
+
+
+ARCHIVE_FIELDS = [
+    'id', 'user_id', 'action', 'entity_type', 'entity_id',
+    'entity_name', 'description', 'metadata', 'created_at',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Move activity logs older than ACTIVITY_LOG_HOT_DAYS into the archive '
+        'table in small batches, and optionally purge old archived rows'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows moved per transaction')
+        parser.add_argument(
+            '--sleep', type=float, default=0.1,
+            help='Seconds to pause between batches so writers are not starved',
+        )
+        parser.add_argument(
+            '--purge-days', type=int, default=None,
+            help='Also delete archived rows older than this many days',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be moved')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=settings.ACTIVITY_LOG_HOT_DAYS)
+        old    = ActivityLog.objects.filter(created_at__lt=cutoff)
+
+        if options['dry_run']:
+            self.stdout.write(f'{old.count()} activity logs older than {cutoff:%Y-%m-%d} would be archived')
+            return
+
+        moved = 0
+        while True:
+            batch = self._archive_batch(cutoff, options['batch_size'])
+            if not batch:
+                break
+            moved += batch
+            self.stdout.write(f'Archived {moved} so far...')
+            time.sleep(options['sleep'])
+        self.stdout.write(self.style.SUCCESS(f'Archived {moved} activity logs older than {cutoff:%Y-%m-%d}'))
+
+        if options['purge_days'] is not None:
+            purge_before = timezone.now() - timedelta(days=options['purge_days'])
+            purged = 0
+            while True:
+                ids = list(
+                    ActivityLogArchive.objects.filter(created_at__lt=purge_before)
+                    .order_by('id').values_list('id', flat=True)[:options['batch_size']]
+                )
+                if not ids:
+                    break
+                purged += ActivityLogArchive.objects.filter(id__in=ids).delete()[0]
+                time.sleep(options['sleep'])
+            self.stdout.write(self.style.SUCCESS(
+                f'Purged {purged} archived activity logs older than {purge_before:%Y-%m-%d}'
+            ))
+
+    @staticmethod
+    def _archive_batch(cutoff, batch_size):
+        """Copy one batch of old rows to the archive and delete them, in one short transaction."""
+        with transaction.atomic():
+            rows = list(
+                ActivityLog.objects.filter(created_at__lt=cutoff)
+                .order_by('id')
+                .select_for_update(skip_locked=True)
+                .values(*ARCHIVE_FIELDS)[:batch_size]
+            )
+            if not rows:
+                return 0
+            ActivityLogArchive.objects.bulk_create([ActivityLogArchive(**row) for row in rows])
+            ActivityLog.objects.filter(id__in=[row['id'] for row in rows]).delete()
+        return len(rows)
@@ -1,6 +1,6 @@
 from django.conf import settings
 from django.contrib.sessions.middleware import SessionMiddleware
-from .utils import set_current_user
+from .utils import activity_buffer, set_current_user
 
 class AdminSessionMiddleware(SessionMiddleware):
     def process_request(self, request):
@@ -24,6 +24,9 @@ class CurrentUserMiddleware:
     Stores the authenticated request user in thread-local storage
     so that signals (which have no access to request) can log the
     correct user via log_activity().
+
+    The request also runs inside `activity_buffer`, so every ActivityLog
+    entry it commits is written with a single bulk INSERT at the end.
     """
     def __init__(self, get_response):
         self.get_response = get_response
@@ -34,9 +37,11 @@ class CurrentUserMiddleware:
         else:
             set_current_user(None)
 
-        response = self.get_response(request)
-
-        # Always clear after request to avoid user leaking between threads
-        set_current_user(None)
+        try:
+            with activity_buffer:
+                response = self.get_response(request)
+        finally:
+            # Always clear after request to avoid user leaking between threads
+            set_current_user(None)
 
         return response
\ No newline at end of file
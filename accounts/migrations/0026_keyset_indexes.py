@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-17 00:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0025_alter_activitylog_action_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['created_at', 'id'], name='accounts_ac_created_837827_idx'),
+        ),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 5.2.4 on 2026-10-17 00:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+COLUMNS = 'id, user_id, action, entity_type, entity_id, entity_name, description, metadata, created_at'
+
+CREATE_COMBINED_VIEW = f'''
+    CREATE VIEW accounts_activitylog_combined AS
+    SELECT {COLUMNS} FROM accounts_activitylog
+    UNION ALL
+    SELECT {COLUMNS} FROM accounts_activitylogarchive
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0026_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CombinedActivityLog',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('action', models.CharField(choices=[('LEAD_CREATED', 'Lead Created'), ('LEAD_UPDATED', 'Lead Updated'), ('LEAD_STATUS_CHANGED', 'Lead Status Changed'), ('LEAD_ASSIGNED', 'Lead Assigned'), ('LEAD_SUB_ASSIGNED', 'Lead Sub-Assigned'), ('LEAD_UNASSIGNED', 'Lead Unassigned'), ('LEAD_PROCESSING_UPDATED', 'Lead Processing Updated'), ('LEAD_REMARK_UPDATED', 'Lead Remark Updated'), ('LEAD_DELETED', 'Lead Deleted'), ('FOLLOWUP_CREATED', 'Follow-Up Created'), ('FOLLOWUP_STATUS_CHANGED', 'Follow-Up Status Changed'), ('FOLLOWUP_CONVERTED', 'Follow-Up Converted to Lead'), ('FOLLOWUP_DELETED', 'Follow-Up Deleted'), ('TASK_CREATED', 'Task Created'), ('TASK_UPDATED', 'Task Updated'), ('TASK_STATUS_CHANGED', 'Task Status Changed'), ('TASK_COMPLETED', 'Task Completed'), ('TASK_CANCELLED', 'Task Cancelled'), ('TASK_OVERDUE', 'Task Marked Overdue'), ('TASK_DELETED', 'Task Deleted'), ('STAFF_CREATED', 'Staff Created'), ('STAFF_UPDATED', 'Staff Updated'), ('STAFF_ACTIVATED', 'Staff Activated'), ('STAFF_DEACTIVATED', 'Staff Deactivated'), ('STAFF_DELETED', 'Staff Deleted'), ('USER_LOGIN', 'User Logged In'), ('USER_LOGOUT', 'User Logged Out'), ('MICROWORK_CREATED', 'Micro Work Created'), ('MICROWORK_COMPLETED', 'Micro Work Completed'), ('MICROWORK_DELETED', 'Micro Work Deleted'), ('TRAINER_CREATED', 'Trainer Profile Created'), ('TRAINER_UPDATED', 'Trainer Profile Updated'), ('TRAINER_STATUS_CHANGED', 'Trainer Status Changed'), ('TRAINER_DELETED', 'Trainer Profile Deleted'), ('STUDENT_ENROLLED', 'Student Enrolled'), ('STUDENT_UPDATED', 'Student Updated'), ('STUDENT_COMPLETED', 'Student Completed Course'), ('STUDENT_DROPPED', 'Student Dropped'), ('STUDENT_PAUSED', 'Student Paused'), ('STUDENT_REACTIVATED', 'Student Reactivated'), ('STUDENT_TRAINER_CHANGED', 'Student Trainer Changed'), ('STUDENT_BATCH_CHANGED', 'Student Batch Changed'), ('STUDENT_DELETED', 'Student Deleted'), ('ATTENDANCE_MARKED', 'Attendance Marked'), ('ATTENDANCE_UPDATED', 'Attendance Updated'), ('PENALTY_ISSUED', 'Penalty Issued'), ('PENALTY_UPDATED', 'Penalty Updated'), ('PENALTY_DELETED', 'Penalty Deleted'), ('ATTENDANCE_DOC_UPLOADED', 'Attendance Document Uploaded'), ('ATTENDANCE_DOC_DELETED', 'Attendance Document Deleted')], max_length=60)),
+                ('entity_type', models.CharField(max_length=50)),
+                ('entity_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('entity_name', models.CharField(blank=True, max_length=255)),
+                ('description', models.TextField()),
+                ('metadata', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'accounts_activitylog_combined',
+                'ordering': ['-created_at'],
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ActivityLogArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('action', models.CharField(choices=[('LEAD_CREATED', 'Lead Created'), ('LEAD_UPDATED', 'Lead Updated'), ('LEAD_STATUS_CHANGED', 'Lead Status Changed'), ('LEAD_ASSIGNED', 'Lead Assigned'), ('LEAD_SUB_ASSIGNED', 'Lead Sub-Assigned'), ('LEAD_UNASSIGNED', 'Lead Unassigned'), ('LEAD_PROCESSING_UPDATED', 'Lead Processing Updated'), ('LEAD_REMARK_UPDATED', 'Lead Remark Updated'), ('LEAD_DELETED', 'Lead Deleted'), ('FOLLOWUP_CREATED', 'Follow-Up Created'), ('FOLLOWUP_STATUS_CHANGED', 'Follow-Up Status Changed'), ('FOLLOWUP_CONVERTED', 'Follow-Up Converted to Lead'), ('FOLLOWUP_DELETED', 'Follow-Up Deleted'), ('TASK_CREATED', 'Task Created'), ('TASK_UPDATED', 'Task Updated'), ('TASK_STATUS_CHANGED', 'Task Status Changed'), ('TASK_COMPLETED', 'Task Completed'), ('TASK_CANCELLED', 'Task Cancelled'), ('TASK_OVERDUE', 'Task Marked Overdue'), ('TASK_DELETED', 'Task Deleted'), ('STAFF_CREATED', 'Staff Created'), ('STAFF_UPDATED', 'Staff Updated'), ('STAFF_ACTIVATED', 'Staff Activated'), ('STAFF_DEACTIVATED', 'Staff Deactivated'), ('STAFF_DELETED', 'Staff Deleted'), ('USER_LOGIN', 'User Logged In'), ('USER_LOGOUT', 'User Logged Out'), ('MICROWORK_CREATED', 'Micro Work Created'), ('MICROWORK_COMPLETED', 'Micro Work Completed'), ('MICROWORK_DELETED', 'Micro Work Deleted'), ('TRAINER_CREATED', 'Trainer Profile Created'), ('TRAINER_UPDATED', 'Trainer Profile Updated'), ('TRAINER_STATUS_CHANGED', 'Trainer Status Changed'), ('TRAINER_DELETED', 'Trainer Profile Deleted'), ('STUDENT_ENROLLED', 'Student Enrolled'), ('STUDENT_UPDATED', 'Student Updated'), ('STUDENT_COMPLETED', 'Student Completed Course'), ('STUDENT_DROPPED', 'Student Dropped'), ('STUDENT_PAUSED', 'Student Paused'), ('STUDENT_REACTIVATED', 'Student Reactivated'), ('STUDENT_TRAINER_CHANGED', 'Student Trainer Changed'), ('STUDENT_BATCH_CHANGED', 'Student Batch Changed'), ('STUDENT_DELETED', 'Student Deleted'), ('ATTENDANCE_MARKED', 'Attendance Marked'), ('ATTENDANCE_UPDATED', 'Attendance Updated'), ('PENALTY_ISSUED', 'Penalty Issued'), ('PENALTY_UPDATED', 'Penalty Updated'), ('PENALTY_DELETED', 'Penalty Deleted'), ('ATTENDANCE_DOC_UPLOADED', 'Attendance Document Uploaded'), ('ATTENDANCE_DOC_DELETED', 'Attendance Document Deleted')], max_length=60)),
+                ('entity_type', models.CharField(max_length=50)),
+                ('entity_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('entity_name', models.CharField(blank=True, max_length=255)),
+                ('description', models.TextField()),
+                ('metadata', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Archived Activity Log',
+                'verbose_name_plural': 'Archived Activity Logs',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['user', 'created_at'], name='accounts_ac_user_id_df2351_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['entity_type', 'entity_id', 'created_at'], name='accounts_ac_entity__174552_idx'),
+        ),
+        migrations.AddField(
+            model_name='activitylogarchive',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_activity_logs', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='activitylogarchive',
+            index=models.Index(fields=['created_at', 'id'], name='accounts_ac_created_f7f87e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylogarchive',
+            index=models.Index(fields=['user', 'created_at'], name='accounts_ac_user_id_04da18_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylogarchive',
+            index=models.Index(fields=['entity_type', 'entity_id', 'created_at'], name='accounts_ac_entity__4186fc_idx'),
+        ),
+        migrations.RunSQL(CREATE_COMBINED_VIEW, 'DROP VIEW IF EXISTS accounts_activitylog_combined'),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-17 00:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0027_activitylog_archive'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='activitylog',
+            name='action',
+            field=models.CharField(choices=[('LEAD_CREATED', 'Lead Created'), ('LEAD_UPDATED', 'Lead Updated'), ('LEAD_STATUS_CHANGED', 'Lead Status Changed'), ('LEAD_ASSIGNED', 'Lead Assigned'), ('LEAD_SUB_ASSIGNED', 'Lead Sub-Assigned'), ('LEAD_UNASSIGNED', 'Lead Unassigned'), ('LEAD_PROCESSING_UPDATED', 'Lead Processing Updated'), ('LEAD_REMARK_UPDATED', 'Lead Remark Updated'), ('LEAD_DELETED', 'Lead Deleted'), ('FOLLOWUP_CREATED', 'Follow-Up Created'), ('FOLLOWUP_STATUS_CHANGED', 'Follow-Up Status Changed'), ('FOLLOWUP_RESCHEDULED', 'Follow-Up Rescheduled'), ('FOLLOWUP_CONVERTED', 'Follow-Up Converted to Lead'), ('FOLLOWUP_DELETED', 'Follow-Up Deleted'), ('TASK_CREATED', 'Task Created'), ('TASK_UPDATED', 'Task Updated'), ('TASK_STATUS_CHANGED', 'Task Status Changed'), ('TASK_COMPLETED', 'Task Completed'), ('TASK_CANCELLED', 'Task Cancelled'), ('TASK_OVERDUE', 'Task Marked Overdue'), ('TASK_DELETED', 'Task Deleted'), ('STAFF_CREATED', 'Staff Created'), ('STAFF_UPDATED', 'Staff Updated'), ('STAFF_ACTIVATED', 'Staff Activated'), ('STAFF_DEACTIVATED', 'Staff Deactivated'), ('STAFF_DELETED', 'Staff Deleted'), ('USER_LOGIN', 'User Logged In'), ('USER_LOGOUT', 'User Logged Out'), ('MICROWORK_CREATED', 'Micro Work Created'), ('MICROWORK_COMPLETED', 'Micro Work Completed'), ('MICROWORK_DELETED', 'Micro Work Deleted'), ('TRAINER_CREATED', 'Trainer Profile Created'), ('TRAINER_UPDATED', 'Trainer Profile Updated'), ('TRAINER_STATUS_CHANGED', 'Trainer Status Changed'), ('TRAINER_DELETED', 'Trainer Profile Deleted'), ('STUDENT_ENROLLED', 'Student Enrolled'), ('STUDENT_UPDATED', 'Student Updated'), ('STUDENT_COMPLETED', 'Student Completed Course'), ('STUDENT_DROPPED', 'Student Dropped'), ('STUDENT_PAUSED', 'Student Paused'), ('STUDENT_REACTIVATED', 'Student Reactivated'), ('STUDENT_TRAINER_CHANGED', 'Student Trainer Changed'), ('STUDENT_BATCH_CHANGED', 'Student Batch Changed'), ('STUDENT_DELETED', 'Student Deleted'), ('ATTENDANCE_MARKED', 'Attendance Marked'), ('ATTENDANCE_UPDATED', 'Attendance Updated'), ('PENALTY_ISSUED', 'Penalty Issued'), ('PENALTY_UPDATED', 'Penalty Updated'), ('PENALTY_DELETED', 'Penalty Deleted'), ('ATTENDANCE_DOC_UPLOADED', 'Attendance Document Uploaded'), ('ATTENDANCE_DOC_DELETED', 'Attendance Document Deleted')], db_index=True, max_length=60),
+        ),
+        migrations.AlterField(
+            model_name='activitylogarchive',
+            name='action',
+            field=models.CharField(choices=[('LEAD_CREATED', 'Lead Created'), ('LEAD_UPDATED', 'Lead Updated'), ('LEAD_STATUS_CHANGED', 'Lead Status Changed'), ('LEAD_ASSIGNED', 'Lead Assigned'), ('LEAD_SUB_ASSIGNED', 'Lead Sub-Assigned'), ('LEAD_UNASSIGNED', 'Lead Unassigned'), ('LEAD_PROCESSING_UPDATED', 'Lead Processing Updated'), ('LEAD_REMARK_UPDATED', 'Lead Remark Updated'), ('LEAD_DELETED', 'Lead Deleted'), ('FOLLOWUP_CREATED', 'Follow-Up Created'), ('FOLLOWUP_STATUS_CHANGED', 'Follow-Up Status Changed'), ('FOLLOWUP_RESCHEDULED', 'Follow-Up Rescheduled'), ('FOLLOWUP_CONVERTED', 'Follow-Up Converted to Lead'), ('FOLLOWUP_DELETED', 'Follow-Up Deleted'), ('TASK_CREATED', 'Task Created'), ('TASK_UPDATED', 'Task Updated'), ('TASK_STATUS_CHANGED', 'Task Status Changed'), ('TASK_COMPLETED', 'Task Completed'), ('TASK_CANCELLED', 'Task Cancelled'), ('TASK_OVERDUE', 'Task Marked Overdue'), ('TASK_DELETED', 'Task Deleted'), ('STAFF_CREATED', 'Staff Created'), ('STAFF_UPDATED', 'Staff Updated'), ('STAFF_ACTIVATED', 'Staff Activated'), ('STAFF_DEACTIVATED', 'Staff Deactivated'), ('STAFF_DELETED', 'Staff Deleted'), ('USER_LOGIN', 'User Logged In'), ('USER_LOGOUT', 'User Logged Out'), ('MICROWORK_CREATED', 'Micro Work Created'), ('MICROWORK_COMPLETED', 'Micro Work Completed'), ('MICROWORK_DELETED', 'Micro Work Deleted'), ('TRAINER_CREATED', 'Trainer Profile Created'), ('TRAINER_UPDATED', 'Trainer Profile Updated'), ('TRAINER_STATUS_CHANGED', 'Trainer Status Changed'), ('TRAINER_DELETED', 'Trainer Profile Deleted'), ('STUDENT_ENROLLED', 'Student Enrolled'), ('STUDENT_UPDATED', 'Student Updated'), ('STUDENT_COMPLETED', 'Student Completed Course'), ('STUDENT_DROPPED', 'Student Dropped'), ('STUDENT_PAUSED', 'Student Paused'), ('STUDENT_REACTIVATED', 'Student Reactivated'), ('STUDENT_TRAINER_CHANGED', 'Student Trainer Changed'), ('STUDENT_BATCH_CHANGED', 'Student Batch Changed'), ('STUDENT_DELETED', 'Student Deleted'), ('ATTENDANCE_MARKED', 'Attendance Marked'), ('ATTENDANCE_UPDATED', 'Attendance Updated'), ('PENALTY_ISSUED', 'Penalty Issued'), ('PENALTY_UPDATED', 'Penalty Updated'), ('PENALTY_DELETED', 'Penalty Deleted'), ('ATTENDANCE_DOC_UPLOADED', 'Attendance Document Uploaded'), ('ATTENDANCE_DOC_DELETED', 'Attendance Document Deleted')], max_length=60),
+        ),
+    ]
@@ -5,9 +5,12 @@ from django.db import models
 from django.utils import timezone
 from cloudinary.models import CloudinaryField
 import os
+from utils.models import DirtyFieldsMixin
 
 
-class User(AbstractUser):
+class User(DirtyFieldsMixin, AbstractUser):
+    tracked_fields = ['is_active']  # read by accounts.signals
+
     ROLE_CHOICES = [
         ('ADMIN', 'General Manager'),
         ('OPS', 'Operations Manager'),
@@ -90,6 +93,7 @@ class ActivityLog(models.Model):
         # ── Follow-Up ─────────────────────────────────────────
         ('FOLLOWUP_CREATED',        'Follow-Up Created'),
         ('FOLLOWUP_STATUS_CHANGED', 'Follow-Up Status Changed'),
+        ('FOLLOWUP_RESCHEDULED',    'Follow-Up Rescheduled'),
         ('FOLLOWUP_CONVERTED',      'Follow-Up Converted to Lead'),
         ('FOLLOWUP_DELETED',        'Follow-Up Deleted'),
  
@@ -164,6 +168,9 @@ class ActivityLog(models.Model):
             models.Index(fields=['action']),
             models.Index(fields=['entity_type']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['user', 'created_at']),
+            models.Index(fields=['entity_type', 'entity_id', 'created_at']),
         ]
  
     def __str__(self):
@@ -171,9 +178,59 @@ class ActivityLog(models.Model):
         return f"[{self.created_at:%Y-%m-%d %H:%M}] {user_str} — {self.get_action_display()}"
 
 
+class ActivityLogArchive(models.Model):
+    """
+    ActivityLog rows older than ACTIVITY_LOG_HOT_DAYS, moved here in batches
+    by `manage.py archive_activity_logs`. Rows keep their original id.
+    """
+    id          = models.BigIntegerField(primary_key=True)
+    user        = models.ForeignKey(settings.AUTH_USER_MODEL,on_delete=models.SET_NULL,null=True, blank=True,related_name='archived_activity_logs')
+    action      = models.CharField(max_length=60, choices=ActivityLog.ACTION_CHOICES)
+    entity_type = models.CharField(max_length=50)
+    entity_id   = models.PositiveIntegerField(null=True, blank=True)
+    entity_name = models.CharField(max_length=255, blank=True)
+    description = models.TextField()
+    metadata    = models.JSONField(default=dict, blank=True)
+    created_at  = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Archived Activity Log'
+        verbose_name_plural = 'Archived Activity Logs'
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['user', 'created_at']),
+            models.Index(fields=['entity_type', 'entity_id', 'created_at']),
+        ]
+
+
+class CombinedActivityLog(models.Model):
+    """
+    Read-only view over ActivityLog UNION ALL ActivityLogArchive (see
+    accounts migration 0027). ActivityLogListView reads it when the
+    requested dates reach past the hot window.
+    """
+    id          = models.BigIntegerField(primary_key=True)
+    user        = models.ForeignKey(settings.AUTH_USER_MODEL,on_delete=models.DO_NOTHING,null=True, blank=True,related_name='+',db_constraint=False)
+    action      = models.CharField(max_length=60, choices=ActivityLog.ACTION_CHOICES)
+    entity_type = models.CharField(max_length=50)
+    entity_id   = models.PositiveIntegerField(null=True, blank=True)
+    entity_name = models.CharField(max_length=255, blank=True)
+    description = models.TextField()
+    metadata    = models.JSONField(default=dict, blank=True)
+    created_at  = models.DateTimeField()
+
+    class Meta:
+        managed  = False
+        db_table = 'accounts_activitylog_combined'
+        ordering = ['-created_at']
+
+
+
 
+class MicroWork(DirtyFieldsMixin, models.Model):
+    tracked_fields = ['status']  # read by accounts.signals
 
-class MicroWork(models.Model):
     STATUS_CHOICES = [
         ('PENDING', 'Pending'),
         ('COMPLETED', 'Completed'),
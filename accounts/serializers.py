@@ -1,6 +1,6 @@
 from django.contrib.auth import authenticate
 from rest_framework import serializers
-from .models import User,ActivityLog
+from .models import User,ActivityLog,CombinedActivityLog
 
 
 # Login Serializer
@@ -143,4 +143,10 @@ class ActivityLogSerializer(serializers.ModelSerializer):
     def get_user_name(self, obj):
         if obj.user:
             return obj.user.get_full_name() or obj.user.username
-        return 'System'
\ No newline at end of file
+        return 'System'
+
+
+class CombinedActivityLogSerializer(ActivityLogSerializer):
+    """Same payload as ActivityLogSerializer, for rows read across the archive."""
+    class Meta(ActivityLogSerializer.Meta):
+        model = CombinedActivityLog
\ No newline at end of file
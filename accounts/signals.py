@@ -19,13 +19,7 @@ def _user_label(user):
 @receiver(pre_save, sender=User)
 def capture_user_old_state(sender, instance, **kwargs):
     """Snapshot the old is_active before save so we can detect activation/deactivation."""
-    if instance.pk:
-        try:
-            instance._old_is_active = User.objects.get(pk=instance.pk).is_active
-        except User.DoesNotExist:
-            instance._old_is_active = None
-    else:
-        instance._old_is_active = None
+    instance._old_is_active = instance.old_value('is_active')
 
 
 @receiver(post_save, sender=User)
@@ -115,13 +109,7 @@ def log_user_logout(sender, request, user, **kwargs):
 
 @receiver(pre_save, sender=MicroWork)
 def capture_microwork_old_state(sender, instance, **kwargs):
-    if instance.pk:
-        try:
-            instance._old_status = MicroWork.objects.get(pk=instance.pk).status
-        except MicroWork.DoesNotExist:
-            instance._old_status = None
-    else:
-        instance._old_status = None
+    instance._old_status = instance.old_value('status')
 
 
 @receiver(post_save, sender=MicroWork)
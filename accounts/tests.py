@@ -1,3 +1,48 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .models import ActivityLog, ActivityLogArchive, User
+
+
+class ActivityLogFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin', password='x', role='ADMIN')
+        cls.recent = ActivityLog.objects.create(
+            action='LEAD_CREATED', entity_type='Lead', entity_name='Recent', description='Recent lead',
+        )
+        old = timezone.now() - timedelta(days=settings.ACTIVITY_LOG_HOT_DAYS + 30)
+        cls.archived = ActivityLogArchive.objects.create(
+            id=cls.recent.id + 1000, action='LEAD_CREATED', entity_type='Lead',
+            entity_name='Archived', description='Archived lead', created_at=old,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def names(self, **params):
+        # Creating the admin logs a Staff entry too
+        response = self.client.get('/api/activities/', {'entity_type': 'Lead', **params})
+        self.assertEqual(response.status_code, 200)
+        return [row['entity_name'] for row in response.data['results']]
+
+    def test_default_feed_continues_into_the_archive(self):
+        self.assertEqual(self.names(), ['Recent', 'Archived'])
+        self.assertEqual(self.names(cursor=''), ['Recent', 'Archived'])
+
+    def test_range_inside_the_hot_window_reads_the_hot_table(self):
+        since = timezone.localdate() - timedelta(days=7)
+        self.assertEqual(self.names(date_from=since.isoformat()), ['Recent'])
+
+    def test_range_before_the_hot_window_reads_the_archive(self):
+        since = timezone.localdate() - timedelta(days=settings.ACTIVITY_LOG_HOT_DAYS + 60)
+        self.assertEqual(self.names(date_from=since.isoformat()), ['Recent', 'Archived'])
 
-# Create your tests here.
+    def test_impossible_date_is_a_400(self):
+        response = self.client.get('/api/activities/', {'date_to': '2024-02-30'})
+        self.assertEqual(response.status_code, 400)
@@ -1,4 +1,7 @@
 import threading
+
+from django.db import transaction
+
 from .models import ActivityLog
 
 # ── Thread-local storage for current request user ─────────────────────────────
@@ -15,6 +18,105 @@ def get_current_user():
     return getattr(_thread_locals, 'current_user', None)
 
 
+def build_activity_log(
+    action,
+    entity_type,
+    description,
+    user=None,
+    entity_id=None,
+    entity_name='',
+    metadata=None,
+):
+    """
+    Build an unsaved ActivityLog entry (same arguments as log_activity).
+
+    Used by bulk code paths that write many entries with a single
+    ActivityLog.objects.bulk_create() instead of one INSERT each.
+    """
+    # If no user explicitly passed, fall back to thread-local request user
+    if user is None:
+        user = get_current_user()
+
+    return ActivityLog(
+        user=user,
+        action=action,
+        entity_type=entity_type,
+        entity_id=entity_id,
+        entity_name=entity_name,
+        description=description,
+        metadata=metadata or {},
+    )
+
+
+# ── Write-behind buffer for log_activity ─────────────────────────────────────
+class ActivityLogBuffer:
+    """
+    Collects log_activity() entries and writes them with one bulk_create.
+
+    Buffering is active inside `with activity_buffer:` (CurrentUserMiddleware
+    wraps every request in it; management commands can do the same). An
+    entry logged inside a transaction joins the buffer only when that
+    transaction commits, so entries from a rolled-back block or savepoint
+    are dropped exactly as their INSERT would have been. The buffer is
+    written when the outermost scope exits, when it reaches `max_size`, or
+    on an explicit flush(). Outside any scope log_activity() saves
+    immediately, as it always did.
+    """
+    max_size = 500
+
+    def __init__(self):
+        self._local = threading.local()
+
+    @property
+    def active(self):
+        return getattr(self._local, 'depth', 0) > 0
+
+    @property
+    def _pending(self):
+        if not hasattr(self._local, 'pending'):
+            self._local.pending = []
+        return self._local.pending
+
+    def __enter__(self):
+        self._local.depth = getattr(self._local, 'depth', 0) + 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if self._local.depth == 1:
+                self.flush()
+        finally:
+            self._local.depth -= 1
+        return False
+
+    def add(self, entry):
+        if not self.active:
+            entry.save()
+        elif transaction.get_connection().in_atomic_block:
+            transaction.on_commit(lambda: self._append(entry))
+        else:
+            self._append(entry)
+
+    def _append(self, entry):
+        # Commit hooks can run after the scope that logged the entry has closed
+        if not self.active:
+            entry.save()
+            return
+        self._pending.append(entry)
+        if len(self._pending) >= self.max_size:
+            self.flush()
+
+    def flush(self):
+        """Write every committed entry collected so far. Returns how many were written."""
+        entries, self._local.pending = self._pending, []
+        if entries:
+            ActivityLog.objects.bulk_create(entries)
+        return len(entries)
+
+
+activity_buffer = ActivityLogBuffer()
+
+
 def log_activity(
     action,
     entity_type,
@@ -37,17 +139,16 @@ def log_activity(
         entity_id    (int)  : PK of the related object
         entity_name  (str)  : Display name (lead name, task title, etc.)
         metadata     (dict) : Extra context (old/new values, status etc.)
-    """
-    # If no user explicitly passed, fall back to thread-local request user
-    if user is None:
-        user = get_current_user()
 
-    ActivityLog.objects.create(
-        user=user,
+    Inside a request (or `with activity_buffer:`) the INSERT is deferred and
+    batched; see ActivityLogBuffer.
+    """
+    activity_buffer.add(build_activity_log(
         action=action,
         entity_type=entity_type,
+        description=description,
+        user=user,
         entity_id=entity_id,
         entity_name=entity_name,
-        description=description,
-        metadata=metadata or {},
-    )
\ No newline at end of file
+        metadata=metadata,
+    ))
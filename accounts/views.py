@@ -8,10 +8,15 @@ from rest_framework.pagination import PageNumberPagination
 from .permissions import IsManagement, IsSuperAdmin
 from leads.models import Lead
 from trainers.models import Student
-from .models import User, ActivityLog
-from rest_framework.exceptions import PermissionDenied
+from .models import User, ActivityLog, CombinedActivityLog
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
+from datetime import datetime, time, timedelta
+from django.conf import settings
 from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from utils.pagination import KeysetPagination
 
 from .serializers import (
     StaffListSerializer,
@@ -19,7 +24,8 @@ from .serializers import (
     StaffCreateSerializer,
     StaffUpdateSerializer,
     LoginSerializer,
-    ActivityLogSerializer
+    ActivityLogSerializer,
+    CombinedActivityLogSerializer,
 )
 
 # Pagination 
@@ -29,6 +35,11 @@ class StaffPagination(PageNumberPagination):
     max_page_size = 100
 
 
+class ActivityLogPagination(KeysetPagination):
+    # Page size of the DEFAULT_PAGINATION_CLASS this view used before
+    page_size = 50
+
+
 # Dashboard Stats View
 class DashboardStatsAPIView(APIView):
     permission_classes = [IsAuthenticated]
@@ -47,16 +58,30 @@ class DashboardStatsAPIView(APIView):
 
 # Recent Activities View
 class ActivityLogListView(generics.ListAPIView):
-    serializer_class   = ActivityLogSerializer
+    """
+    Activity feed. Reads the hot ActivityLog table when ?date_from falls
+    within the last ACTIVITY_LOG_HOT_DAYS. Otherwise, including the default
+    feed with no dates, it reads CombinedActivityLog (hot + archive) with
+    the same filters and payload, so older entries follow on the later
+    pages. Newest-first pages of the combined view merge the two tables'
+    (created_at, id) indexes, so the first pages stay cheap.
+    """
     permission_classes = [IsAuthenticated]
+    pagination_class   = ActivityLogPagination
     filter_backends    = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields   = ['action', 'entity_type', 'user']
     search_fields      = ['entity_name', 'description']
     ordering_fields    = ['created_at']
     ordering           = ['-created_at']
  
+    def get_serializer_class(self):
+        if self._reads_archive():
+            return CombinedActivityLogSerializer
+        return ActivityLogSerializer
+
     def get_queryset(self):
-        qs = ActivityLog.objects.select_related('user').all()
+        model = CombinedActivityLog if self._reads_archive() else ActivityLog
+        qs = model.objects.select_related('user').all()
  
         # Role-based scoping
         # Admins see everything; others see only their own activities
@@ -67,17 +92,38 @@ class ActivityLogListView(generics.ListAPIView):
                 Q(user__isnull=True, entity_type='Staff', entity_id=user.pk)
             )
         
-        # Date range filters
-        date_from = self.request.query_params.get('date_from')
-        date_to   = self.request.query_params.get('date_to')
+        # Date range filters, as created_at ranges so the indexes apply
+        date_from = self._date_param('date_from')
+        date_to   = self._date_param('date_to')
         if date_from:
-            qs = qs.filter(created_at__date__gte=date_from)
+            qs = qs.filter(created_at__gte=_start_of_day(date_from))
         if date_to:
-            qs = qs.filter(created_at__date__lte=date_to)
+            qs = qs.filter(created_at__lt=_start_of_day(date_to + timedelta(days=1)))
  
         return qs
- 
 
+    def _date_param(self, name):
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            parsed = parse_date(value)
+        except ValueError:  # well formed but not a real date, e.g. 2024-02-30
+            parsed = None
+        if parsed is None:
+            raise ValidationError({name: 'Enter a date in YYYY-MM-DD format.'})
+        return parsed
+
+    def _reads_archive(self):
+        """True unless the requested range starts inside the hot window."""
+        date_from = self._date_param('date_from')
+        hot_since = timezone.localdate() - timedelta(days=settings.ACTIVITY_LOG_HOT_DAYS)
+        return date_from is None or date_from < hot_since
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+ 
 
 class CurrentUserAPIView(APIView):
     permission_classes = [IsAuthenticated]
@@ -1,35 +1,44 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from rest_framework import status
+from rest_framework import generics, status
 
 from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
-from django.db.models import Prefetch
+from django.db.models import Count, Max, Prefetch
 
 from .models import Conversation, Message
 from .serializers import ConversationSerializer, MessageSerializer
 from utils.pusher import pusher_client
 from utils import notify_new_message, notify_new_conversation
+from utils.conditional import ConditionalGetMixin
 
 User = get_user_model()
 
 
 #  Conversation List
-class ConversationListView(APIView):
+class ConversationListView(ConditionalGetMixin, generics.ListAPIView):
     permission_classes = [IsAuthenticated]
-
-    def get(self, request):
-        qs = Conversation.objects.filter(
-            participants=request.user
+    serializer_class   = ConversationSerializer
+    pagination_class   = None
+    # A new message changes last_message; conversations have no updated_at
+    etag_aggregates    = {
+        'count':        Count('id', distinct=True),
+        'last_message': Max('messages__id'),
+        'messages':     Count('messages', distinct=True),
+    }
+
+    def get_etag_queryset(self):
+        return Conversation.objects.filter(participants=self.request.user)
+
+    def get_queryset(self):
+        return Conversation.objects.filter(
+            participants=self.request.user
         ).prefetch_related(
             "participants",
             Prefetch("messages", queryset=Message.objects.order_by("-created_at"))
         ).order_by("-created_at")
 
-        serializer = ConversationSerializer(qs, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
-
 
 #  Message List
 class MessageListView(APIView):
@@ -1,6 +1,7 @@
 from django.db import models
 from cloudinary.models import CloudinaryField
 from django.conf import settings
+from utils.models import DirtyFieldsMixin
 
 
 class AttendanceDocument(models.Model):
@@ -26,7 +27,9 @@ class AttendanceDocument(models.Model):
         return f"{self.name} - {self.date}"
 
 
-class Penalty(models.Model):
+class Penalty(DirtyFieldsMixin, models.Model):
+    tracked_fields = ['amount', 'act']  # read by hr.signals
+
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -15,17 +15,8 @@ def _user_label(user):
 
 @receiver(pre_save, sender=Penalty)
 def capture_penalty_old_state(sender, instance, **kwargs):
-    if instance.pk:
-        try:
-            old = Penalty.objects.get(pk=instance.pk)
-            instance._old_penalty_amount = old.amount
-            instance._old_penalty_act    = old.act
-        except Penalty.DoesNotExist:
-            instance._old_penalty_amount = None
-            instance._old_penalty_act    = None
-    else:
-        instance._old_penalty_amount = None
-        instance._old_penalty_act    = None
+    instance._old_penalty_amount = instance.old_value('amount')
+    instance._old_penalty_act    = instance.old_value('act')
 
 
 @receiver(post_save, sender=Penalty)
@@ -1,9 +1,16 @@
 from django.contrib import admin
-from .models import Lead,ProcessingUpdate,RemarkHistory,LeadAssignment,FollowUp,FollowUpHistory
+from .models import Lead,ProcessingUpdate,RemarkHistory,LeadAssignment,FollowUp,FollowUpHistory,ImportJob,LeadStatsCounter,DuplicateLeadCandidate,LeadTombstone,LeadRoutingRule,LeadIntakeRollup,LeadStatusTransition
 
 admin.site.register(Lead)
 admin.site.register(ProcessingUpdate)
 admin.site.register(RemarkHistory)
 admin.site.register(LeadAssignment)
 admin.site.register(FollowUp)
-admin.site.register(FollowUpHistory)
\ No newline at end of file
+admin.site.register(FollowUpHistory)
+admin.site.register(ImportJob)
+admin.site.register(LeadStatsCounter)
+admin.site.register(DuplicateLeadCandidate)
+admin.site.register(LeadTombstone)
+admin.site.register(LeadRoutingRule)
+admin.site.register(LeadIntakeRollup)
+admin.site.register(LeadStatusTransition)
@@ -0,0 +1,183 @@
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from accounts.models import User, ActivityLog
+from accounts.utils import build_activity_log
+from utils import notify_leads_bulk_assigned
+
+from .models import Lead, LeadAssignment
+from .serializers import get_assignment_type
+from .stats import adjust_lead_stats, lead_state
+
+
+def _user_label(user):
+    return user.get_full_name() or user.username
+
+
+def _assignment_entries(lead, assignment_type, assignee, user):
+    """The ActivityLog rows log_lead_activity would write for this change."""
+    label   = lead.name
+    entries = []
+
+    if assignment_type == 'PRIMARY':
+        if lead.assigned_to_id != assignee.id:
+            entries.append(build_activity_log(
+                action='LEAD_ASSIGNED',
+                entity_type='Lead',
+                entity_id=lead.pk,
+                entity_name=label,
+                user=user,
+                description=f'Lead "{label}" was assigned to "{_user_label(assignee)}".',
+                metadata={'assigned_to': _user_label(assignee)},
+            ))
+        if lead.sub_assigned_to_id is not None:
+            entries.append(build_activity_log(
+                action='LEAD_UNASSIGNED',
+                entity_type='Lead',
+                entity_id=lead.pk,
+                entity_name=label,
+                user=user,
+                description=f'Lead "{label}" sub-assignment was removed.',
+            ))
+
+    elif lead.sub_assigned_to_id != assignee.id:
+        entries.append(build_activity_log(
+            action='LEAD_SUB_ASSIGNED',
+            entity_type='Lead',
+            entity_id=lead.pk,
+            entity_name=label,
+            user=user,
+            description=f'Lead "{label}" was sub-assigned to "{_user_label(assignee)}".',
+            metadata={'sub_assigned_to': _user_label(assignee)},
+        ))
+
+    return entries
+
+
+def bulk_assign_leads(user, lead_ids, assigned_to_id, notes=''):
+    """
+    Assign many leads to one user in a fixed number of queries.
+
+    The leads are loaded with one query and the assignee once; role rules are
+    checked in memory. The writes are one UPDATE per assignment type plus
+    bulk INSERTs for LeadAssignment and ActivityLog, all in one transaction.
+
+    Returns (success_count, failed_leads). failed_leads entries look like
+    LeadAssignSerializer errors: {'lead_id': ..., 'errors': {...}}.
+    """
+    failed_leads = []
+
+    try:
+        assigned_to_id = serializers.IntegerField().run_validation(assigned_to_id)
+    except serializers.ValidationError as exc:
+        return 0, [
+            {'lead_id': lead_id, 'errors': {'assigned_to_id': exc.detail}}
+            for lead_id in lead_ids
+        ]
+
+    id_field = serializers.IntegerField()
+    parsed   = []
+    for lead_id in lead_ids:
+        try:
+            parsed.append((lead_id, id_field.run_validation(lead_id), None))
+        except serializers.ValidationError as exc:
+            parsed.append((lead_id, None, {'lead_id': exc.detail}))
+
+    leads    = Lead.objects.in_bulk([pk for _, pk, _ in parsed if pk is not None])
+    assignee = User.objects.filter(id=assigned_to_id).first()
+
+    by_type = {'PRIMARY': [], 'SUB': []}
+    seen    = set()
+    for lead_id, pk, errors in parsed:
+        if errors:
+            failed_leads.append({'lead_id': lead_id, 'errors': errors})
+            continue
+        if pk in seen:
+            continue
+        seen.add(pk)
+
+        lead = leads.get(pk)
+        if lead is None:
+            failed_leads.append({'lead_id': lead_id, 'errors': {'lead_id': ['Lead not found.']}})
+            continue
+        if assignee is None:
+            failed_leads.append({'lead_id': lead_id, 'errors': {'assigned_to_id': ['User not found.']}})
+            continue
+
+        try:
+            assignment_type = get_assignment_type(user, lead, assignee)
+        except serializers.ValidationError as exc:
+            failed_leads.append({'lead_id': lead_id, 'errors': serializers.as_serializer_error(exc)})
+            continue
+
+        by_type[assignment_type].append(lead)
+
+    assigned = by_type['PRIMARY'] + by_type['SUB']
+    if not assigned:
+        return 0, failed_leads
+
+    now = timezone.now()
+    with transaction.atomic():
+        if by_type['PRIMARY']:
+            Lead.objects.filter(id__in=[lead.id for lead in by_type['PRIMARY']]).update(
+                assigned_to=assignee,
+                assigned_by=user,
+                assigned_date=now,
+                sub_assigned_to=None,
+                sub_assigned_by=None,
+                sub_assigned_date=None,
+                updated_at=now,
+            )
+        if by_type['SUB']:
+            Lead.objects.filter(id__in=[lead.id for lead in by_type['SUB']]).update(
+                sub_assigned_to=assignee,
+                sub_assigned_by=user,
+                sub_assigned_date=now,
+                updated_at=now,
+            )
+
+        history = []
+        entries = []
+        for assignment_type, group in by_type.items():
+            for lead in group:
+                history.append(LeadAssignment(
+                    lead=lead,
+                    assigned_to=assignee,
+                    assigned_by=user,
+                    assignment_type=assignment_type,
+                    notes=notes,
+                ))
+                entries.extend(_assignment_entries(lead, assignment_type, assignee, user))
+
+        LeadAssignment.objects.bulk_create(history)
+        ActivityLog.objects.bulk_create(entries)
+
+        adjust_lead_stats(
+            [
+                (lead_state(lead.status, lead.assigned_to_id, lead.sub_assigned_to_id),
+                 lead_state(lead.status, assignee.id, None))
+                for lead in by_type['PRIMARY']
+            ] + [
+                (lead_state(lead.status, lead.assigned_to_id, lead.sub_assigned_to_id),
+                 lead_state(lead.status, lead.assigned_to_id, assignee.id))
+                for lead in by_type['SUB']
+            ]
+        )
+
+    # 🔔 One grouped Pusher notification for the assignee (skipped for self-assignment)
+    if assignee != user:
+        for assignment_type, group in by_type.items():
+            if not group:
+                continue
+            notify_leads_bulk_assigned(
+                assignee_id=assignee.id,
+                assigned_by=user,
+                leads=[
+                    {'lead_id': lead.id, 'lead_name': lead.name, 'priority': lead.priority}
+                    for lead in group
+                ],
+                assignment_type=assignment_type,
+            )
+
+    return len(assigned), failed_leads
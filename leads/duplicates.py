@@ -0,0 +1,256 @@
+import re
+from collections import defaultdict
+from difflib import SequenceMatcher
+from itertools import combinations
+
+from django.db import transaction
+
+from accounts.models import ActivityLog, ActivityLogArchive
+from accounts.utils import log_activity
+
+from .models import (
+    DuplicateLeadCandidate,
+    FollowUp,
+    Lead,
+    LeadAssignment,
+    LeadStatusTransition,
+    ProcessingUpdate,
+    RemarkHistory,
+)
+
+
+# How much each matching key says about two leads being the same person.
+# Scores combine as 1 - Π(1 - weight), so phone + name beats phone alone.
+PHONE_WEIGHT = 0.8
+EMAIL_WEIGHT = 0.7
+NAME_WEIGHT  = 0.6
+
+NAME_THRESHOLD    = 0.85   # SequenceMatcher ratio for names to count at all
+DEFAULT_MIN_SCORE = 0.5
+MAX_BLOCK_SIZE    = 200    # larger blocks are too generic to compare pairwise
+PHONE_PREFIX_SIZE = 7      # '91' + 5 digits: sub-blocks an oversized name block
+
+# Related rows re-pointed to the surviving lead by merge_leads()
+MERGED_RELATIONS = [LeadAssignment, ProcessingUpdate, RemarkHistory, FollowUp, LeadStatusTransition]
+# Blank fields on the surviving lead filled from the duplicates
+MERGE_FILL_FIELDS = ['email', 'location', 'program', 'remarks']
+
+NAME_TITLES = {'mr', 'mrs', 'ms', 'miss', 'dr', 'sri', 'smt'}
+
+
+# ── Keys
+def normalize_name(name):
+    """'Dr. Anjali  NAIR' -> 'anjali nair' (letters only, titles dropped, tokens sorted)."""
+    tokens = re.findall(r'[a-z]+', (name or '').lower())
+    return ' '.join(sorted(token for token in tokens if token not in NAME_TITLES))
+
+
+def normalize_email(email):
+    """Lower-cased address with any '+tag' removed from the local part."""
+    email = (email or '').strip().lower()
+    local, _, domain = email.partition('@')
+    if not domain:
+        return ''
+    return f"{local.split('+', 1)[0]}@{domain}"
+
+
+def name_block_key(normalized):
+    """First three letters of each name token, e.g. 'anjali nair' -> 'anj|nai'."""
+    return '|'.join(token[:3] for token in normalized.split())
+
+
+def name_similarity(a, b):
+    if not a or not b:
+        return 0.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def pair_score(reasons, similarity):
+    miss = 1.0
+    if 'phone' in reasons:
+        miss *= 1 - PHONE_WEIGHT
+    if 'email' in reasons:
+        miss *= 1 - EMAIL_WEIGHT
+    if 'name' in reasons:
+        miss *= 1 - NAME_WEIGHT * similarity
+    return round(1 - miss, 4)
+
+
+# ── Detection
+def split_name_block(members, phones, domains):
+    """
+    Sub-blocks of an oversized name block: its leads grouped by phone
+    prefix and, separately, by email domain. A lead can be in one of each.
+    """
+    sub_blocks = defaultdict(list)
+    for lead_id in members:
+        if phones.get(lead_id):
+            sub_blocks[('phone', phones[lead_id][:PHONE_PREFIX_SIZE])].append(lead_id)
+        if domains.get(lead_id):
+            sub_blocks[('domain', domains[lead_id])].append(lead_id)
+    return sub_blocks
+
+
+def find_duplicate_pairs(min_score=DEFAULT_MIN_SCORE, max_block_size=MAX_BLOCK_SIZE):
+    """
+    Score likely duplicate lead pairs without comparing every lead to every
+    other one.
+
+    Leads are streamed once and grouped into blocks by normalized phone,
+    normalized email and a coarse name key; only leads sharing a block are
+    compared. A name block over `max_block_size` (a common name) is split
+    by phone prefix and by email domain; blocks still too large after that
+    are skipped and listed in stats['skipped'] as (kind, key, size).
+    Returns (pairs, stats) where pairs is a list of
+    (lead_a_id, lead_b_id, score, reasons) with lead_a_id < lead_b_id.
+    """
+    blocks  = defaultdict(list)
+    names   = {}
+    phones  = {}
+    domains = {}
+    rows    = (
+        Lead.objects.order_by()
+        .values_list('id', 'name', 'phone_normalized', 'email')
+        .iterator(chunk_size=5000)
+    )
+    for lead_id, name, phone, email in rows:
+        names[lead_id] = normalize_name(name)
+        if phone:
+            phones[lead_id] = phone
+            blocks[('phone', phone)].append(lead_id)
+        email = normalize_email(email)
+        if email:
+            domains[lead_id] = email.partition('@')[2]
+            blocks[('email', email)].append(lead_id)
+        if names[lead_id]:
+            blocks[('name', name_block_key(names[lead_id]))].append(lead_id)
+
+    stats = {'leads': len(names), 'blocks': 0, 'split_blocks': 0, 'skipped_blocks': 0, 'compared': 0, 'skipped': []}
+    reasons_by_pair = defaultdict(set)
+
+    def compare(kind, members):
+        stats['blocks'] += 1
+        for pair in combinations(sorted(members), 2):
+            reasons_by_pair[pair].add(kind)
+
+    for (kind, key), members in blocks.items():
+        if len(members) < 2:
+            continue
+        if len(members) <= max_block_size:
+            compare(kind, members)
+            continue
+        if kind != 'name':
+            stats['skipped'].append((kind, key, len(members)))
+            continue
+        stats['split_blocks'] += 1
+        for (sub_kind, sub_key), sub_members in split_name_block(members, phones, domains).items():
+            if len(sub_members) < 2:
+                continue
+            if len(sub_members) > max_block_size:
+                stats['skipped'].append(('name', f'{key} {sub_kind}:{sub_key}', len(sub_members)))
+                continue
+            compare('name', sub_members)
+
+    stats['skipped'].sort(key=lambda block: -block[2])
+    stats['skipped_blocks'] = len(stats['skipped'])
+
+    pairs = []
+    for (a, b), reasons in reasons_by_pair.items():
+        stats['compared'] += 1
+        similarity = name_similarity(names[a], names[b])
+        if similarity >= NAME_THRESHOLD:
+            reasons.add('name')
+        else:
+            reasons.discard('name')
+        if not reasons:
+            continue
+        score = pair_score(reasons, similarity)
+        if score >= min_score:
+            pairs.append((a, b, score, sorted(reasons)))
+
+    pairs.sort(key=lambda pair: (-pair[2], pair[0], pair[1]))
+    return pairs, stats
+
+
+def save_duplicate_candidates(pairs, batch_size=2000):
+    """
+    Replace the OPEN candidate rows with `pairs`. DISMISSED pairs are kept
+    (the unique pair constraint makes their re-insert a no-op).
+    """
+    with transaction.atomic():
+        DuplicateLeadCandidate.objects.filter(status='OPEN').delete()
+        DuplicateLeadCandidate.objects.bulk_create(
+            [
+                DuplicateLeadCandidate(lead_a_id=a, lead_b_id=b, score=score, reasons=reasons)
+                for a, b, score, reasons in pairs
+            ],
+            batch_size=batch_size,
+            ignore_conflicts=True,
+        )
+    return DuplicateLeadCandidate.objects.filter(status='OPEN').count()
+
+
+# ── Merge
+def merge_leads(primary, duplicate_ids, user=None):
+    """
+    Fold the leads in `duplicate_ids` into `primary` and delete them.
+
+    History, assignments, processing updates, remarks, follow-ups, status
+    transitions and activity log entries are re-pointed with one UPDATE per table, and blank
+    MERGE_FILL_FIELDS on `primary` are filled from the oldest duplicate that
+    has them. The primary is re-read under the same row lock as the
+    duplicates. Returns the number of leads merged.
+    """
+    duplicate_ids = sorted(set(duplicate_ids) - {primary.pk})
+    if not duplicate_ids:
+        return 0
+
+    with transaction.atomic():
+        # Lock the primary too, all in id order: an edit to it can't land
+        # between the fill below and its save, and two merges can't deadlock
+        locked = {
+            lead.pk: lead
+            for lead in Lead.objects.select_for_update()
+            .filter(id__in=[primary.pk, *duplicate_ids])
+            .order_by('id')
+        }
+        if primary.pk not in locked:
+            raise Lead.DoesNotExist(f'Lead {primary.pk} no longer exists')
+        primary       = locked.pop(primary.pk)
+        duplicates    = sorted(locked.values(), key=lambda lead: (lead.created_at, lead.pk))
+        duplicate_ids = [lead.pk for lead in duplicates]
+
+        for model in MERGED_RELATIONS:
+            model.objects.filter(lead_id__in=duplicate_ids).update(lead=primary)
+        for model in (ActivityLog, ActivityLogArchive):
+            model.objects.filter(entity_type='Lead', entity_id__in=duplicate_ids).update(entity_id=primary.pk)
+
+        filled = []
+        for field in MERGE_FILL_FIELDS:
+            if getattr(primary, field):
+                continue
+            value = next((getattr(lead, field) for lead in duplicates if getattr(lead, field)), None)
+            if value:
+                setattr(primary, field, value)
+                filled.append(field)
+
+        # Delete first: email is unique and may be moving to `primary`
+        Lead.objects.filter(id__in=duplicate_ids).delete()
+        if filled:
+            primary.save(update_fields=filled + ['updated_at'])
+
+        log_activity(
+            action='LEAD_UPDATED',
+            entity_type='Lead',
+            entity_id=primary.pk,
+            entity_name=primary.name,
+            user=user,
+            description=f'Merged {len(duplicates)} duplicate lead(s) into "{primary.name}".',
+            metadata={
+                'merged_leads': [
+                    {'id': lead.pk, 'name': lead.name, 'phone': lead.phone} for lead in duplicates
+                ],
+                'filled_fields': filled,
+            },
+        )
+    return len(duplicates)
@@ -0,0 +1,133 @@
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import ActivityLog
+from accounts.utils import build_activity_log
+
+from .models import FollowUp, FollowUpHistory
+
+
+# follow_up_time argument meaning "leave each follow-up's time as it is"
+KEEP_TIME = object()
+
+
+def _label(followup):
+    return followup.name or followup.phone_number
+
+
+def _when(date, time):
+    return f'{date} {time:%H:%M}' if time else str(date)
+
+
+def _lock_own(user, ids):
+    """The user's follow-ups among `ids`, locked. Returns (followups, missing_ids)."""
+    followups = list(
+        FollowUp.objects.select_for_update()
+        .filter(assigned_to=user, id__in=ids)
+        .only('id', 'name', 'phone_number', 'status', 'follow_up_date', 'follow_up_time')
+        .order_by('id')
+    )
+    found = {followup.id for followup in followups}
+    return followups, sorted(set(ids) - found)
+
+
+def bulk_reschedule_followups(user, ids, follow_up_date, follow_up_time=KEEP_TIME, notes=''):
+    """
+    Move the user's follow-ups in `ids` to a new date (and time, if given).
+
+    One UPDATE for all rows plus bulk INSERTs of FollowUpHistory (status
+    unchanged, the move in `notes`) and FOLLOWUP_RESCHEDULED activity
+    entries, in one transaction. reminder_sent_at is cleared so the
+    reminder goes out again at the new time. Returns (updated_ids,
+    missing_ids); ids that are not the user's count as missing.
+    """
+    now     = timezone.now()
+    changes = {'follow_up_date': follow_up_date, 'reminder_sent_at': None, 'updated_at': now}
+    if follow_up_time is not KEEP_TIME:
+        changes['follow_up_time'] = follow_up_time
+
+    with transaction.atomic():
+        followups, missing = _lock_own(user, ids)
+        if not followups:
+            return [], missing
+
+        FollowUp.objects.filter(id__in=[followup.id for followup in followups]).update(**changes)
+
+        history = []
+        entries = []
+        for followup in followups:
+            new_time = changes.get('follow_up_time', followup.follow_up_time)
+            old_when = _when(followup.follow_up_date, followup.follow_up_time)
+            new_when = _when(follow_up_date, new_time)
+            moved    = f'Rescheduled from {old_when} to {new_when}'
+            history.append(FollowUpHistory(
+                followup=followup,
+                old_status=followup.status,
+                new_status=followup.status,
+                changed_by=user,
+                notes=f'{moved}. {notes}' if notes else moved,
+            ))
+            entries.append(build_activity_log(
+                action='FOLLOWUP_RESCHEDULED',
+                entity_type='FollowUp',
+                entity_id=followup.pk,
+                entity_name=_label(followup),
+                user=user,
+                description=f'Follow-up for "{_label(followup)}" was rescheduled from {old_when} to {new_when}.',
+                metadata={
+                    'old_date': str(followup.follow_up_date),
+                    'new_date': str(follow_up_date),
+                    'old_time': str(followup.follow_up_time) if followup.follow_up_time else None,
+                    'new_time': str(new_time) if new_time else None,
+                },
+            ))
+        FollowUpHistory.objects.bulk_create(history)
+        ActivityLog.objects.bulk_create(entries)
+
+    return [followup.id for followup in followups], missing
+
+
+def bulk_update_followup_status(user, ids, status, notes=''):
+    """
+    Set `status` on the user's follow-ups in `ids`.
+
+    Rows already in that status are left alone. The rest are changed with
+    one UPDATE, and get the FollowUpHistory row and FOLLOWUP_STATUS_CHANGED
+    entry FollowUp.save and leads.signals would write, bulk-inserted in the
+    same transaction. Returns (updated_ids, missing_ids).
+    """
+    with transaction.atomic():
+        followups, missing = _lock_own(user, ids)
+        changed = [followup for followup in followups if followup.status != status]
+        if not changed:
+            return [], missing
+
+        FollowUp.objects.filter(id__in=[followup.id for followup in changed]).update(
+            status=status,
+            updated_at=timezone.now(),
+        )
+
+        FollowUpHistory.objects.bulk_create([
+            FollowUpHistory(
+                followup=followup,
+                old_status=followup.status,
+                new_status=status,
+                changed_by=user,
+                notes=notes or None,
+            )
+            for followup in changed
+        ])
+        ActivityLog.objects.bulk_create([
+            build_activity_log(
+                action='FOLLOWUP_STATUS_CHANGED',
+                entity_type='FollowUp',
+                entity_id=followup.pk,
+                entity_name=_label(followup),
+                user=user,
+                description=f'Follow-up for "{_label(followup)}" status changed from {followup.status} → {status}.',
+                metadata={'old_status': followup.status, 'new_status': status},
+            )
+            for followup in changed
+        ])
+
+    return [followup.id for followup in changed], missing
@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+from django.core.cache import cache
+from django.db.models import Max
+
+from accounts.models import User
+
+from .intake import day_bounds
+from .models import Lead, LeadStatusTransition
+
+
+# Funnel stages in order; a lead that reaches a later stage has passed the earlier ones
+STAGE_RANK = {'ENQUIRY': 0, 'QUALIFIED': 1, 'CONVERTED': 2, 'REGISTERED': 2}
+STAGES     = ['enquiry', 'qualified', 'won']
+
+# dimension -> Lead field the cohort is grouped by
+DIMENSIONS = {
+    'source':   'source',
+    'program':  'program',
+    'assignee': 'assigned_to_id',
+}
+
+FUNNEL_CACHE_TTL = 15 * 60
+
+
+def funnel_report(first_day, last_day, dimension=None):
+    """
+    Conversion funnel for leads created on local days first_day..last_day,
+    overall and (optionally) per `dimension` value, cached.
+
+    The cache key carries the latest transition id, so a status change
+    shows up at once; other edits (source, program, assignee) within
+    FUNNEL_CACHE_TTL.
+    """
+    latest = LeadStatusTransition.objects.aggregate(latest=Max('id'))['latest']
+    key    = f'lead-funnel:{first_day}:{last_day}:{dimension or "-"}:{latest}'
+    report = cache.get(key)
+    if report is None:
+        report = compute_funnel(first_day, last_day, dimension)
+        cache.set(key, report, FUNNEL_CACHE_TTL)
+    return report
+
+
+def compute_funnel(first_day, last_day, dimension=None):
+    """
+    ENQUIRY → QUALIFIED → CONVERTED/REGISTERED ("won") for the cohort.
+
+    Two columnar pulls (the cohort's leads and their transitions) go into
+    DataFrames; the stage each lead reached, when it first got there and
+    the per-group rates and medians are computed vectorized. Hours in
+    stage are measured from creation to first reaching QUALIFIED-or-later,
+    and from there to first reaching won.
+    """
+    start, end = day_bounds(first_day, last_day)
+    cohort     = Lead.objects.filter(created_at__gte=start, created_at__lt=end).order_by()
+    group_by   = DIMENSIONS.get(dimension)
+
+    leads = pd.DataFrame.from_records(
+        list(cohort.values_list('id', 'status', 'created_at', *([group_by] if group_by else []))),
+        columns=['lead_id', 'status', 'created_at'] + (['group'] if group_by else []),
+    )
+    transitions = pd.DataFrame.from_records(
+        list(
+            LeadStatusTransition.objects
+            .filter(lead__created_at__gte=start, lead__created_at__lt=end)
+            .order_by()
+            .values_list('lead_id', 'to_status', 'changed_at')
+        ),
+        columns=['lead_id', 'to_status', 'changed_at'],
+    )
+
+    report = {
+        'start':     first_day,
+        'end':       last_day,
+        'dimension': dimension,
+        'stages':    STAGES,
+        'overall':   None,
+        'groups':    [],
+    }
+    if leads.empty:
+        report['overall'] = _summarize(leads.assign(qualified=False, won=False, enquiry_hours=np.nan, qualified_hours=np.nan))
+        return report
+
+    leads['created_at']       = pd.to_datetime(leads['created_at'], utc=True)
+    transitions['changed_at'] = pd.to_datetime(transitions['changed_at'], utc=True)
+
+    # First time each lead reached QUALIFIED-or-later and won
+    transitions['rank'] = transitions['to_status'].map(STAGE_RANK)
+    reached = transitions.dropna(subset=['rank'])
+    for rank, column in ((1, 'qualified_at'), (2, 'won_at')):
+        first = reached[reached['rank'] >= rank].groupby('lead_id')['changed_at'].min()
+        leads[column] = pd.to_datetime(leads['lead_id'].map(first), utc=True)
+
+    # Current status counts too (covers leads with no recorded transition)
+    current = leads['status'].map(STAGE_RANK).fillna(-1)
+    leads['qualified'] = leads['qualified_at'].notna() | (current >= 1)
+    leads['won']       = leads['won_at'].notna() | (current >= 2)
+
+    hour = pd.Timedelta(hours=1)
+    leads['enquiry_hours']   = (leads['qualified_at'] - leads['created_at']) / hour
+    leads['qualified_hours'] = (leads['won_at'] - leads['qualified_at']) / hour
+
+    report['overall'] = _summarize(leads)
+    if group_by:
+        if dimension == 'program':
+            programs       = leads['group'].str.strip()
+            leads['group'] = programs.where(programs != '', None)
+        groups = [
+            dict(key=None if pd.isna(value) else value, **_summarize(rows))
+            for value, rows in leads.groupby('group', dropna=False, sort=False)
+        ]
+        groups.sort(key=lambda group: (-group['leads'], str(group['key'])))
+        _label_groups(groups, dimension)
+        report['groups'] = groups
+    return report
+
+
+def _summarize(rows):
+    total     = int(len(rows))
+    qualified = int(rows['qualified'].sum())
+    won       = int(rows['won'].sum())
+    return {
+        'leads':                  total,
+        'qualified':              qualified,
+        'won':                    won,
+        'qualified_rate':         _rate(qualified, total),
+        'won_rate':               _rate(won, total),
+        'qualified_to_won_rate':  _rate(won, qualified),
+        'median_hours_enquiry':   _median(rows['enquiry_hours']),
+        'median_hours_qualified': _median(rows['qualified_hours']),
+    }
+
+
+def _rate(part, whole):
+    return round(part / whole, 4) if whole else None
+
+
+def _median(hours):
+    hours = hours.dropna()
+    return round(float(hours.median()), 1) if len(hours) else None
+
+
+def _label_groups(groups, dimension):
+    if dimension == 'assignee':
+        ids   = [int(group['key']) for group in groups if group['key'] is not None]
+        names = {
+            user.id: user.get_full_name() or user.username
+            for user in User.objects.filter(id__in=ids)
+        }
+        for group in groups:
+            key = group['key']
+            group['key']   = int(key) if key is not None else None
+            group['label'] = names.get(group['key'], 'Unassigned')
+    elif dimension == 'source':
+        labels = dict(Lead.SOURCE_CHOICES)
+        for group in groups:
+            group['label'] = labels.get(group['key'], group['key'] or 'Unspecified')
+    else:
+        for group in groups:
+            group['label'] = group['key'] or 'Unspecified'
@@ -0,0 +1,175 @@
+from collections import Counter
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from accounts.models import User
+
+from .models import Lead, LeadIntakeRollup
+
+
+# Finished days re-rolled on every refresh, to pick up reassigned and deleted leads
+REFRESH_OVERLAP_DAYS = 7
+REFRESH_CHUNK_DAYS   = 31
+
+
+def day_bounds(first_day, last_day):
+    """
+    Aware [start, end) datetimes covering local days first_day..last_day.
+
+    Filtering created_at against these stays sargable (uses the created_at
+    index), unlike created_at__date, which converts every row first.
+    """
+    tz    = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(first_day, time.min), tz)
+    end   = timezone.make_aware(datetime.combine(last_day + timedelta(days=1), time.min), tz)
+    return start, end
+
+
+def hourly_intake(queryset, first_day, last_day):
+    """{(day, hour, source, custom_source, assigned_to_id): count} from one GROUP BY."""
+    start, end = day_bounds(first_day, last_day)
+    rows = (
+        queryset.filter(created_at__gte=start, created_at__lt=end)
+        .annotate(created_hour=TruncHour('created_at'))
+        .values_list('created_hour', 'source', 'custom_source', 'assigned_to_id')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    counts = Counter()
+    for created_hour, source, custom_source, assigned_to_id, total in rows:
+        local = timezone.localtime(created_hour)
+        counts[(local.date(), local.hour, source or '', custom_source or '', assigned_to_id)] += total
+    return counts
+
+
+def last_rolled_day():
+    return LeadIntakeRollup.objects.aggregate(last=Max('day'))['last']
+
+
+# ── Refresh
+def refresh_intake_rollups(overlap_days=REFRESH_OVERLAP_DAYS, full=False):
+    """
+    Roll up finished days (up to yesterday) that are new since the last
+    refresh, plus the `overlap_days` before them. With `full`, every day
+    since the oldest lead is rebuilt. Each chunk of days is replaced in one
+    transaction; a day without leads gets a single zero row, so it counts
+    as rolled up. Returns (first_day, last_day) refreshed, or None.
+    """
+    last_day = timezone.localdate() - timedelta(days=1)
+    rolled   = None if full else last_rolled_day()
+    if rolled is None:
+        oldest = Lead.objects.aggregate(first=Min('created_at'))['first']
+        if oldest is None:
+            return None
+        first_day = timezone.localdate(oldest)
+    else:
+        first_day = rolled + timedelta(days=1) - timedelta(days=overlap_days)
+
+    if first_day > last_day:
+        return None
+    if full:
+        LeadIntakeRollup.objects.filter(day__lt=first_day).delete()
+
+    chunk_start = first_day
+    while chunk_start <= last_day:
+        chunk_end = min(chunk_start + timedelta(days=REFRESH_CHUNK_DAYS - 1), last_day)
+        counts    = hourly_intake(Lead.objects.all(), chunk_start, chunk_end)
+        seen_days = {key[0] for key in counts}
+
+        rows = [
+            LeadIntakeRollup(
+                day=day, hour=hour, source=source, custom_source=custom_source,
+                assigned_to_id=assigned_to_id, count=count,
+            )
+            for (day, hour, source, custom_source, assigned_to_id), count in counts.items()
+        ]
+        day = chunk_start
+        while day <= chunk_end:
+            if day not in seen_days:
+                rows.append(LeadIntakeRollup(day=day, hour=0, count=0))
+            day += timedelta(days=1)
+
+        with transaction.atomic():
+            LeadIntakeRollup.objects.filter(day__range=(chunk_start, chunk_end)).delete()
+            LeadIntakeRollup.objects.bulk_create(rows, batch_size=2000)
+        chunk_start = chunk_end + timedelta(days=1)
+
+    return first_day, last_day
+
+
+# ── Report
+def intake_report(first_day, last_day, source=None, assigned_to_id=None):
+    """
+    Lead intake for local days first_day..last_day: totals per day (zero
+    filled), per hour of day, per source/custom_source and per assignee.
+
+    Rolled-up days are summed from LeadIntakeRollup with one GROUP BY per
+    breakdown; days after the last rolled-up one (normally just today) are
+    counted live from leads with a created_at range.
+    """
+    rolled     = last_rolled_day()
+    live_first = first_day if rolled is None else max(first_day, rolled + timedelta(days=1))
+
+    by_day      = Counter()
+    by_hour     = Counter()
+    by_source   = Counter()
+    by_assignee = Counter()
+
+    if rolled is not None and rolled >= first_day:
+        rollups = LeadIntakeRollup.objects.filter(day__range=(first_day, min(last_day, rolled))).order_by()
+        if source:
+            rollups = rollups.filter(source=source)
+        if assigned_to_id:
+            rollups = rollups.filter(assigned_to_id=assigned_to_id)
+        total = Sum('count')
+        by_day.update(dict(rollups.values_list('day').annotate(total)))
+        by_hour.update(dict(rollups.values_list('hour').annotate(total)))
+        by_assignee.update(dict(rollups.values_list('assigned_to_id').annotate(total)))
+        for source_name, custom_source, count in rollups.values_list('source', 'custom_source').annotate(total):
+            by_source[(source_name, custom_source)] += count
+
+    if live_first <= last_day:
+        leads = Lead.objects.all()
+        if source:
+            leads = leads.filter(source=source)
+        if assigned_to_id:
+            leads = leads.filter(assigned_to_id=assigned_to_id)
+        for (day, hour, source_name, custom_source, user_id), count in hourly_intake(leads, live_first, last_day).items():
+            by_day[day]                             += count
+            by_hour[hour]                           += count
+            by_source[(source_name, custom_source)] += count
+            by_assignee[user_id]                    += count
+
+    names = {
+        user.id: user.get_full_name() or user.username
+        for user in User.objects.filter(id__in=[pk for pk in by_assignee if pk])
+    }
+
+    days = []
+    day  = first_day
+    while day <= last_day:
+        days.append({'date': day, 'count': by_day[day]})
+        day += timedelta(days=1)
+
+    return {
+        'start':     first_day,
+        'end':       last_day,
+        'total':     sum(by_day.values()),
+        'live_from': live_first if live_first <= last_day else None,
+        'days':      days,
+        'hours':     [{'hour': hour, 'count': by_hour[hour]} for hour in range(24)],
+        'sources':   [
+            {'source': source_name or None, 'custom_source': custom_source or None, 'count': count}
+            for (source_name, custom_source), count in by_source.most_common()
+            if count
+        ],
+        'assignees': [
+            {'user_id': user_id, 'name': names.get(user_id, 'Unassigned'), 'count': count}
+            for user_id, count in by_assignee.most_common()
+            if count
+        ],
+    }
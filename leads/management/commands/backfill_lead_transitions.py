@@ -0,0 +1,91 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.models import CombinedActivityLog, User
+from leads.models import Lead, LeadStatusTransition
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed LeadStatusTransition for leads that have none, from their '
+        'LEAD_CREATED / LEAD_STATUS_CHANGED activity log entries (archive included)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000, help='Leads per transaction')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        pending    = (
+            Lead.objects.filter(status_transitions__isnull=True)
+            .order_by('id')
+            .values_list('id', 'status', 'created_at')
+        )
+
+        created = leads = 0
+        last_id = 0
+        while True:
+            batch = list(pending.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1][0]
+
+            logs = {}
+            for lead_id, action, metadata, user_id, created_at in (
+                CombinedActivityLog.objects
+                .filter(entity_type='Lead', entity_id__in=[row[0] for row in batch],
+                        action__in=['LEAD_CREATED', 'LEAD_STATUS_CHANGED'])
+                .order_by('entity_id', 'created_at', 'id')
+                .values_list('entity_id', 'action', 'metadata', 'user_id', 'created_at')
+            ):
+                logs.setdefault(lead_id, []).append((action, metadata or {}, user_id, created_at))
+
+            rows = []
+            for lead_id, status, lead_created_at in batch:
+                rows.extend(self._transitions(lead_id, status, lead_created_at, logs.get(lead_id, [])))
+
+            # The archive can name users deleted since
+            users = set(User.objects.filter(
+                id__in={row.changed_by_id for row in rows} - {None}
+            ).values_list('id', flat=True))
+            for row in rows:
+                if row.changed_by_id not in users:
+                    row.changed_by_id = None
+
+            with transaction.atomic():
+                LeadStatusTransition.objects.bulk_create(rows)
+            created += len(rows)
+            leads   += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'Created {created} transitions for {leads} leads'))
+
+    @staticmethod
+    def _transitions(lead_id, status, lead_created_at, logs):
+        changes = [
+            (meta.get('old_status') or '', meta.get('new_status') or '', user_id, at)
+            for action, meta, user_id, at in logs
+            if action == 'LEAD_STATUS_CHANGED' and meta.get('new_status')
+        ]
+        created = next((log for log in logs if log[0] == 'LEAD_CREATED'), None)
+
+        # Initial status: as logged at creation, else before the first change, else current
+        initial = (
+            (created and created[1].get('status'))
+            or (changes and changes[0][0])
+            or status
+        )
+        rows = [LeadStatusTransition(
+            lead_id=lead_id,
+            to_status=initial.upper(),
+            changed_at=lead_created_at,
+            changed_by_id=created[2] if created else None,
+        )]
+        for old, new, user_id, at in changes:
+            rows.append(LeadStatusTransition(
+                lead_id=lead_id,
+                from_status=old.upper(),
+                to_status=new.upper(),
+                changed_at=at,
+                changed_by_id=user_id,
+            ))
+        return rows
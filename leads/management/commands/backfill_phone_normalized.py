@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+
+from leads.models import Lead, FollowUp
+from telephony.models import VoxbayCallLog
+from utils.phone import normalize_phone
+
+
+# model -> fields read to compute phone_normalized (see each model's save())
+TARGETS = [
+    (Lead,          lambda row: normalize_phone(row['phone']),               ['phone']),
+    (FollowUp,      lambda row: normalize_phone(row['phone_number']),        ['phone_number']),
+    (VoxbayCallLog, lambda row: normalize_phone(
+        row['destination'] if row['call_type'] == 'outgoing' else row['caller_number']
+    ), ['call_type', 'caller_number', 'destination']),
+]
+
+
+class Command(BaseCommand):
+    help = 'Fill phone_normalized on leads, follow-ups and call logs, in primary-key chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows read per chunk')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        for model, compute, fields in TARGETS:
+            scanned = updated = 0
+            last_pk = 0
+            while True:
+                rows = list(
+                    model.objects.filter(pk__gt=last_pk)
+                    .order_by('pk')
+                    .values('pk', 'phone_normalized', *fields)[:batch_size]
+                )
+                if not rows:
+                    break
+                last_pk  = rows[-1]['pk']
+                scanned += len(rows)
+
+                changed = []
+                for row in rows:
+                    value = compute(row)
+                    if value != row['phone_normalized']:
+                        changed.append(model(pk=row['pk'], phone_normalized=value))
+                if changed:
+                    model.objects.bulk_update(changed, ['phone_normalized'])
+                    updated += len(changed)
+
+            self.stdout.write(self.style.SUCCESS(
+                f'{model.__name__}: {updated} of {scanned} rows updated'
+            ))
@@ -0,0 +1,145 @@
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from functools import reduce
+from operator import or_
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from leads.models import Lead
+from leads.search import LeadOrderingFilter, LeadSearchFilter
+from leads.views import LeadListView
+
+
+FIRST_NAMES = ['Anjali', 'Rahul', 'Ramesh', 'Priya', 'Arjun', 'Fathima', 'Anu', 'Vishnu', 'Sneha', 'Mohammed']
+LAST_NAMES  = ['Kumar', 'Nair', 'Menon', 'Pillai', 'Thomas', 'Joseph', 'Varghese', 'Krishnan']
+PROGRAMS    = ['BSc Nursing', 'MBBS Abroad', 'German Language A1', 'IELTS', 'Hotel Management', 'MBA']
+
+DEFAULT_TERMS = ['ram', 'anjali nair', '98470', 'gmail', 'nursing', 'anu germ', 'ra']
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare ?search= latency on the leads list: the old SearchFilter '
+        'LIKE scan against the search_vector/pg_trgm backend'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--leads', type=int, default=500_000,
+            help='Seed synthetic leads until the table has this many rows',
+        )
+        parser.add_argument('--runs', type=int, default=20, help='Timed runs per query')
+        parser.add_argument('--term', action='append', dest='terms', help='Search term (repeatable)')
+        parser.add_argument(
+            '--keep', action='store_true',
+            help='Commit the seeded leads instead of rolling them back',
+        )
+
+    def handle(self, *args, **options):
+        terms = options['terms'] or DEFAULT_TERMS
+
+        with transaction.atomic():
+            self._seed(options['leads'])
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('ANALYZE leads_lead')
+
+            total = Lead.objects.count()
+            self.stdout.write(f'{connection.vendor}: {total} leads, {options["runs"]} runs per query\n')
+            self.stdout.write(
+                f'{"term":<16}{"matches":>9}{"ranked":>8}{"old p50":>10}{"old p95":>10}{"new p50":>10}{"new p95":>10}'
+            )
+
+            for term in terms:
+                new    = self._search_queryset(term)
+                ranked = 'yes' if 'search_rank' in new.query.annotations else 'no'
+                with self._without_indexes():
+                    old_p50, old_p95 = self._time(lambda: self._legacy_queryset(term), options['runs'])
+                new_p50, new_p95 = self._time(lambda: self._search_queryset(term), options['runs'])
+                self.stdout.write(
+                    f'{term:<16}{new.count():>9}{ranked:>8}'
+                    f'{old_p50:>10.1f}{old_p95:>10.1f}{new_p50:>10.1f}{new_p95:>10.1f}'
+                )
+
+            self.stdout.write(
+                'Times are ms for building the queryset, COUNT(*) and the first page of 20, '
+                'as LeadListView runs them.'
+            )
+            self.stdout.write('"old" runs with index scans off: before leads.search no index served these LIKEs.')
+
+            if not options['keep']:
+                transaction.set_rollback(True)
+
+    def _seed(self, target):
+        missing = target - Lead.objects.count()
+        if missing <= 0:
+            return
+
+        self.stdout.write(f'Seeding {missing} synthetic leads...')
+        rng   = random.Random(42)
+        start = Lead.objects.count()
+        batch = []
+        for i in range(start, start + missing):
+            first = rng.choice(FIRST_NAMES)
+            last  = rng.choice(LAST_NAMES)
+            batch.append(Lead(
+                name=f'{first} {last}',
+                phone=f'5{i:09d}',
+                email=f'{first}.{last}{i}@{rng.choice(["gmail.com", "yahoo.com", "example.com"])}'.lower(),
+                program=rng.choice(PROGRAMS),
+                remarks=rng.choice(['', 'Called, asked to call back', 'Interested in next intake']),
+                source='OTHER',
+            ))
+            if len(batch) == 5000:
+                Lead.objects.bulk_create(batch)
+                batch = []
+        Lead.objects.bulk_create(batch)
+
+    @staticmethod
+    def _legacy_queryset(term):
+        # What filters.SearchFilter compiled to before leads.search
+        condition = reduce(or_, [
+            Q(**{f'{field}__icontains': term}) for field in LeadListView.search_fields
+        ])
+        return Lead.objects.filter(condition).order_by('-created_at')
+
+    @staticmethod
+    def _search_queryset(term):
+        request = Request(APIRequestFactory().get('/', {'search': term}))
+        view    = LeadListView()
+        qs      = LeadSearchFilter().filter_queryset(request, Lead.objects.all(), view)
+        return LeadOrderingFilter().filter_queryset(request, qs, view)
+
+    @staticmethod
+    @contextmanager
+    def _without_indexes():
+        # The pg_trgm indexes would otherwise serve the old LIKE predicates too
+        if connection.vendor != 'postgresql':
+            yield
+            return
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_indexscan = off; SET enable_bitmapscan = off')
+        try:
+            yield
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute('RESET enable_indexscan; RESET enable_bitmapscan')
+
+    @staticmethod
+    def _time(build, runs):
+        timings = []
+        for _ in range(runs):
+            started  = time.perf_counter()
+            queryset = build()
+            queryset.count()
+            list(queryset[:20])
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        return statistics.median(timings), p95
@@ -0,0 +1,81 @@
+import random
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from accounts.models import User
+from leads.models import Lead
+from leads.serializers import LeadCompactSerializer, LeadListSerializer
+from leads.views import CompactLeadListMixin
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare a lead list page rendered with LeadListSerializer against the '
+        '?compact=true LeadCompactSerializer path'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100, help='Leads per page')
+        parser.add_argument('--users', type=int, default=8, help='Distinct users spread over the page')
+        parser.add_argument('--runs', type=int, default=200, help='Timed runs per serializer')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        with transaction.atomic():
+            lead_ids = self._seed(rows, options['users'])
+            base     = Lead.objects.filter(id__in=lead_ids).order_by('-created_at', '-id')
+
+            def nested():
+                page = list(base.select_related(*CompactLeadListMixin.user_relations))
+                return JSONRenderer().render({'leads': LeadListSerializer(page, many=True).data})
+
+            def compact():
+                return JSONRenderer().render(LeadCompactSerializer.page_data(list(base)))
+
+            self.stdout.write(f'{rows} leads per page, {options["runs"]} runs each (query + serialize + render)\n')
+            self.stdout.write(f'{"serializer":<12}{"p50 ms":>10}{"p95 ms":>10}{"bytes":>10}')
+            for label, render in (('nested', nested), ('compact', compact)):
+                p50, p95 = self._time(render, options['runs'])
+                self.stdout.write(f'{label:<12}{p50:>10.2f}{p95:>10.2f}{len(render()):>10}')
+
+            transaction.set_rollback(True)
+
+    def _seed(self, rows, user_count):
+        rng   = random.Random(7)
+        run   = uuid.uuid4().hex[:8]  # seeded rows are rolled back; avoid clashing with real ones
+        start = rng.randrange(6_000_000_000, 6_900_000_000)
+        users = [
+            User.objects.create(username=f'bench_{run}_{i}', role='ADM_EXEC', first_name='Bench', last_name=str(i))
+            for i in range(user_count)
+        ]
+        leads = Lead.objects.bulk_create([
+            Lead(
+                name=f'Benchmark Lead {i}',
+                phone=str(start + i),
+                email=f'bench_{run}_{i}@example.com',
+                program='BSc Nursing',
+                source='OTHER',
+                assigned_to=rng.choice(users),
+                assigned_by=rng.choice(users),
+                sub_assigned_to=rng.choice(users + [None]),
+                sub_assigned_by=rng.choice(users),
+            )
+            for i in range(rows)
+        ])
+        return [lead.pk for lead in leads]
+
+    @staticmethod
+    def _time(render, runs):
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            render()
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        return statistics.median(timings), p95
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+
+from leads.duplicates import (
+    DEFAULT_MIN_SCORE,
+    MAX_BLOCK_SIZE,
+    find_duplicate_pairs,
+    save_duplicate_candidates,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Find likely duplicate leads by phone, email and fuzzy name and store '
+        'the scored pairs as DuplicateLeadCandidate rows'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-score', type=float, default=DEFAULT_MIN_SCORE,
+            help='Only keep pairs scoring at least this much (0-1)',
+        )
+        parser.add_argument(
+            '--max-block-size', type=int, default=MAX_BLOCK_SIZE,
+            help='Split (name) or skip (phone, email) blocking keys shared by more leads than this',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Print the best pairs instead of writing them',
+        )
+
+    def handle(self, *args, **options):
+        pairs, stats = find_duplicate_pairs(
+            min_score=options['min_score'],
+            max_block_size=options['max_block_size'],
+        )
+        self.stdout.write(
+            f"{stats['leads']} leads, {stats['blocks']} blocks compared "
+            f"({stats['split_blocks']} oversized name blocks split, "
+            f"{stats['skipped_blocks']} oversized blocks skipped), "
+            f"{stats['compared']} pairs scored, {len(pairs)} candidates"
+        )
+        for kind, key, size in stats['skipped'][:20]:
+            self.stdout.write(self.style.WARNING(f"  skipped {kind} block {key!r}: {size} leads"))
+        if stats['skipped_blocks'] > 20:
+            self.stdout.write(self.style.WARNING(f"  ... and {stats['skipped_blocks'] - 20} more"))
+
+        if options['dry_run']:
+            for a, b, score, reasons in pairs[:50]:
+                self.stdout.write(f"  {a} ~ {b}  {score:.2f}  {', '.join(reasons)}")
+            return
+
+        written = save_duplicate_candidates(pairs)
+        self.stdout.write(self.style.SUCCESS(f'{written} open duplicate candidates'))
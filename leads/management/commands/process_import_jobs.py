@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from leads.importers import run_import_job
+from leads.models import ImportJob
+
+
+class Command(BaseCommand):
+    help = 'Process queued bulk lead import jobs (polls the database)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Exit once the queue is empty instead of polling forever',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Seconds to wait between polls when the queue is empty',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            job = ImportJob.claim_next()
+
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+                continue
+
+            self.stdout.write(f'Processing import #{job.pk} ({job.original_filename})')
+            job = run_import_job(job)
+
+            if job.status == 'COMPLETED':
+                self.stdout.write(self.style.SUCCESS(
+                    f'Import #{job.pk}: {job.success_count} created, {job.failed_count} failed'
+                ))
+            else:
+                self.stdout.write(self.style.ERROR(f'Import #{job.pk} failed: {job.error}'))
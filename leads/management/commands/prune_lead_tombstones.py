@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from leads.sync import TOMBSTONE_RETENTION, prune_lead_tombstones
+
+
+class Command(BaseCommand):
+    help = (
+        f'Delete lead tombstones older than {TOMBSTONE_RETENTION.days} days; '
+        'sync tokens that old get a 410 and resync in full'
+    )
+
+    def handle(self, *args, **options):
+        deleted = prune_lead_tombstones()
+        self.stdout.write(self.style.SUCCESS(f'Pruned {deleted} lead tombstones'))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from leads.stats import find_lead_stats_drift, rebuild_lead_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the lead stats counters from the leads table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only report counters that drifted from the live counts',
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            drift = find_lead_stats_drift()
+            if not drift:
+                self.stdout.write(self.style.SUCCESS('Lead stats counters are in sync'))
+                return
+            for (scope, user_id, status), (stored, expected) in sorted(drift.items(), key=str):
+                self.stdout.write(f'{scope}/{user_id}/{status}: stored {stored}, expected {expected}')
+            self.stdout.write(self.style.WARNING(f'{len(drift)} counter(s) drifted'))
+            return
+
+        rows = rebuild_lead_stats()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} lead stats counters'))
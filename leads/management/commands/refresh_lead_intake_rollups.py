@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from leads.intake import REFRESH_OVERLAP_DAYS, refresh_intake_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        'Roll up lead intake for finished days (behind /leads/intake/); '
+        'run daily after midnight'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--overlap-days', type=int, default=REFRESH_OVERLAP_DAYS,
+            help='Also re-roll this many already rolled-up days',
+        )
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Rebuild every day since the oldest lead',
+        )
+
+    def handle(self, *args, **options):
+        refreshed = refresh_intake_rollups(overlap_days=options['overlap_days'], full=options['full'])
+        if refreshed is None:
+            self.stdout.write('Intake rollups already up to date')
+            return
+        first_day, last_day = refreshed
+        self.stdout.write(self.style.SUCCESS(f'Rolled up lead intake for {first_day} to {last_day}'))
@@ -0,0 +1,22 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from leads.processing import CLAIM_TTL, release_stale_claims
+
+
+class Command(BaseCommand):
+    help = (
+        'Return processing claims (ACCEPTED leads) not started within the '
+        'claim TTL to the FORWARDED queue (run from cron; each claim also does this first)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--ttl-minutes', type=int, default=int(CLAIM_TTL.total_seconds() // 60),
+            help='Release claims older than this many minutes',
+        )
+
+    def handle(self, *args, **options):
+        released = release_stale_claims(ttl=timedelta(minutes=options['ttl_minutes']))
+        self.stdout.write(self.style.SUCCESS(f'Released {released} stale processing claims'))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from leads.routing import notify_routed_leads, route_backlog
+
+
+class Command(BaseCommand):
+    help = (
+        'Assign open, unassigned leads through the lead routing rules, '
+        'all in one transaction'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit', type=int, default=None,
+            help='Route at most this many leads (oldest first)',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Show who would get how many leads and roll back',
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            routed_count, unrouted_count, routed = route_backlog(limit=options['limit'])
+            for assignee, leads in sorted(routed.items(), key=lambda item: item[0].username):
+                self.stdout.write(f'  {assignee.username}: {len(leads)}')
+            if options['dry_run']:
+                transaction.set_rollback(True)
+
+        if options['dry_run']:
+            self.stdout.write(f'Would route {routed_count} leads ({unrouted_count} match no rule)')
+            return
+
+        notify_routed_leads(routed)
+        self.stdout.write(self.style.SUCCESS(
+            f'Routed {routed_count} leads ({unrouted_count} match no rule)'
+        ))
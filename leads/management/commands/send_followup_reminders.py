@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from leads.reminders import REMINDER_BATCH_SIZE, REMINDER_LEAD_TIME, send_due_reminders
+
+
+class Command(BaseCommand):
+    help = (
+        'Notify assignees of pending follow-ups coming due (run every few '
+        'minutes from cron; safe to run on several nodes at once)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lead-minutes', type=int, default=int(REMINDER_LEAD_TIME.total_seconds() // 60),
+            help='Remind this many minutes before follow_up_time',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=REMINDER_BATCH_SIZE,
+            help='Follow-ups claimed per transaction',
+        )
+
+    def handle(self, *args, **options):
+        sent, users = send_due_reminders(
+            lead_time=timedelta(minutes=options['lead_minutes']),
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'Sent {sent} follow-up reminders to {users} users'))
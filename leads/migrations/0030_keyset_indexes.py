@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-17 00:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0029_leadstatscounter'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='followup',
+            index=models.Index(fields=['assigned_to', 'follow_up_date', 'id'], name='leads_follo_assigne_46715a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(fields=['created_at', 'id'], name='leads_lead_created_7eb09a_idx'),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.4 on 2026-10-17 00:01
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+# PostgreSQL only: the trigger that maintains Lead.search_vector, its GIN
+# index, and pg_trgm indexes for substring search. Indexes are on UPPER(col)
+# because that is what Django's icontains compiles to.
+SEARCH_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION leads_lead_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', coalesce(NEW.name, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(NEW.program, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(NEW.remarks, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER leads_lead_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, program, remarks ON leads_lead
+    FOR EACH ROW EXECUTE FUNCTION leads_lead_search_vector_update()
+    """,
+    """
+    UPDATE leads_lead SET search_vector =
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(program, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(remarks, '')), 'C')
+    """,
+    "CREATE INDEX leads_lead_search_vector_gin ON leads_lead USING gin (search_vector)",
+    "CREATE INDEX leads_lead_name_trgm ON leads_lead USING gin (UPPER(name::text) gin_trgm_ops)",
+    "CREATE INDEX leads_lead_phone_trgm ON leads_lead USING gin (UPPER(phone::text) gin_trgm_ops)",
+    "CREATE INDEX leads_lead_email_trgm ON leads_lead USING gin (UPPER(email::text) gin_trgm_ops)",
+]
+
+DROP_SEARCH_SQL = [
+    "DROP INDEX IF EXISTS leads_lead_email_trgm",
+    "DROP INDEX IF EXISTS leads_lead_phone_trgm",
+    "DROP INDEX IF EXISTS leads_lead_name_trgm",
+    "DROP INDEX IF EXISTS leads_lead_search_vector_gin",
+    "DROP TRIGGER IF EXISTS leads_lead_search_vector_trigger ON leads_lead",
+    "DROP FUNCTION IF EXISTS leads_lead_search_vector_update()",
+]
+
+
+def _run_on_postgres(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0030_keyset_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='lead',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(_run_on_postgres(SEARCH_SQL), _run_on_postgres(DROP_SEARCH_SQL)),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-17 00:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0031_lead_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='followup',
+            name='phone_normalized',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='lead',
+            name='phone_normalized',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Canonical digits of phone, used for duplicate matching', max_length=20),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-17 00:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0032_phone_normalized'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='followuphistory',
+            index=models.Index(fields=['followup', 'changed_at', 'id'], name='leads_follo_followu_27259d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leadassignment',
+            index=models.Index(fields=['lead', 'timestamp', 'id'], name='leads_leada_lead_id_ad14ba_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='processingupdate',
+            index=models.Index(fields=['lead', 'timestamp', 'id'], name='leads_proce_lead_id_3985c5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='remarkhistory',
+            index=models.Index(fields=['lead', 'changed_at', 'id'], name='leads_remar_lead_id_82eb83_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.4 on 2026-10-17 00:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0033_timeline_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DuplicateLeadCandidate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(help_text='0-1, higher is more likely the same person')),
+                ('reasons', models.JSONField(default=list, help_text='Matched keys: phone, email, name')),
+                ('status', models.CharField(choices=[('OPEN', 'Open'), ('DISMISSED', 'Dismissed')], default='OPEN', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('lead_a', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='leads.lead')),
+                ('lead_b', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='leads.lead')),
+            ],
+            options={
+                'ordering': ['-score', 'id'],
+                'indexes': [models.Index(fields=['status', '-score'], name='leads_dupli_status_76fe07_idx'), models.Index(fields=['lead_b'], name='leads_dupli_lead_b__8e0b9d_idx')],
+                'constraints': [models.UniqueConstraint(fields=('lead_a', 'lead_b'), name='unique_duplicate_lead_pair')],
+            },
+        ),
+    ]
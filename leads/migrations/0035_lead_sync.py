@@ -0,0 +1,36 @@
+# Generated by Django 5.2.4 on 2026-10-17 00:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0034_duplicateleadcandidate'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeadTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lead_id', models.BigIntegerField()),
+                ('assigned_to_id', models.BigIntegerField(blank=True, null=True)),
+                ('sub_assigned_to_id', models.BigIntegerField(blank=True, null=True)),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['deleted_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(fields=['updated_at', 'id'], name='leads_lead_updated_b0762e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leadtombstone',
+            index=models.Index(fields=['deleted_at'], name='leads_leadt_deleted_63bc95_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-17 00:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0035_lead_sync'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeadRoutingRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('source', models.CharField(blank=True, choices=[('WHATSAPP', 'WhatsApp'), ('INSTAGRAM', 'Instagram'), ('WEBSITE', 'Website'), ('WALK_IN', 'Walk-in'), ('AUTOMATION', 'Automation'), ('OTHER', 'Other'), ('ADS', 'Ads'), ('VOXBAY CALL', 'Voxbay'), ('BULK DATA', 'Bulk data')], help_text='Blank matches any source', max_length=20)),
+                ('program', models.CharField(blank=True, help_text="Matched case-insensitively as part of the lead's program; blank matches any", max_length=100)),
+                ('strategy', models.CharField(choices=[('ROUND_ROBIN', 'Round robin'), ('LEAST_OPEN', 'Fewest open leads')], default='LEAST_OPEN', max_length=20)),
+                ('priority', models.PositiveIntegerField(default=100, help_text='Lower runs first')),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('last_assigned_to', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('members', models.ManyToManyField(help_text='The team this rule routes to', related_name='lead_routing_rules', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['priority', 'id'],
+            },
+        ),
+    ]
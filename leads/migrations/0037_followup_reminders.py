@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-17 00:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0036_lead_routing_rules'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='followup',
+            index=models.Index(condition=models.Q(('reminder_sent_at__isnull', True), ('status', 'pending')), fields=['follow_up_date', 'follow_up_time', 'id'], name='followup_reminder_due_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-17 00:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0039_lead_status_transitions'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(condition=models.Q(('processing_status', 'FORWARDED')), fields=['processing_status_date', 'id'], name='lead_processing_queue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(condition=models.Q(('processing_status', 'ACCEPTED')), fields=['processing_status_date', 'id'], name='lead_processing_claimed_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.4 on 2026-10-17 12:00
+
+from django.db import migrations
+
+
+# PostgreSQL only: ?search= matches program as a substring again (as the old
+# SearchFilter did), so it gets the same pg_trgm index as name/phone/email.
+def _create_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS leads_lead_program_trgm ON leads_lead USING gin (UPPER(program::text) gin_trgm_ops)"
+    )
+
+
+def _drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS leads_lead_program_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0041_importjob_heartbeat'),
+    ]
+
+    operations = [
+        migrations.RunPython(_create_index, _drop_index),
+    ]
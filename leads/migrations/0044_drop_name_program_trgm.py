@@ -0,0 +1,38 @@
+# Generated by Django 5.2.4 on 2026-10-17 13:00
+
+from django.db import migrations
+
+
+# PostgreSQL only: ?search= now matches name and program through
+# search_vector, so their pg_trgm indexes (0031, 0042) are no longer read.
+INDEXES = {
+    'leads_lead_name_trgm':    'name',
+    'leads_lead_program_trgm': 'program',
+}
+
+
+def _drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name in INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def _create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, column in INDEXES.items():
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON leads_lead USING gin (UPPER({column}::text) gin_trgm_ops)"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0043_phone_normalized_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(_drop_indexes, _create_indexes),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-17 01:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0044_drop_name_program_trgm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lead',
+            name='processing_queued_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When a claimed lead entered the FORWARDED queue; restored if the claim is released', null=True),
+        ),
+    ]
@@ -1,12 +1,21 @@
-from django.db import models
+from datetime import timedelta
+
+from django.db import models, transaction
 from accounts.models import User
 from django.utils import timezone
 from django.core.validators import MinLengthValidator
 from django.contrib.auth import get_user_model
+from cloudinary.models import CloudinaryField
+from django.contrib.postgres.search import SearchVectorField
+from utils.phone import normalize_phone
+from utils.models import DirtyFieldsMixin
 
 User = get_user_model()
 
-class Lead(models.Model):
+class Lead(DirtyFieldsMixin, models.Model):
+    # Old values read by Lead.save and leads.signals
+    tracked_fields = ['status', 'processing_status', 'assigned_to', 'sub_assigned_to', 'remarks']
+
     PRIORITY_CHOICES = [
         ('HIGH', 'High'),
         ('MEDIUM', 'Medium'), 
@@ -53,6 +62,7 @@ class Lead(models.Model):
     # Basic lead info
     name = models.CharField(max_length=100, validators=[MinLengthValidator(3)])
     phone = models.CharField(max_length=20, validators=[MinLengthValidator(10)], unique=True, help_text="Contact phone number")
+    phone_normalized = models.CharField(max_length=30, blank=True, db_index=True, editable=False, help_text="Canonical digits of phone, used for duplicate matching")
     email = models.EmailField(unique=True, null=True, blank=True)
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES, default='MEDIUM')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='ENQUIRY', help_text="Current status of the lead")
@@ -69,6 +79,7 @@ class Lead(models.Model):
         limit_choices_to={'role': 'PROCESSING'}, related_name='processing_leads'
     )
     processing_status_date = models.DateTimeField(auto_now_add=True, db_index=True)
+    processing_queued_at = models.DateTimeField(null=True, blank=True, editable=False, help_text="When a claimed lead entered the FORWARDED queue; restored if the claim is released")
     processing_notes = models.TextField(blank=True, null=True)
 
     # Document tracking
@@ -106,6 +117,10 @@ class Lead(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     registration_date = models.DateTimeField(null=True, blank=True)
 
+    # Full-text search over name/program/remarks, kept current by a database
+    # trigger on PostgreSQL (see leads.search and migration 0031)
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
+
     class Meta:
         ordering = ['-priority', '-created_at']
         verbose_name = 'Lead'
@@ -116,21 +131,35 @@ class Lead(models.Model):
             models.Index(fields=['processing_status']),
             models.Index(fields=['assigned_to']),
             models.Index(fields=['sub_assigned_to']),
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['updated_at', 'id']),
+            # Processing work queue (leads.processing): waiting leads oldest first,
+            # and claims the stale-claim sweep looks at
+            models.Index(
+                fields=['processing_status_date', 'id'],
+                name='lead_processing_queue_idx',
+                condition=models.Q(processing_status='FORWARDED'),
+            ),
+            models.Index(
+                fields=['processing_status_date', 'id'],
+                name='lead_processing_claimed_idx',
+                condition=models.Q(processing_status='ACCEPTED'),
+            ),
         ]
 
     def __str__(self):
         return f"{self.name} ({self.phone}) - {self.status}"
 
     def save(self, *args, **kwargs):
+        self.phone_normalized = normalize_phone(self.phone)
+
         # Update registration date when status changes to REGISTERED
         if self.status == 'REGISTERED' and not self.registration_date:
             self.registration_date = timezone.now()
         
         # Update processing status date when processing status changes
-        if self.pk:
-            original = Lead.objects.get(pk=self.pk)
-            if original.processing_status != self.processing_status:
-                self.processing_status_date = timezone.now()
+        if not self._state.adding and self.has_changed('processing_status'):
+            self.processing_status_date = timezone.now()
         
         super().save(*args, **kwargs)
 
@@ -192,6 +221,9 @@ class LeadAssignment(models.Model):
 
     class Meta:
         ordering = ['-timestamp']
+        indexes  = [
+            models.Index(fields=['lead', 'timestamp', 'id']),
+        ]
 
     def __str__(self):
         return f"{self.lead} assigned to {self.assigned_to} by {self.assigned_by}"
@@ -207,6 +239,9 @@ class ProcessingUpdate(models.Model):
 
     class Meta:
         ordering = ['-timestamp']
+        indexes  = [
+            models.Index(fields=['lead', 'timestamp', 'id']),
+        ]
 
     def __str__(self):
         return f"{self.lead} - {self.get_status_display()} at {self.timestamp}"
@@ -222,6 +257,9 @@ class RemarkHistory(models.Model):
 
     class Meta:
         ordering = ['-changed_at']
+        indexes  = [
+            models.Index(fields=['lead', 'changed_at', 'id']),
+        ]
 
     def __str__(self):
         return f"Remarks changed for {self.lead} at {self.changed_at}"
@@ -229,7 +267,8 @@ class RemarkHistory(models.Model):
 
 
 
-class FollowUp(models.Model):
+class FollowUp(DirtyFieldsMixin, models.Model):
+    tracked_fields = ['status', 'converted_to_lead', 'follow_up_date', 'follow_up_time']  # read by FollowUp.save and leads.signals
 
     STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -261,6 +300,7 @@ class FollowUp(models.Model):
 
 
     phone_number = models.CharField(max_length=20)
+    phone_normalized = models.CharField(max_length=30, blank=True, db_index=True, editable=False)
     name = models.CharField(max_length=150, blank=True, null=True)
 
 
@@ -307,6 +347,13 @@ class FollowUp(models.Model):
             models.Index(fields=['follow_up_date']),
             models.Index(fields=['status']),
             models.Index(fields=['assigned_to']),
+            models.Index(fields=['assigned_to', 'follow_up_date', 'id']),
+            # Due-reminder scan in leads.reminders: only rows still waiting for one
+            models.Index(
+                fields=['follow_up_date', 'follow_up_time', 'id'],
+                name='followup_reminder_due_idx',
+                condition=models.Q(status='pending', reminder_sent_at__isnull=True),
+            ),
         ]
 
     def __str__(self):
@@ -314,20 +361,24 @@ class FollowUp(models.Model):
         return f"{display} — {self.follow_up_date}"
 
     def save(self, *args, **kwargs):
+        self.phone_normalized = normalize_phone(self.phone_number)
+
         # Track conversion time
         if self.converted_to_lead and not self.converted_at:
             self.converted_at = timezone.now()
 
+        # Rescheduled: remind again at the new time
+        if not self._state.adding and (self.has_changed('follow_up_date') or self.has_changed('follow_up_time')):
+            self.reminder_sent_at = None
+
         # Track status changes for history
-        if self.pk:
-            original = FollowUp.objects.get(pk=self.pk)
-            if original.status != self.status:
-                FollowUpHistory.objects.create(
-                    followup=self,
-                    old_status=original.status,
-                    new_status=self.status,
-                    changed_by=self.assigned_to
-                )
+        if not self._state.adding and self.has_changed('status'):
+            FollowUpHistory.objects.create(
+                followup=self,
+                old_status=self.old_value('status'),
+                new_status=self.status,
+                changed_by=self.assigned_to
+            )
 
         super().save(*args, **kwargs)
 
@@ -369,6 +420,244 @@ class FollowUpHistory(models.Model):
 
     class Meta:
         ordering = ['-changed_at']
+        indexes  = [
+            models.Index(fields=['followup', 'changed_at', 'id']),
+        ]
+
+    def __str__(self):
+        return f"{self.followup} | {self.old_status} → {self.new_status}"
+
+class ImportJob(models.Model):
+    """A bulk lead upload queued for the `process_import_jobs` worker."""
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('COMPLETED', 'Completed'),
+        ('FAILED', 'Failed'),
+    ]
+
+    uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='lead_import_jobs')
+    file = CloudinaryField('file', resource_type='raw', folder='leads/imports')
+    original_filename = models.CharField(max_length=255)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING', db_index=True)
+
+    # Progress counters, updated after every processed chunk
+    total_rows = models.PositiveIntegerField(null=True, blank=True)
+    rows_processed = models.PositiveIntegerField(default=0)
+    success_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    failed_rows = models.JSONField(default=list, blank=True)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Touched by the worker after every chunk; a RUNNING job that stops
+    # touching it for STALE_AFTER is taken to have lost its worker
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    STALE_AFTER = timedelta(minutes=15)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Import #{self.pk} {self.original_filename} [{self.status}]"
+
+    @classmethod
+    def fail_stale(cls, stale_after=STALE_AFTER):
+        """
+        Mark RUNNING jobs whose worker died as FAILED. They are not re-run:
+        the leads from chunks that already committed would all fail as
+        duplicates. Returns how many were failed.
+        """
+        now    = timezone.now()
+        cutoff = now - stale_after
+        stale  = models.Q(heartbeat_at__lt=cutoff) | models.Q(heartbeat_at__isnull=True, started_at__lt=cutoff)
+        return cls.objects.filter(stale, status='RUNNING').update(
+            status='FAILED',
+            error='The import worker stopped while processing this file.',
+            finished_at=now,
+        )
+
+    @classmethod
+    def claim_next(cls):
+        """Atomically move the oldest PENDING job to RUNNING (safe with several workers)."""
+        cls.fail_stale()
+        with transaction.atomic():
+            job = (
+                cls.objects.select_for_update(skip_locked=True)
+                .filter(status='PENDING')
+                .order_by('created_at')
+                .first()
+            )
+            if job is None:
+                return None
+            job.status = 'RUNNING'
+            job.started_at = job.heartbeat_at = timezone.now()
+            job.save(update_fields=['status', 'started_at', 'heartbeat_at'])
+        return job
+
+
+class LeadStatsCounter(models.Model):
+    """
+    Maintained lead counts behind the LeadListView stats block.
+
+    One row per (scope, user, status). Kept current by leads.stats from the
+    save/delete signals and the bulk import/assign paths, and rebuilt by
+    `manage.py rebuild_lead_stats`. Readers sum rows, so a duplicate row
+    created by a concurrent first insert is harmless.
+    """
+    SCOPE_CHOICES = [
+        ('ALL', 'All leads'),
+        ('HANDLED', 'Assigned or sub-assigned to user'),
+        ('ASSIGNED', 'Assigned to user'),
+        ('SUB_ASSIGNED', 'Sub-assigned to user'),
+    ]
+
+    scope = models.CharField(max_length=20, choices=SCOPE_CHOICES)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='lead_stats_counters')
+    status = models.CharField(max_length=20)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['scope', 'user', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.scope}/{self.user_id}/{self.status}: {self.count}"
+
+
+class DuplicateLeadCandidate(models.Model):
+    """
+    A pair of leads that look like the same person, written by
+    `manage.py find_duplicate_leads` (see leads.duplicates). `lead_a` is
+    always the lower id. Re-running the scan replaces OPEN rows and keeps
+    DISMISSED ones, so a dismissed pair is not suggested again.
+    """
+    STATUS_CHOICES = [
+        ('OPEN', 'Open'),
+        ('DISMISSED', 'Dismissed'),
+    ]
+
+    lead_a = models.ForeignKey(Lead, on_delete=models.CASCADE, related_name='+')
+    lead_b = models.ForeignKey(Lead, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField(help_text="0-1, higher is more likely the same person")
+    reasons = models.JSONField(default=list, help_text="Matched keys: phone, email, name")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='OPEN')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-score', 'id']
+        constraints = [
+            models.UniqueConstraint(fields=['lead_a', 'lead_b'], name='unique_duplicate_lead_pair'),
+        ]
+        indexes = [
+            models.Index(fields=['status', '-score']),
+            models.Index(fields=['lead_b']),
+        ]
+
+    def __str__(self):
+        return f"{self.lead_a_id} ~ {self.lead_b_id} ({self.score:.2f})"
+
+
+class LeadTombstone(models.Model):
+    """
+    Marker left when a lead is deleted, so `/leads/changes/` can tell
+    clients to drop it (see leads.sync). Keeps who handled the lead at the
+    time, for role scoping. Pruned by `manage.py prune_lead_tombstones`.
+    """
+    lead_id = models.BigIntegerField()
+    assigned_to_id = models.BigIntegerField(null=True, blank=True)
+    sub_assigned_to_id = models.BigIntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['deleted_at']
+        indexes = [
+            models.Index(fields=['deleted_at']),
+        ]
+
+    def __str__(self):
+        return f"Lead {self.lead_id} deleted at {self.deleted_at}"
+
+
+class LeadRoutingRule(models.Model):
+    """
+    Who new unassigned leads go to (see leads.routing).
+
+    Rules are tried in `priority` order; the first active rule whose source
+    and program match a lead picks one of its `members` with its strategy.
+    A blank source or program matches anything. `last_assigned_to` is the
+    round-robin cursor.
+    """
+    STRATEGY_CHOICES = [
+        ('ROUND_ROBIN', 'Round robin'),
+        ('LEAST_OPEN', 'Fewest open leads'),
+    ]
+
+    name = models.CharField(max_length=100)
+    source = models.CharField(max_length=20, choices=Lead.SOURCE_CHOICES, blank=True, help_text="Blank matches any source")
+    program = models.CharField(max_length=100, blank=True, help_text="Matched case-insensitively as part of the lead's program; blank matches any")
+    strategy = models.CharField(max_length=20, choices=STRATEGY_CHOICES, default='LEAST_OPEN')
+    members = models.ManyToManyField(User, related_name='lead_routing_rules', help_text="The team this rule routes to")
+    priority = models.PositiveIntegerField(default=100, help_text="Lower runs first")
+    is_active = models.BooleanField(default=True)
+    last_assigned_to = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['priority', 'id']
+
+    def __str__(self):
+        return f"{self.name} ({self.get_strategy_display()})"
+
+
+class LeadIntakeRollup(models.Model):
+    """
+    Leads created per local (TIME_ZONE) day and hour, by source and
+    assignee, behind `/leads/intake/` (see leads.intake). Finished days are
+    written by `manage.py refresh_lead_intake_rollups`; days after the last
+    rolled-up one are counted live. The assignee is the one at refresh time.
+    """
+    day = models.DateField()
+    hour = models.PositiveSmallIntegerField()
+    source = models.CharField(max_length=20, blank=True)
+    custom_source = models.CharField(max_length=50, blank=True)
+    assigned_to = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['day', 'hour']
+        indexes = [
+            models.Index(fields=['day', 'hour']),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.hour:02d}h {self.source or '-'}: {self.count}"
+
+
+class LeadStatusTransition(models.Model):
+    """
+    One row per lead status change, plus the initial status (`from_status`
+    blank) when a lead is created. Written by leads.signals and the bulk
+    import; read by the funnel engine (see leads.funnel).
+    """
+    lead = models.ForeignKey(Lead, on_delete=models.CASCADE, related_name='status_transitions')
+    from_status = models.CharField(max_length=20, blank=True)
+    to_status = models.CharField(max_length=20)
+    changed_at = models.DateTimeField(default=timezone.now)
+    changed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+
+    class Meta:
+        ordering = ['changed_at', 'id']
+        indexes = [
+            models.Index(fields=['lead', 'changed_at']),
+            models.Index(fields=['changed_at']),
+        ]
 
     def __str__(self):
-        return f"{self.followup} | {self.old_status} → {self.new_status}"
\ No newline at end of file
+        return f"Lead {self.lead_id}: {self.from_status or '-'} → {self.to_status}"
@@ -33,6 +33,9 @@ LEAD_ACCESS_ROLES = FULL_ACCESS_ROLES + MANAGER_ROLES + EXECUTIVE_ROLES
 LEAD_VIEW_ALL_ROLES = FULL_ACCESS_ROLES
 
 
+PROCESSING_ROLES = ['PROCESSING']
+
+
 class CanAccessLeads(BasePermission):
     def has_permission(self, request, view):
         return (
@@ -63,4 +66,12 @@ class CanModifyAllLeads(BasePermission):
         return (
             request.user.is_authenticated and
             request.user.role in FULL_ACCESS_ROLES
-        )
\ No newline at end of file
+        )
+
+
+class CanProcessLeads(BasePermission):
+    def has_permission(self, request, view):
+        return (
+            request.user.is_authenticated and
+            request.user.role in PROCESSING_ROLES
+        )
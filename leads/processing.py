@@ -0,0 +1,132 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from accounts.models import ActivityLog
+from accounts.utils import build_activity_log
+
+from .models import Lead, ProcessingUpdate
+
+
+MAX_CLAIM       = 20
+# An ACCEPTED lead not moved on to PROCESSING within this long goes back to the queue
+CLAIM_TTL       = timedelta(hours=4)
+
+
+def _move(leads, new_status, executive, changed_by, notes):
+    """
+    Set processing_status on `leads` (locked rows) with one UPDATE, and
+    bulk-write the ProcessingUpdate rows and the LEAD_PROCESSING_UPDATED
+    entries Lead.save and leads.signals would write one by one.
+
+    A claim (ACCEPTED) keeps the lead's queue time in processing_queued_at;
+    going back to FORWARDED restores it, so the lead keeps its place.
+    """
+    now    = timezone.now()
+    fields = {'processing_status_date': now}
+    if new_status == 'ACCEPTED':
+        fields = {'processing_queued_at': F('processing_status_date'), 'processing_status_date': now}
+    elif new_status == 'FORWARDED':
+        fields = {'processing_queued_at': None, 'processing_status_date': Coalesce('processing_queued_at', Value(now))}
+    Lead.objects.filter(id__in=[lead.id for lead in leads]).update(
+        processing_status=new_status,
+        processing_executive=executive,
+        updated_at=now,
+        **fields,
+    )
+    ProcessingUpdate.objects.bulk_create([
+        ProcessingUpdate(lead=lead, status=new_status, changed_by=changed_by, notes=notes)
+        for lead in leads
+    ])
+    ActivityLog.objects.bulk_create([
+        build_activity_log(
+            action='LEAD_PROCESSING_UPDATED',
+            entity_type='Lead',
+            entity_id=lead.pk,
+            entity_name=lead.name,
+            user=changed_by,
+            description=f'Lead "{lead.name}" processing status changed from {lead.processing_status} → {new_status}.',
+            metadata={
+                'old_processing_status': lead.processing_status,
+                'new_processing_status': new_status,
+            },
+        )
+        for lead in leads
+    ])
+    for lead in leads:
+        if new_status == 'ACCEPTED':
+            lead.processing_queued_at, lead.processing_status_date = lead.processing_status_date, now
+        elif new_status == 'FORWARDED':
+            lead.processing_queued_at, lead.processing_status_date = None, lead.processing_queued_at or now
+        else:
+            lead.processing_status_date = now
+        lead.processing_status    = new_status
+        lead.processing_executive = executive
+        lead.updated_at           = now
+    return leads
+
+
+def _locked(queryset):
+    # of=self: never lock the joined user rows
+    return list(
+        queryset.select_for_update(skip_locked=True, of=('self',))
+        .only('id', 'name', 'processing_status', 'processing_status_date', 'processing_queued_at')
+    )
+
+
+def claim_processing_leads(executive, count):
+    """
+    Claim up to `count` of the oldest FORWARDED leads for `executive`.
+
+    The rows are locked with SKIP LOCKED, so two executives claiming at
+    the same moment get different leads and nobody waits. Claimed leads
+    move to ACCEPTED with processing_executive set. Stale claims are
+    released first, in the same transaction. Returns the claimed leads,
+    oldest first.
+    """
+    with transaction.atomic():
+        _release_stale(CLAIM_TTL, timezone.now())
+        leads = _locked(
+            Lead.objects.filter(processing_status='FORWARDED')
+            .order_by('processing_status_date', 'id')[:min(count, MAX_CLAIM)]
+        )
+        if leads:
+            _move(leads, 'ACCEPTED', executive, executive, 'Claimed from the processing queue')
+    return leads
+
+
+def release_processing_leads(executive, lead_ids):
+    """Hand the executive's own ACCEPTED claims in `lead_ids` back to the queue."""
+    with transaction.atomic():
+        leads = _locked(Lead.objects.filter(
+            id__in=lead_ids,
+            processing_status='ACCEPTED',
+            processing_executive=executive,
+        ).order_by('id'))
+        if leads:
+            _move(leads, 'FORWARDED', None, executive, 'Released back to the processing queue')
+    return leads
+
+
+def release_stale_claims(ttl=CLAIM_TTL, now=None):
+    """
+    Return ACCEPTED leads claimed more than `ttl` ago (and not moved on to
+    PROCESSING since) to FORWARDED. Returns how many were released.
+    """
+    with transaction.atomic():
+        return len(_release_stale(ttl, now or timezone.now()))
+
+
+def _release_stale(ttl, now):
+    # Call inside a transaction; rows another claim holds are skipped
+    leads = _locked(Lead.objects.filter(
+        processing_status='ACCEPTED',
+        processing_executive__isnull=False,
+        processing_status_date__lt=now - ttl,
+    ).order_by('id'))
+    if leads:
+        _move(leads, 'FORWARDED', None, None, f'Claim expired after {ttl}; returned to the queue')
+    return leads
@@ -0,0 +1,107 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from notifications.models import Notification
+from utils import notify_followup_reminders
+
+from .models import FollowUp
+
+
+REMINDER_LEAD_TIME  = timedelta(minutes=15)  # remind this long before follow_up_time
+REMINDER_LOOKBACK   = timedelta(days=1)      # older missed follow-ups are only listed as overdue
+REMINDER_BATCH_SIZE = 500
+MAX_EVENT_ITEMS     = 20                     # follow-ups listed in one Pusher event (10KB limit)
+
+
+def due_reminders_q(now, lead_time=REMINDER_LEAD_TIME):
+    """
+    Pending follow-ups without a reminder that are due by now + lead_time.
+
+    follow_up_date/time are wall-clock values in TIME_ZONE. Follow-ups with
+    no time are due from the start of their day. Matches the partial
+    `followup_reminder_due_idx` index.
+    """
+    local   = timezone.localtime(now)
+    horizon = local + lead_time
+    return Q(status='pending', reminder_sent_at__isnull=True) & Q(
+        follow_up_date__gte=local.date() - REMINDER_LOOKBACK
+    ) & (
+        Q(follow_up_time__isnull=True, follow_up_date__lte=local.date()) |
+        Q(follow_up_time__isnull=False, follow_up_date__lt=horizon.date()) |
+        Q(follow_up_date=horizon.date(), follow_up_time__lte=horizon.time())
+    )
+
+
+def _reminder_message(followup):
+    when = followup.follow_up_time.strftime('%I:%M %p') if followup.follow_up_time else 'today'
+    return f"Follow-up due {when}: {followup.get_followup_type_display()} {followup.contact_display}"
+
+
+def _event_item(followup):
+    return {
+        'followup_id':    followup.id,
+        'lead_id':        followup.lead_id,
+        'contact':        followup.contact_display,
+        'follow_up_date': followup.follow_up_date.isoformat(),
+        'follow_up_time': followup.follow_up_time.isoformat() if followup.follow_up_time else None,
+        'followup_type':  followup.followup_type,
+        'priority':       followup.priority,
+    }
+
+
+def claim_due_reminders(now, lead_time=REMINDER_LEAD_TIME, batch_size=REMINDER_BATCH_SIZE):
+    """
+    Claim one batch of due follow-ups and write their Notification rows.
+
+    In one transaction: the rows are locked with SKIP LOCKED (another node
+    running at the same time takes different rows), one Notification per
+    follow-up is bulk-inserted and `reminder_sent_at` is set with a single
+    UPDATE. A follow-up therefore gets its notification exactly once.
+    Returns the claimed follow-ups (lead loaded).
+    """
+    with transaction.atomic():
+        followups = list(
+            FollowUp.objects
+            .select_for_update(skip_locked=True, of=('self',))
+            .select_related('lead')
+            .filter(due_reminders_q(now, lead_time))
+            .order_by('follow_up_date', 'follow_up_time', 'id')[:batch_size]
+        )
+        if not followups:
+            return []
+
+        Notification.objects.bulk_create([
+            Notification(user_id=followup.assigned_to_id, type='followup', message=_reminder_message(followup))
+            for followup in followups
+        ])
+        FollowUp.objects.filter(id__in=[followup.id for followup in followups]).update(reminder_sent_at=now)
+    return followups
+
+
+def send_due_reminders(now=None, lead_time=REMINDER_LEAD_TIME, batch_size=REMINDER_BATCH_SIZE):
+    """
+    Claim every due follow-up batch by batch, then send one Pusher event per
+    assignee for the whole run. Returns (followup_count, user_count).
+    """
+    now     = now or timezone.now()
+    by_user = defaultdict(list)
+    while True:
+        batch = claim_due_reminders(now, lead_time, batch_size)
+        for followup in batch:
+            by_user[followup.assigned_to_id].append(followup)
+        if len(batch) < batch_size:
+            break
+
+    # 🔔 After commit: a failed push never un-sends the stored notifications
+    for user_id, followups in by_user.items():
+        notify_followup_reminders(
+            user_id=user_id,
+            followups=[_event_item(followup) for followup in followups[:MAX_EVENT_ITEMS]],
+            total=len(followups),
+        )
+
+    return sum(len(followups) for followups in by_user.values()), len(by_user)
@@ -0,0 +1,208 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Prefetch, Sum
+from django.utils import timezone
+
+from accounts.models import ActivityLog, User
+from utils import notify_leads_bulk_assigned
+
+from .assignments import _assignment_entries
+from .models import Lead, LeadAssignment, LeadRoutingRule, LeadStatsCounter
+from .permissions import EXECUTIVE_ROLES, MANAGER_ROLES
+from .stats import adjust_lead_stats, lead_state
+
+
+# Statuses that still need work from the assignee
+OPEN_STATUSES = ['ENQUIRY', 'QUALIFIED', 'CNR']
+
+
+# ── Strategies
+class RoundRobinStrategy:
+    """The member after the one this rule assigned last."""
+
+    def pick(self, rule, members, loads):
+        ids = [member.id for member in members]
+        if rule.last_assigned_to_id in ids:
+            return members[(ids.index(rule.last_assigned_to_id) + 1) % len(members)]
+        return members[0]
+
+
+class LeastOpenStrategy:
+    """The member with the fewest open leads (lowest id on a tie)."""
+
+    def pick(self, rule, members, loads):
+        return min(members, key=lambda member: (loads.get(member.id, 0), member.id))
+
+
+STRATEGIES = {
+    'ROUND_ROBIN': RoundRobinStrategy(),
+    'LEAST_OPEN':  LeastOpenStrategy(),
+}
+
+
+# ── Router
+class LeadRouter:
+    """
+    Picks assignees for new leads from the active LeadRoutingRules.
+
+    Rules, their members and the members' open-lead counts are loaded once
+    (three queries) and every pick after that is in memory. Open counts come
+    from the maintained LeadStatsCounter rows (scope ASSIGNED), not a COUNT
+    over leads, and are bumped locally as leads are handed out so a batch
+    stays balanced. Call save() to store the round-robin cursors.
+
+    With `lock=True` (inside transaction.atomic) the rule rows are locked,
+    so concurrent routing of the same rule queues up instead of handing two
+    leads to the same "next" member.
+    """
+
+    def __init__(self, lock=True):
+        members = User.objects.filter(
+            is_active=True,
+            role__in=MANAGER_ROLES + EXECUTIVE_ROLES,
+        ).order_by('id')
+        rules = LeadRoutingRule.objects.filter(is_active=True)
+        if lock:
+            rules = rules.select_for_update()
+        self.rules = [
+            rule for rule in rules.prefetch_related(Prefetch('members', queryset=members))
+            if rule.members.all()
+        ]
+
+        member_ids = {member.id for rule in self.rules for member in rule.members.all()}
+        self.loads = dict(
+            LeadStatsCounter.objects
+            .filter(scope='ASSIGNED', status__in=OPEN_STATUSES, user_id__in=member_ids)
+            .values_list('user_id')
+            .annotate(total=Sum('count'))
+        ) if member_ids else {}
+        self.moved = set()
+
+    def match(self, source, program):
+        program = (program or '').lower()
+        for rule in self.rules:
+            if rule.source and rule.source != source:
+                continue
+            if rule.program and rule.program.lower() not in program:
+                continue
+            return rule
+        return None
+
+    def pick(self, source, program, status='ENQUIRY'):
+        """Returns (rule, assignee) for a lead, or (None, None) when no rule matches."""
+        rule = self.match(source, program)
+        if rule is None:
+            return None, None
+
+        assignee = STRATEGIES[rule.strategy].pick(rule, list(rule.members.all()), self.loads)
+        rule.last_assigned_to = assignee
+        self.moved.add(rule)
+        if status in OPEN_STATUSES:
+            self.loads[assignee.id] = self.loads.get(assignee.id, 0) + 1
+        return rule, assignee
+
+    def save(self):
+        for rule in self.moved:
+            LeadRoutingRule.objects.filter(pk=rule.pk).update(last_assigned_to=rule.last_assigned_to)
+        self.moved.clear()
+
+
+# ── Routing existing leads
+def route_leads(leads, assigned_by=None):
+    """
+    Assign unassigned `leads` through the routing rules, in one transaction.
+
+    Costs the router's loads plus one UPDATE per assignee and bulk INSERTs
+    for LeadAssignment and ActivityLog, however many leads there are. The
+    lead objects are updated in place. Returns {assignee: [leads]}; leads no
+    rule matched stay unassigned and are left out.
+    """
+    routed = defaultdict(list)
+    with transaction.atomic():
+        router = LeadRouter()
+        rules  = {}
+        for lead in leads:
+            if lead.assigned_to_id is not None:
+                continue
+            rule, assignee = router.pick(lead.source, lead.program, lead.status)
+            if assignee is not None:
+                routed[assignee].append(lead)
+                rules[lead.pk] = rule
+        if not routed:
+            return {}
+
+        now     = timezone.now()
+        history = []
+        entries = []
+        changes = []
+        for assignee, group in routed.items():
+            Lead.objects.filter(id__in=[lead.id for lead in group]).update(
+                assigned_to=assignee,
+                assigned_by=assigned_by,
+                assigned_date=now,
+                updated_at=now,
+            )
+            for lead in group:
+                entries.extend(_assignment_entries(lead, 'PRIMARY', assignee, assigned_by))
+                changes.append((
+                    lead_state(lead.status, lead.assigned_to_id, lead.sub_assigned_to_id),
+                    lead_state(lead.status, assignee.id, lead.sub_assigned_to_id),
+                ))
+                history.append(LeadAssignment(
+                    lead=lead,
+                    assigned_to=assignee,
+                    assigned_by=assigned_by,
+                    assignment_type='PRIMARY',
+                    notes=f'Auto-routed by rule "{rules[lead.pk].name}"',
+                ))
+                lead.assigned_to   = assignee
+                lead.assigned_by   = assigned_by
+                lead.assigned_date = now
+                lead.updated_at    = now
+
+        LeadAssignment.objects.bulk_create(history)
+        ActivityLog.objects.bulk_create(entries)
+        adjust_lead_stats(changes)
+        router.save()
+
+    return dict(routed)
+
+
+def route_backlog(assigned_by=None, limit=None):
+    """
+    Route every open, unassigned lead (oldest first) in one transaction.
+
+    Rows are locked with SKIP LOCKED, so leads someone is assigning by hand
+    right now are left alone. Returns (routed, unrouted) counts and the
+    {assignee: [leads]} map.
+    """
+    with transaction.atomic():
+        backlog = (
+            Lead.objects.select_for_update(skip_locked=True)
+            .filter(assigned_to__isnull=True, status__in=OPEN_STATUSES)
+            .order_by('created_at', 'id')
+        )
+        if limit:
+            backlog = backlog[:limit]
+        backlog = list(backlog)
+        routed  = route_leads(backlog, assigned_by=assigned_by)
+
+    count = sum(len(group) for group in routed.values())
+    return count, len(backlog) - count, routed
+
+
+def notify_routed_leads(routed, assigned_by=None):
+    # 🔔 One grouped Pusher notification per assignee (self-assignments skipped)
+    for assignee, leads in routed.items():
+        if assignee == assigned_by:
+            continue
+        notify_leads_bulk_assigned(
+            assignee_id=assignee.id,
+            assigned_by=assigned_by,
+            leads=[
+                {'lead_id': lead.id, 'lead_name': lead.name, 'priority': lead.priority}
+                for lead in leads
+            ],
+            assignment_type='PRIMARY',
+        )
@@ -0,0 +1,83 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F, Q
+from rest_framework import filters
+
+
+# Columns matched as substrings through pg_trgm indexes (see migration 0031)
+TRIGRAM_FIELDS     = ['phone', 'email']
+# A shorter pattern has no trigram to look up, so the index would be read in full
+MIN_TRIGRAM_LENGTH = 3
+# Ranking reads every match; past this many, results come in the default order
+MAX_RANKED_MATCHES = 5000
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def lead_search_query(term):
+    """
+    Prefix tsquery for one search term ('ram kum' -> 'ram:* & kum:*'),
+    or None when the term has no word characters (e.g. '+91').
+    """
+    words = WORD_RE.findall(term.lower())
+    if not words:
+        return None
+    return SearchQuery(' & '.join(f'{word}:*' for word in words), search_type='raw', config='simple')
+
+
+class LeadSearchFilter(filters.SearchFilter):
+    """
+    ?search= for leads backed by the maintained `Lead.search_vector` column.
+
+    Same contract as SearchFilter: whitespace/comma separated terms, every
+    term must match. On PostgreSQL a term matches when it prefixes a word in
+    name/program/remarks (GIN on search_vector) or, from MIN_TRIGRAM_LENGTH
+    characters, is a substring of phone/email (pg_trgm GIN indexes). Terms
+    with neither (e.g. '+') are ignored.
+
+    Unless ?ordering= is given, up to MAX_RANKED_MATCHES results are
+    annotated with `search_rank` for LeadOrderingFilter. A broader search
+    (e.g. 'ra' mid-keystroke) keeps the default order, which an index
+    serves without reading every match. Other databases fall back to the
+    plain SearchFilter over the view's search_fields.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms or connection.vendor != 'postgresql':
+            return super().filter_queryset(request, queryset, view)
+
+        ranked = None
+        for term in terms:
+            query     = lead_search_query(term)
+            condition = Q()
+            if len(term) >= MIN_TRIGRAM_LENGTH:
+                for field in TRIGRAM_FIELDS:
+                    condition |= Q(**{f'{field}__icontains': term})
+            if query is not None:
+                condition |= Q(search_vector=query)
+                ranked = query if ranked is None else ranked & query
+            if condition:
+                queryset = queryset.filter(condition)
+
+        if (
+            ranked is not None
+            and LeadOrderingFilter.ordering_param not in request.query_params
+            and queryset.order_by()[:MAX_RANKED_MATCHES + 1].count() <= MAX_RANKED_MATCHES
+        ):
+            queryset = queryset.annotate(search_rank=SearchRank(F('search_vector'), ranked))
+        return queryset
+
+
+class LeadOrderingFilter(filters.OrderingFilter):
+    """OrderingFilter that puts the best search matches first unless ?ordering= is given."""
+
+    def filter_queryset(self, request, queryset, view):
+        if (
+            self.ordering_param not in request.query_params
+            and 'search_rank' in queryset.query.annotations
+        ):
+            return queryset.order_by('-search_rank', *(self.get_default_ordering(view) or []))
+        return super().filter_queryset(request, queryset, view)
@@ -1,8 +1,11 @@
 from rest_framework import serializers
-from .models import Lead, ProcessingUpdate, RemarkHistory, LeadAssignment,FollowUp, FollowUpHistory
+from .models import Lead, ProcessingUpdate, RemarkHistory, LeadAssignment,FollowUp, FollowUpHistory, ImportJob, DuplicateLeadCandidate
 from accounts.models import User
+from django.urls import reverse
 from django.utils import timezone
 from .permissions import FULL_ACCESS_ROLES, MANAGER_ROLES, EXECUTIVE_ROLES
+from .processing import MAX_CLAIM
+from utils.phone import normalize_phone
 
 
 # Shared user serializer
@@ -37,7 +40,7 @@ class LeadCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError('Phone number must contain only digits.')
         if len(value) < 10:
             raise serializers.ValidationError('Phone number must be at least 10 digits.')
-        if Lead.objects.filter(phone=value).exists():
+        if Lead.objects.filter(phone_normalized=normalize_phone(value)).exists():
             raise serializers.ValidationError('A lead with this phone number already exists.')
         return value
 
@@ -142,6 +145,62 @@ class LeadAssignmentSerializer(serializers.ModelSerializer):
         read_only_fields = ['timestamp']
 
 
+def get_assignment_type(user, lead, assignee):
+    """
+    Apply the role rules for `user` assigning `lead` to `assignee`.
+
+    Returns 'PRIMARY' or 'SUB', or raises ValidationError. Pure in-memory
+    check, shared by LeadAssignSerializer and the bulk assign path.
+    """
+    if user.role in FULL_ACCESS_ROLES:
+        if assignee.role not in MANAGER_ROLES + EXECUTIVE_ROLES:
+            raise serializers.ValidationError({
+                'assigned_to_id': 'Can only assign to managers or executives.'
+            })
+        return 'PRIMARY'
+
+    elif user.role == 'ADM_MANAGER':
+        if assignee.role not in ['ADM_EXEC', 'FOE']:
+            raise serializers.ValidationError({
+                'assigned_to_id': (
+                    'Admission Managers can only assign to '
+                    'Front Office Executives or Admission Executives.'
+                )
+            })
+        if lead.assigned_to_id != user.id:
+            raise serializers.ValidationError({
+                'lead_id': 'You can only sub-assign leads assigned to you.'
+            })
+        return 'SUB'
+
+    elif user.role in MANAGER_ROLES and user.role != 'ADM_MANAGER':
+        if assignee != user and assignee.role not in EXECUTIVE_ROLES:
+            raise serializers.ValidationError({
+                'assigned_to_id': 'Managers can only assign to themselves or executives.'
+            })
+        if lead.assigned_to_id != user.id:
+            raise serializers.ValidationError({
+                'lead_id': 'You can only sub-assign leads assigned to you.'
+            })
+        return 'SUB'
+
+    elif user.role == 'ADM_EXEC':
+        if assignee != user:
+            raise serializers.ValidationError({
+                'assigned_to_id': 'Admission Executives can assign leads only to themselves.'
+            })
+        return 'PRIMARY'
+
+    elif user.role == 'FOE':
+        if assignee != user:
+            raise serializers.ValidationError({
+                'assigned_to_id': 'Front Office Executives can assign leads only to themselves.'
+            })
+        return 'PRIMARY'
+
+    raise serializers.ValidationError("You don't have permission to assign leads.")
+
+
 # Lead Assign Serializer (validate + route assign/sub-assign requests)
 class LeadAssignSerializer(serializers.Serializer):
     lead_id        = serializers.IntegerField()
@@ -161,55 +220,7 @@ class LeadAssignSerializer(serializers.Serializer):
         except User.DoesNotExist:
             raise serializers.ValidationError({'assigned_to_id': 'User not found.'})
 
-        if user.role in FULL_ACCESS_ROLES:
-            if assignee.role not in MANAGER_ROLES + EXECUTIVE_ROLES:
-                raise serializers.ValidationError({
-                    'assigned_to_id': 'Can only assign to managers or executives.'
-                })
-            attrs['assignment_type'] = 'PRIMARY'
-
-        elif user.role == 'ADM_MANAGER':
-            if assignee.role not in ['ADM_EXEC', 'FOE']:
-                raise serializers.ValidationError({
-                    'assigned_to_id': (
-                        'Admission Managers can only assign to '
-                        'Front Office Executives or Admission Executives.'
-                    )
-                })
-            if lead.assigned_to != user:
-                raise serializers.ValidationError({
-                    'lead_id': 'You can only sub-assign leads assigned to you.'
-                })
-            attrs['assignment_type'] = 'SUB'
-
-        elif user.role in MANAGER_ROLES and user.role != 'ADM_MANAGER':
-            if assignee != user and assignee.role not in EXECUTIVE_ROLES:
-                raise serializers.ValidationError({
-                    'assigned_to_id': 'Managers can only assign to themselves or executives.'
-                })
-            if lead.assigned_to != user:
-                raise serializers.ValidationError({
-                    'lead_id': 'You can only sub-assign leads assigned to you.'
-                })
-            attrs['assignment_type'] = 'SUB'
-
-        elif user.role == 'ADM_EXEC':
-            if assignee != user:
-                raise serializers.ValidationError({
-                    'assigned_to_id': 'Admission Executives can assign leads only to themselves.'
-                })
-            attrs['assignment_type'] = 'PRIMARY'
-
-        elif user.role == 'FOE':
-            if assignee != user:
-                raise serializers.ValidationError({
-                    'assigned_to_id': 'Front Office Executives can assign leads only to themselves.'
-                })
-            attrs['assignment_type'] = 'PRIMARY'
-
-        else:
-            raise serializers.ValidationError("You don't have permission to assign leads.")
-
+        attrs['assignment_type'] = get_assignment_type(user, lead, assignee)
         attrs['lead']     = lead
         attrs['assignee'] = assignee
         return attrs
@@ -242,6 +253,57 @@ class LeadListSerializer(serializers.ModelSerializer):
         return UserSimpleSerializer(handler).data
 
 
+# Compact Lead List Serializer (?compact=true)
+COMPACT_USER_FIELDS = UserSimpleSerializer.Meta.fields
+COMPACT_LEAD_USERS  = ['assigned_to', 'assigned_by', 'sub_assigned_to', 'sub_assigned_by']
+
+
+class LeadCompactSerializer(serializers.BaseSerializer):
+    """
+    Read-only LeadListSerializer twin for list pages: same lead fields, but
+    users are referenced by id and sent once per page in a `users` map
+    (see `page_data`). Builds plain dicts instead of running a field tree
+    per row, and needs no select_related on the users.
+    """
+    datetime_field = serializers.DateTimeField()
+
+    def to_representation(self, lead):
+        to_datetime = self.datetime_field.to_representation
+        return {
+            'id':                lead.id,
+            'name':              lead.name,
+            'phone':             lead.phone,
+            'email':             lead.email,
+            'location':          lead.location,
+            'status':            lead.status,
+            'priority':          lead.priority,
+            'program':           lead.program,
+            'source':            lead.source,
+            'custom_source':     lead.custom_source,
+            'processing_status': lead.processing_status,
+            'assigned_to':       lead.assigned_to_id,
+            'assigned_by':       lead.assigned_by_id,
+            'assigned_date':     to_datetime(lead.assigned_date),
+            'sub_assigned_to':   lead.sub_assigned_to_id,
+            'sub_assigned_by':   lead.sub_assigned_by_id,
+            'sub_assigned_date': to_datetime(lead.sub_assigned_date),
+            'current_handler':   lead.sub_assigned_to_id or lead.assigned_to_id,
+            'created_at':        to_datetime(lead.created_at),
+        }
+
+    @classmethod
+    def page_data(cls, leads):
+        """`{'leads': [...], 'users': {id: user}}` for one page; one query for the users."""
+        serializer = cls()
+        rows       = [serializer.to_representation(lead) for lead in leads]
+        user_ids   = {row[field] for row in rows for field in COMPACT_LEAD_USERS} - {None}
+        users      = {
+            user['id']: user
+            for user in User.objects.filter(id__in=user_ids).values(*COMPACT_USER_FIELDS)
+        } if user_ids else {}
+        return {'leads': rows, 'users': users}
+
+
 # Lead Detail Serializer
 class LeadDetailSerializer(serializers.ModelSerializer):
     assigned_to          = UserSimpleSerializer(read_only=True)
@@ -308,6 +370,27 @@ class ProcessingUpdateSerializer(serializers.ModelSerializer):
         return value
 
 
+# Processing Work Queue Serializers
+class ProcessingQueueLeadSerializer(serializers.ModelSerializer):
+    assigned_to = UserSimpleSerializer(read_only=True)
+
+    class Meta:
+        model  = Lead
+        fields = [
+            'id', 'name', 'phone', 'email', 'program', 'status',
+            'processing_status', 'processing_status_date', 'processing_notes',
+            'assigned_to', 'created_at',
+        ]
+
+
+class ProcessingClaimSerializer(serializers.Serializer):
+    count = serializers.IntegerField(min_value=1, max_value=MAX_CLAIM, default=1)
+
+
+class ProcessingReleaseSerializer(serializers.Serializer):
+    lead_ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=MAX_CLAIM * 5)
+
+
 # Remark History Serializer
 class RemarkHistorySerializer(serializers.ModelSerializer):
     changed_by = UserSimpleSerializer(read_only=True)
@@ -435,6 +518,89 @@ class BulkLeadCreateSerializer(LeadCreateSerializer):
         return lead
 
 
+# Bulk Lead Row Serializer (validation only – used by leads.importers)
+class BulkLeadRowSerializer(BulkLeadCreateSerializer):
+    """
+    Same rules as BulkLeadCreateSerializer, minus the per-row phone/email
+    UniqueValidator queries. The importer resolves uniqueness for a whole
+    chunk with one `phone__in` / `email__in` lookup instead.
+    """
+    # Blank: the importer picks the assignee through the routing rules
+    assigned_to = serializers.CharField(required=False, allow_null=True)
+
+    class Meta(BulkLeadCreateSerializer.Meta):
+        extra_kwargs = {
+            'phone': {'validators': []},
+            'email': {'validators': []},
+        }
+
+    def validate_assigned_to(self, value):
+        if value is None:
+            return None
+        return super().validate_assigned_to(value)
+
+
+# Import Job Serializer (bulk upload progress)
+class ImportJobSerializer(serializers.ModelSerializer):
+    error_report_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model  = ImportJob
+        fields = [
+            'id', 'status', 'original_filename',
+            'total_rows', 'rows_processed', 'success_count', 'failed_count',
+            'error', 'error_report_url',
+            'created_at', 'started_at', 'finished_at',
+        ]
+
+    def get_error_report_url(self, obj):
+        if not obj.failed_count:
+            return None
+        return reverse('lead-import-errors', kwargs={'job_id': obj.id})
+
+
+# Duplicate Lead Serializers
+class DuplicateLeadSummarySerializer(serializers.ModelSerializer):
+    assigned_to = UserSimpleSerializer(read_only=True)
+
+    class Meta:
+        model  = Lead
+        fields = [
+            'id', 'name', 'phone', 'email', 'status', 'source',
+            'assigned_to', 'created_at',
+        ]
+
+
+class DuplicateLeadCandidateSerializer(serializers.ModelSerializer):
+    lead_a = DuplicateLeadSummarySerializer(read_only=True)
+    lead_b = DuplicateLeadSummarySerializer(read_only=True)
+
+    class Meta:
+        model  = DuplicateLeadCandidate
+        fields = ['id', 'lead_a', 'lead_b', 'score', 'reasons', 'status', 'created_at']
+
+
+class LeadMergeSerializer(serializers.Serializer):
+    primary_id    = serializers.PrimaryKeyRelatedField(queryset=Lead.objects.all(), source='primary')
+    duplicate_ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, max_length=50,
+    )
+
+    def validate(self, attrs):
+        duplicate_ids = set(attrs['duplicate_ids'])
+        if attrs['primary'].pk in duplicate_ids:
+            raise serializers.ValidationError({
+                'duplicate_ids': 'The primary lead cannot be merged into itself.'
+            })
+        found   = set(Lead.objects.filter(id__in=duplicate_ids).values_list('id', flat=True))
+        missing = duplicate_ids - found
+        if missing:
+            raise serializers.ValidationError({
+                'duplicate_ids': f"Leads not found: {', '.join(map(str, sorted(missing)))}"
+            })
+        attrs['duplicate_ids'] = sorted(duplicate_ids)
+        return attrs
+
 
 class FollowUpSerializer(serializers.ModelSerializer):
     is_overdue = serializers.ReadOnlyField()
@@ -451,6 +617,20 @@ class FollowUpSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
 
+# Follow-up bulk actions (the caller's own follow-ups only)
+class FollowUpBulkRescheduleSerializer(serializers.Serializer):
+    ids            = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=500)
+    follow_up_date = serializers.DateField()
+    follow_up_time = serializers.TimeField(required=False, allow_null=True)
+    notes          = serializers.CharField(required=False, allow_blank=True, default='')
+
+
+class FollowUpBulkStatusSerializer(serializers.Serializer):
+    ids    = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=500)
+    status = serializers.ChoiceField(choices=FollowUp.STATUS_CHOICES)
+    notes  = serializers.CharField(required=False, allow_blank=True, default='')
+
+
 class FollowUpHistorySerializer(serializers.ModelSerializer):
     class Meta:
         model = FollowUpHistory
@@ -1,7 +1,8 @@
 from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
-from .models import Lead, LeadAssignment, FollowUp
-from accounts.utils import log_activity
+from .models import Lead, LeadAssignment, FollowUp, LeadTombstone, LeadStatusTransition
+from .stats import adjust_lead_stats, lead_state
+from accounts.utils import get_current_user, log_activity
  
  
 def _user_label(user):
@@ -12,22 +13,12 @@ def _user_label(user):
  
 @receiver(pre_save, sender=Lead)
 def capture_lead_old_state(sender, instance, **kwargs):
-    if instance.pk:
-        try:
-            old = Lead.objects.get(pk=instance.pk)
-            instance._old_status            = old.status
-            instance._old_processing_status = old.processing_status
-            instance._old_assigned_to       = old.assigned_to_id
-            instance._old_sub_assigned_to   = old.sub_assigned_to_id
-            instance._old_remarks           = old.remarks
-        except Lead.DoesNotExist:
-            instance._old_status = instance._old_processing_status = None
-            instance._old_assigned_to = instance._old_sub_assigned_to = None
-            instance._old_remarks = None
-    else:
-        instance._old_status = instance._old_processing_status = None
-        instance._old_assigned_to = instance._old_sub_assigned_to = None
-        instance._old_remarks = None
+    # Values as loaded (DirtyFieldsMixin) — no extra SELECT
+    instance._old_status            = instance.old_value('status')
+    instance._old_processing_status = instance.old_value('processing_status')
+    instance._old_assigned_to       = instance.old_value('assigned_to')
+    instance._old_sub_assigned_to   = instance.old_value('sub_assigned_to')
+    instance._old_remarks           = instance.old_value('remarks')
  
  
 @receiver(post_save, sender=Lead)
@@ -124,6 +115,38 @@ def log_lead_activity(sender, instance, created, **kwargs):
         )
  
  
+@receiver(post_save, sender=Lead)
+def update_lead_stats(sender, instance, created, **kwargs):
+    old = None if created else lead_state(
+        getattr(instance, '_old_status', None),
+        getattr(instance, '_old_assigned_to', None),
+        getattr(instance, '_old_sub_assigned_to', None),
+    )
+    new = lead_state(instance.status, instance.assigned_to_id, instance.sub_assigned_to_id)
+    if old != new:
+        adjust_lead_stats([(old, new)])
+ 
+ 
+@receiver(post_save, sender=Lead)
+def record_lead_status_transition(sender, instance, created, **kwargs):
+    old = '' if created else getattr(instance, '_old_status', None)
+    if old == instance.status:
+        return
+    LeadStatusTransition.objects.create(
+        lead=instance,
+        from_status=old or '',
+        to_status=instance.status,
+        changed_by=get_current_user(),
+    )
+ 
+ 
+@receiver(post_delete, sender=Lead)
+def remove_lead_stats(sender, instance, **kwargs):
+    adjust_lead_stats([
+        (lead_state(instance.status, instance.assigned_to_id, instance.sub_assigned_to_id), None),
+    ])
+ 
+ 
 @receiver(post_delete, sender=Lead)
 def log_lead_deleted(sender, instance, **kwargs):
     log_activity(
@@ -136,19 +159,19 @@ def log_lead_deleted(sender, instance, **kwargs):
     )
  
  
+@receiver(post_delete, sender=Lead)
+def record_lead_tombstone(sender, instance, **kwargs):
+    LeadTombstone.objects.create(
+        lead_id=instance.pk,
+        assigned_to_id=instance.assigned_to_id,
+        sub_assigned_to_id=instance.sub_assigned_to_id,
+    )
+ 
+ 
 @receiver(pre_save, sender=FollowUp)
 def capture_followup_old_state(sender, instance, **kwargs):
-    if instance.pk:
-        try:
-            old = FollowUp.objects.get(pk=instance.pk)
-            instance._old_fu_status  = old.status
-            instance._old_converted  = old.converted_to_lead
-        except FollowUp.DoesNotExist:
-            instance._old_fu_status = None
-            instance._old_converted = False
-    else:
-        instance._old_fu_status = None
-        instance._old_converted = False
+    instance._old_fu_status = instance.old_value('status')
+    instance._old_converted = bool(instance.old_value('converted_to_lead'))
  
  
 @receiver(post_save, sender=FollowUp)
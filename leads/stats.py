@@ -0,0 +1,135 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from .models import Lead, LeadStatsCounter
+from .permissions import FULL_ACCESS_ROLES
+
+
+def lead_state(status, assigned_to_id, sub_assigned_to_id):
+    """The fields that decide which counters a lead contributes to."""
+    return ((status or '').upper(), assigned_to_id, sub_assigned_to_id)
+
+
+def _counter_keys(state):
+    if state is None:
+        return []
+    status, assigned_to_id, sub_assigned_to_id = state
+    keys = [('ALL', None, status)]
+    if assigned_to_id:
+        keys.append(('ASSIGNED', assigned_to_id, status))
+    if sub_assigned_to_id:
+        keys.append(('SUB_ASSIGNED', sub_assigned_to_id, status))
+    for user_id in {assigned_to_id, sub_assigned_to_id} - {None}:
+        keys.append(('HANDLED', user_id, status))
+    return keys
+
+
+def adjust_lead_stats(changes):
+    """
+    Apply counter deltas for (old_state, new_state) pairs.
+
+    Use None as old_state for a created lead and as new_state for a deleted
+    one. Deltas are netted first, so a whole bulk chunk costs one UPDATE per
+    touched counter row.
+    """
+    delta = Counter()
+    for old, new in changes:
+        for key in _counter_keys(old):
+            delta[key] -= 1
+        for key in _counter_keys(new):
+            delta[key] += 1
+
+    for (scope, user_id, status), amount in delta.items():
+        if amount:
+            _bump(scope, user_id, status, amount)
+
+
+def _bump(scope, user_id, status, amount):
+    lookup  = {'scope': scope, 'user_id': user_id, 'status': status}
+    updated = LeadStatsCounter.objects.filter(**lookup).update(count=F('count') + amount)
+    if not updated:
+        LeadStatsCounter.objects.create(count=amount, **lookup)
+
+
+def get_lead_stats(user):
+    """
+    The LeadListView stats block for an unfiltered list, read from counters.
+
+    Same keys and meaning as the live aggregate in LeadListView.list.
+    """
+    if user.role in FULL_ACCESS_ROLES:
+        rows = LeadStatsCounter.objects.filter(
+            Q(scope='ALL') |
+            Q(scope__in=['ASSIGNED', 'SUB_ASSIGNED'], user=user)
+        )
+        status_scope = 'ALL'
+    else:
+        rows = LeadStatsCounter.objects.filter(user=user)
+        status_scope = 'HANDLED'
+
+    by_status = Counter()
+    stats = {'total_assigned': 0, 'total_sub_assigned': 0}
+    for scope, status, count in rows.values_list('scope', 'status', 'count'):
+        if scope == status_scope:
+            by_status[status] += count
+        elif scope == 'ASSIGNED':
+            stats['total_assigned'] += count
+        elif scope == 'SUB_ASSIGNED':
+            stats['total_sub_assigned'] += count
+
+    return {
+        'new':                by_status['ENQUIRY'],
+        'qualified':          by_status['QUALIFIED'],
+        'converted':          by_status['CONVERTED'],
+        'total_assigned':     stats['total_assigned'],
+        'total_sub_assigned': stats['total_sub_assigned'],
+    }
+
+
+def compute_lead_stats_counters():
+    """Expected counter values from one GROUP BY over the leads table."""
+    expected = Counter()
+    rows = (
+        Lead.objects.order_by()
+        .values_list('status', 'assigned_to_id', 'sub_assigned_to_id')
+        .annotate(total=Count('id'))
+    )
+    for status, assigned_to_id, sub_assigned_to_id, total in rows:
+        for key in _counter_keys(lead_state(status, assigned_to_id, sub_assigned_to_id)):
+            expected[key] += total
+    return expected
+
+
+def current_lead_stats_counters():
+    current = Counter()
+    for scope, user_id, status, count in LeadStatsCounter.objects.values_list(
+        'scope', 'user_id', 'status', 'count'
+    ):
+        current[(scope, user_id, status)] += count
+    return current
+
+
+def find_lead_stats_drift():
+    """Returns {key: (stored, expected)} for every counter that is off."""
+    expected = compute_lead_stats_counters()
+    current  = current_lead_stats_counters()
+    return {
+        key: (current.get(key, 0), expected.get(key, 0))
+        for key in set(expected) | set(current)
+        if current.get(key, 0) != expected.get(key, 0)
+    }
+
+
+def rebuild_lead_stats():
+    """Replace every counter row with freshly computed values."""
+    expected = compute_lead_stats_counters()
+    with transaction.atomic():
+        LeadStatsCounter.objects.all().delete()
+        LeadStatsCounter.objects.bulk_create([
+            LeadStatsCounter(scope=scope, user_id=user_id, status=status, count=count)
+            for (scope, user_id, status), count in expected.items()
+            if count
+        ])
+    return len(expected)
@@ -0,0 +1,130 @@
+import base64
+import binascii
+import json
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from .models import Lead, LeadAssignment, LeadTombstone
+from .permissions import FULL_ACCESS_ROLES
+
+
+# Writes are stamped with updated_at before they commit, so a transaction
+# still in flight can land behind a token already handed out. The final
+# token of a sync stays this far behind "now"; the overlap is re-sent on the
+# next call and clients upsert by id.
+SYNC_OVERLAP = timedelta(seconds=30)
+
+# Tombstones older than this are pruned; older tokens must resync in full
+TOMBSTONE_RETENTION = timedelta(days=30)
+
+
+class SyncToken:
+    """
+    Position of a client in the change stream: the (updated_at, id) of the
+    last lead it received and the time up to which it has seen deletions.
+    Sent as an opaque base64 string.
+    """
+
+    def __init__(self, updated_at=None, lead_id=0, deleted_at=None):
+        self.updated_at = updated_at
+        self.lead_id    = lead_id
+        self.deleted_at = deleted_at
+
+    def encode(self):
+        payload = {
+            'u': [self.updated_at.isoformat() if self.updated_at else None, self.lead_id],
+            'd': self.deleted_at.isoformat() if self.deleted_at else None,
+        }
+        raw = json.dumps(payload, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    @classmethod
+    def decode(cls, token):
+        if not token:
+            return cls()
+        try:
+            raw     = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+            payload = json.loads(raw)
+            updated_at, lead_id = payload['u']
+            deleted_at = payload['d']
+            return cls(
+                updated_at=parse_datetime(updated_at) if updated_at else None,
+                lead_id=int(lead_id),
+                deleted_at=parse_datetime(deleted_at) if deleted_at else None,
+            )
+        except (binascii.Error, ValueError, TypeError, KeyError) as exc:
+            # 400, not 404: the client should drop the token and resync from scratch
+            raise ValidationError({'since': 'Invalid sync token; start again without `since`.'}) from exc
+
+    def is_expired(self, now):
+        """True when deletions since this token may already have been pruned."""
+        since = self.deleted_at or self.updated_at
+        return since is not None and since < now - TOMBSTONE_RETENTION
+
+
+def lead_changes(user, queryset, token, limit):
+    """
+    One page of the change stream for `user`.
+
+    `queryset` is the role-scoped lead queryset. Returns a dict with
+    `changed` (leads, oldest change first, at most `limit`), `deleted`
+    (ids), `unassigned` (ids of leads the user handled that were moved to
+    someone else), `has_more` and the next `token`.
+    """
+    now = timezone.now()
+
+    changed = queryset.order_by('updated_at', 'id')
+    if token.updated_at is not None:
+        changed = changed.filter(
+            Q(updated_at__gt=token.updated_at) |
+            Q(updated_at=token.updated_at, id__gt=token.lead_id)
+        )
+    changed  = list(changed[:limit + 1])
+    has_more = len(changed) > limit
+    changed  = changed[:limit]
+
+    next_token = SyncToken(token.updated_at, token.lead_id, now - SYNC_OVERLAP)
+    if changed:
+        next_token.updated_at, next_token.lead_id = changed[-1].updated_at, changed[-1].id
+    if not has_more:
+        # Caught up: stay SYNC_OVERLAP behind so late commits are not skipped
+        horizon = now - SYNC_OVERLAP
+        if next_token.updated_at is None or next_token.updated_at > horizon:
+            next_token.updated_at, next_token.lead_id = horizon, 0
+
+    # A first sync (no token) has nothing cached to delete
+    deleted = LeadTombstone.objects.none()
+    if token.deleted_at is not None:
+        deleted = LeadTombstone.objects.filter(deleted_at__gt=token.deleted_at)
+    if user.role not in FULL_ACCESS_ROLES:
+        deleted = deleted.filter(Q(assigned_to_id=user.id) | Q(sub_assigned_to_id=user.id))
+
+    unassigned = []
+    if user.role not in FULL_ACCESS_ROLES and token.updated_at is not None:
+        # Updated since the token, handled by the user once, out of scope now
+        handled = LeadAssignment.objects.filter(assigned_to=user).values('lead_id')
+        unassigned = list(
+            Lead.objects
+            .filter(updated_at__gt=token.updated_at, id__in=handled)
+            .exclude(id__in=queryset.values('id'))
+            .values_list('id', flat=True)
+        )
+
+    return {
+        'changed':    changed,
+        'deleted':    sorted(set(deleted.values_list('lead_id', flat=True))),
+        'unassigned': unassigned,
+        'has_more':   has_more,
+        'token':      next_token.encode(),
+    }
+
+
+def prune_lead_tombstones(now=None):
+    """Delete tombstones older than TOMBSTONE_RETENTION. Returns the count."""
+    cutoff = (now or timezone.now()) - TOMBSTONE_RETENTION
+    deleted, _ = LeadTombstone.objects.filter(deleted_at__lt=cutoff).delete()
+    return deleted
@@ -1,3 +1,374 @@
+from datetime import date, datetime, time, timedelta
+from io import BytesIO, StringIO
+from unittest import mock
+
+from cloudinary import CloudinaryResource
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
 from django.test import TestCase
+from django.utils import timezone
+from openpyxl import Workbook, load_workbook
+from rest_framework.test import APIClient
+
+from accounts.models import ActivityLog, User
+
+from .assignments import bulk_assign_leads
+from .duplicates import MERGED_RELATIONS, merge_leads
+from .exports import EXPORT_COLUMNS, iter_export_rows
+from .importers import BulkLeadImporter
+from .models import FollowUp, Lead, LeadAssignment, ProcessingUpdate, RemarkHistory
+from .processing import CLAIM_TTL, claim_processing_leads, release_processing_leads
+from .stats import find_lead_stats_drift, get_lead_stats
+from .sync import TOMBSTONE_RETENTION, SyncToken
+
+
+class LeadListConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin', password='x', role='ADMIN')
+        Lead.objects.bulk_create([
+            Lead(name=f'Lead {i}', phone=f'98470{i:05d}', phone_normalized=f'9198470{i:05d}', source='OTHER')
+            for i in range(5)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_200_then_304_query_counts(self):
+        # Fingerprint, count, page (users joined), status counters
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/leads/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']['leads']), 5)
+
+        # Only the fingerprint query
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/leads/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_changes_when_a_lead_changes(self):
+        etag = self.client.get('/api/leads/')['ETag']
+        Lead.objects.filter(name='Lead 0').first().save()
+        response = self.client.get('/api/leads/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_etag_changes_the_next_day(self):
+        with mock.patch('utils.conditional.timezone.localdate', return_value=date(2026, 1, 1)):
+            etag = self.client.get('/api/leads/')['ETag']
+        with mock.patch('utils.conditional.timezone.localdate', return_value=date(2026, 1, 2)):
+            response = self.client.get('/api/leads/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class FollowUpListPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin', password='x', role='ADMIN')
+        day = date(2026, 1, 5)
+        FollowUp.objects.bulk_create([
+            FollowUp(name=f'F {i}', phone_number='9847000000', follow_up_date=day,
+                     follow_up_time=time(17 - i % 3), assigned_to=cls.admin)
+            for i in range(25)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_paginated_without_page_param(self):
+        response = self.client.get('/api/followups/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 25)
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_page_mode_orders_by_time_then_id(self):
+        rows = self.client.get('/api/followups/', {'page_size': 100}).data['results']
+        keys = [(row['follow_up_time'], row['id']) for row in rows]
+        self.assertEqual(keys, sorted(keys))
+
+
+class ProcessingClaimTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.executive = User.objects.create_user(username='proc', password='x', role='PROCESSING')
+        Lead.objects.bulk_create([
+            Lead(name=f'Lead {i}', phone=f'98470{i:05d}', phone_normalized=f'9198470{i:05d}',
+                 processing_status='FORWARDED')
+            for i in range(3)
+        ])
+        # Oldest first: Lead 0 waited longest
+        for i, lead in enumerate(Lead.objects.order_by('name')):
+            queued = timezone.make_aware(datetime(2026, 1, 1 + i, 9))
+            Lead.objects.filter(pk=lead.pk).update(processing_status_date=queued)
+
+    def _queue(self):
+        return list(
+            Lead.objects.filter(processing_status='FORWARDED')
+            .order_by('processing_status_date', 'id')
+            .values_list('name', 'processing_status_date')
+        )
+
+    def test_release_keeps_the_queue_time(self):
+        before  = self._queue()
+        claimed = claim_processing_leads(self.executive, 1)
+        self.assertEqual([lead.name for lead in claimed], ['Lead 0'])
+
+        released = release_processing_leads(self.executive, [claimed[0].id])
+        self.assertEqual(released[0].processing_status_date, before[0][1])
+        self.assertEqual(self._queue(), before)
+
+    def test_expired_claim_keeps_the_queue_time_on_the_next_claim(self):
+        before  = self._queue()
+        claimed = claim_processing_leads(self.executive, 1)
+        Lead.objects.filter(pk=claimed[0].pk).update(
+            processing_status_date=timezone.now() - CLAIM_TTL - timedelta(minutes=1),
+        )
+
+        # The stale claim goes back first, at its old place, and is claimed again
+        again = claim_processing_leads(self.executive, 1)
+        self.assertEqual([lead.name for lead in again], ['Lead 0'])
+        self.assertEqual(again[0].processing_queued_at, before[0][1])
+
+
+class LeadExportTests(TestCase):
+    def test_formula_cells_are_escaped(self):
+        Lead.objects.create(
+            name='=HYPERLINK("http://x","y")', phone='+919847000000', remarks='@SUM(1)', program='Nursing',
+        )
+        row = dict(zip((path for _, path in EXPORT_COLUMNS), next(iter_export_rows(Lead.objects.all()))))
+        self.assertEqual(row['name'], '\'=HYPERLINK("http://x","y")')
+        self.assertEqual(row['phone'], "'+919847000000")
+        self.assertEqual(row['remarks'], "'@SUM(1)")
+        self.assertEqual(row['program'], 'Nursing')
+
+
+class LeadStatsCounterTests(TestCase):
+    """Every write path keeps the counters equal to a fresh rebuild."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin   = User.objects.create_user(username='admin', password='x', role='ADMIN')
+        cls.manager = User.objects.create_user(username='manager', password='x', role='CM')
+        cls.other   = User.objects.create_user(username='other', password='x', role='BDM')
+        cls.exec    = User.objects.create_user(username='exec', password='x', role='ADM_EXEC')
+
+    def assertNoDrift(self):
+        self.assertEqual(find_lead_stats_drift(), {})
+        out = StringIO()
+        call_command('rebuild_lead_stats', '--check', stdout=out)
+        self.assertIn('in sync', out.getvalue())
+
+    def _lead(self, i, **fields):
+        return Lead.objects.create(name=f'Lead {i}', phone=f'98470{i:05d}', **fields)
+
+    def test_save_paths(self):
+        first  = self._lead(1, assigned_to=self.manager)
+        second = self._lead(2, assigned_to=self.manager, status='QUALIFIED')
+        self.assertNoDrift()
+
+        first.status = 'CONVERTED'
+        first.save()
+        second.assigned_to     = self.other
+        second.sub_assigned_to = self.exec
+        second.save()
+        self.assertNoDrift()
+
+        first.delete()
+        self.assertNoDrift()
+        self.assertEqual(get_lead_stats(self.exec)['qualified'], 1)
+
+    def test_bulk_assign(self):
+        leads = [self._lead(i) for i in range(3)]
+        count, failed = bulk_assign_leads(self.admin, [lead.id for lead in leads], self.manager.id)
+        self.assertEqual((count, failed), (3, []))
+        self.assertNoDrift()
+
+        count, failed = bulk_assign_leads(self.manager, [leads[0].id], self.exec.id)
+        self.assertEqual((count, failed), (1, []))
+        self.assertNoDrift()
+        self.assertEqual(get_lead_stats(self.manager)['new'], 3)
+
+    def test_import(self):
+        importer = BulkLeadImporter(self.admin).run([
+            (2, {'name': 'Imported A', 'phone': '9847011111', 'assigned_to': 'manager'}),
+            (3, {'name': 'Imported B', 'phone': '9847022222', 'assigned_to': 'exec', 'status': 'QUALIFIED'}),
+        ])
+        self.assertEqual((importer.success_count, importer.failed_rows), (2, []))
+        self.assertNoDrift()
+
+
+class MergeLeadsTests(TestCase):
+    def test_related_rows_move_to_the_primary(self):
+        admin     = User.objects.create_user(username='admin', password='x', role='ADMIN')
+        primary   = Lead.objects.create(name='Anjali Nair', phone='9847000001')
+        duplicate = Lead.objects.create(name='Anjali  Nair', phone='9847000002', email='anjali@example.com')
+
+        LeadAssignment.objects.create(lead=duplicate, assigned_to=admin, assigned_by=admin, assignment_type='PRIMARY')
+        ProcessingUpdate.objects.create(lead=duplicate, status='FORWARDED', changed_by=admin)
+        RemarkHistory.objects.create(lead=duplicate, new_remarks='Called', changed_by=admin)
+        FollowUp.objects.create(lead=duplicate, phone_number=duplicate.phone, follow_up_date=date(2026, 1, 5), assigned_to=admin)
+
+        moved = {model: model.objects.filter(lead=duplicate).count() for model in MERGED_RELATIONS}
+        self.assertTrue(all(moved.values()), moved)
+        logged = ActivityLog.objects.filter(entity_type='Lead', entity_id=duplicate.pk).count()
+        kept   = ActivityLog.objects.filter(entity_type='Lead', entity_id=primary.pk).count()
+
+        self.assertEqual(merge_leads(primary, [duplicate.pk], user=admin), 1)
+
+        self.assertFalse(Lead.objects.filter(pk=duplicate.pk).exists())
+        for model, count in moved.items():
+            self.assertEqual(model.objects.filter(lead_id=duplicate.pk).count(), 0, model.__name__)
+            self.assertGreaterEqual(model.objects.filter(lead=primary).count(), count, model.__name__)
+        # Only the deletion entry leads.signals writes for the removed duplicate
+        self.assertEqual(
+            list(ActivityLog.objects.filter(entity_type='Lead', entity_id=duplicate.pk).values_list('action', flat=True)),
+            ['LEAD_DELETED'],
+        )
+        # Moved entries plus the merge entry itself
+        self.assertEqual(
+            ActivityLog.objects.filter(entity_type='Lead', entity_id=primary.pk).count(), kept + logged + 1,
+        )
+        primary.refresh_from_db()
+        self.assertEqual(primary.email, 'anjali@example.com')
+
+
+class LeadChangesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin  = User.objects.create_user(username='admin', password='x', role='ADMIN')
+        cls.mine   = User.objects.create_user(username='mine', password='x', role='CM')
+        cls.theirs = User.objects.create_user(username='theirs', password='x', role='BDM')
+        for i in range(5):
+            Lead.objects.create(name=f'Lead {i}', phone=f'98470{i:05d}', assigned_to=cls.mine)
+        Lead.objects.create(name='Their lead', phone='9847099999', assigned_to=cls.theirs)
+
+    def sync(self, user, **params):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.get('/api/leads/changes/', params)
+
+    def test_token_round_trip(self):
+        token   = SyncToken(timezone.now(), 42, timezone.now() - timedelta(minutes=5))
+        decoded = SyncToken.decode(token.encode())
+        self.assertEqual(
+            (decoded.updated_at, decoded.lead_id, decoded.deleted_at),
+            (token.updated_at, token.lead_id, token.deleted_at),
+        )
+        self.assertIsNone(SyncToken.decode('').updated_at)
+
+    def test_malformed_token_is_400(self):
+        for since in ['not a token', 'e30', 'eyJ1IjoxfQ']:   # junk, {}, {"u":1}
+            response = self.sync(self.admin, since=since)
+            self.assertEqual(response.status_code, 400, since)
+            self.assertIn('since', response.data)
+
+    def test_expired_token_is_410(self):
+        old = timezone.now() - TOMBSTONE_RETENTION - timedelta(days=1)
+        response = self.sync(self.admin, since=SyncToken(old, 1, old).encode())
+        self.assertEqual(response.status_code, 410)
+
+    def test_pages_until_has_more_is_false(self):
+        seen, since, pages = [], '', []
+        while True:
+            data = self.sync(self.mine, since=since, limit=2).data
+            seen += [lead['id'] for lead in data['leads']]
+            pages.append(data['has_more'])
+            since = data['token']
+            if not data['has_more']:
+                break
+        self.assertEqual(pages, [True, True, False])
+        self.assertCountEqual(seen, Lead.objects.filter(assigned_to=self.mine).values_list('id', flat=True))
+
+    def test_tombstones_are_scoped_by_role(self):
+        tokens = {user: self.sync(user).data['token'] for user in (self.admin, self.mine, self.theirs)}
+        lead_id = Lead.objects.get(name='Their lead').pk
+        Lead.objects.filter(pk=lead_id).delete()
+
+        deleted = {user: self.sync(user, since=token).data['deleted'] for user, token in tokens.items()}
+        self.assertEqual(deleted, {self.admin: [lead_id], self.mine: [], self.theirs: [lead_id]})
+
+
+class DayRangeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin', password='x', role='ADMIN')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_reports_share_the_range_checks(self):
+        for url in ('/api/leads/intake/', '/api/leads/funnel/', '/api/followups/calendar/'):
+            for params in ({'start': '2026-02-30', 'end': '2026-03-01'}, {'start': '2026-03-02', 'end': '2026-03-01'}):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, 400, (url, params))
+                self.assertIn('error', response.data)
+
+        self.assertEqual(self.client.get('/api/followups/calendar/').status_code, 400)
+        self.assertEqual(self.client.get('/api/leads/intake/').status_code, 200)
+        self.assertEqual(
+            self.client.get('/api/leads/funnel/', {'start': '2024-01-01', 'end': '2026-01-01'}).status_code, 400,
+        )
+
+
+class LeadCursorParamsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin', password='x', role='ADMIN')
+        Lead.objects.create(name='Ramesh', phone='9847000001')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_cursor_rejects_orders_it_cannot_follow(self):
+        for params in ({'ordering': 'priority'}, {'search': 'ramesh'}):
+            response = self.client.get('/api/leads/', {'cursor': '', **params})
+            self.assertEqual(response.status_code, 400, params)
+
+    def test_cursor_accepts_its_own_order(self):
+        for params in ({}, {'ordering': 'created_at'}, {'ordering': '-created_at', 'search': 'ramesh'}):
+            response = self.client.get('/api/leads/', {'cursor': '', **params})
+            self.assertEqual(response.status_code, 200, params)
+
+
+class BulkLeadUploadTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin', password='x', role='ADMIN')
+
+    def upload(self, header):
+        workbook = Workbook()
+        workbook.active.append(header)
+        workbook.active.append(['Lead', '9847000001'])
+        content = BytesIO()
+        workbook.save(content)
+
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        opened = []
+
+        def spy(*args, **kwargs):
+            workbook       = load_workbook(*args, **kwargs)
+            workbook.close = mock.Mock(wraps=workbook.close)
+            opened.append(workbook)
+            return workbook
+
+        # Never upload to Cloudinary
+        stored = CloudinaryResource('leads/imports/leads.xlsx', resource_type='raw', type='upload')
+        with mock.patch('leads.importers.load_workbook', side_effect=spy), \
+             mock.patch('cloudinary.uploader.upload_resource', return_value=stored):
+            response = client.post('/api/leads/bulk-upload/', {
+                'file': SimpleUploadedFile('leads.xlsx', content.getvalue()),
+            }, format='multipart')
+        self.assertEqual(len(opened), 1)
+        self.assertEqual(opened[0].close.call_count, 1)
+        return response
+
+    def test_workbook_closed_when_queued(self):
+        self.assertEqual(self.upload(['name', 'phone']).status_code, 202)
 
-# Create your tests here.
+    def test_workbook_closed_on_missing_columns(self):
+        self.assertEqual(self.upload(['name', 'mobile']).status_code, 400)
@@ -0,0 +1,182 @@
+import base64
+import binascii
+import heapq
+import json
+from collections import namedtuple
+from itertools import islice
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework import serializers
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import replace_query_param
+
+from accounts.models import CombinedActivityLog
+from accounts.serializers import CombinedActivityLogSerializer
+from telephony.models import VoxbayCallLog
+from telephony.serializers import VoxbayCallLogSerializer
+from utils.pagination import KeysetPagination
+
+from .models import FollowUpHistory, LeadAssignment, ProcessingUpdate, RemarkHistory
+from .serializers import (
+    FollowUpHistorySerializer,
+    LeadAssignmentSerializer,
+    ProcessingUpdateSerializer,
+    RemarkHistorySerializer,
+)
+
+
+# One event stream merged into the timeline. Each queryset is read with a
+# keyset filter on (time_field, id), served by a (<owner>, time_field, id)
+# index, so a page costs one LIMIT query per source however long the
+# history is.
+TimelineSource = namedtuple('TimelineSource', ['name', 'time_field', 'queryset', 'serializer_class'])
+
+
+def lead_timeline_sources(lead):
+    """Every event stream for `lead`; list order breaks ties between equal timestamps."""
+    calls = VoxbayCallLog.objects.none()
+    if lead.phone_normalized:
+        calls = VoxbayCallLog.objects.filter(phone_normalized=lead.phone_normalized)
+
+    return [
+        TimelineSource(
+            'processing', 'timestamp',
+            ProcessingUpdate.objects.filter(lead=lead).select_related('changed_by'),
+            ProcessingUpdateSerializer,
+        ),
+        TimelineSource(
+            'assignment', 'timestamp',
+            LeadAssignment.objects.filter(lead=lead).select_related('assigned_to', 'assigned_by'),
+            LeadAssignmentSerializer,
+        ),
+        TimelineSource(
+            'remark', 'changed_at',
+            RemarkHistory.objects.filter(lead=lead).select_related('changed_by'),
+            RemarkHistorySerializer,
+        ),
+        TimelineSource(
+            'followup', 'changed_at',
+            FollowUpHistory.objects.filter(followup__lead=lead),
+            FollowUpHistorySerializer,
+        ),
+        TimelineSource('call', 'created_at', calls, VoxbayCallLogSerializer),
+        TimelineSource(
+            'activity', 'created_at',
+            CombinedActivityLog.objects.filter(entity_type='Lead', entity_id=lead.pk).select_related('user'),
+            CombinedActivityLogSerializer,
+        ),
+    ]
+
+
+def _after(source_rank, time_field, position, reverse):
+    """
+    WHERE clause for rows of one source strictly after `position` in the
+    merged order (time, source rank, id) — descending, or ascending when
+    walking backwards.
+    """
+    time, rank, pk = position
+    after   = 'gt' if reverse else 'lt'
+    earlier = Q(**{f'{time_field}__{after}': time})
+    if source_rank == rank:
+        return earlier | Q(**{time_field: time, f'id__{after}': pk})
+    if (source_rank < rank) != reverse:
+        return earlier | Q(**{time_field: time})
+    return earlier
+
+
+def merge_timeline(sources, position=None, reverse=False, limit=50):
+    """
+    Up to `limit` (time, rank, id, source, obj) events after `position`,
+    newest first (oldest first when `reverse`). Runs one query per source.
+    """
+    streams = []
+    for rank, source in enumerate(sources):
+        direction = '' if reverse else '-'
+        queryset  = source.queryset.order_by(f'{direction}{source.time_field}', f'{direction}id')
+        if position is not None:
+            queryset = queryset.filter(_after(rank, source.time_field, position, reverse))
+        streams.append([
+            (getattr(row, source.time_field), rank, row.pk, source, row)
+            for row in queryset[:limit]
+        ])
+
+    merged = heapq.merge(*streams, key=lambda event: event[:3], reverse=not reverse)
+    return list(islice(merged, limit))
+
+
+class LeadTimelinePagination(KeysetPagination):
+    """
+    Cursor pages over the merged lead timeline. The cursor is the
+    (time, source, id) of the last event shown; `count` is always null.
+    """
+    page_size             = 50
+    page_size_query_param = 'page_size'
+    max_page_size         = 200
+
+    def paginate_timeline(self, sources, request):
+        self.request = request
+        page_size    = self.get_page_size(request)
+        names        = [source.name for source in sources]
+        position, reverse = self._decode_timeline_cursor(
+            request.query_params.get(self.cursor_query_param), names,
+        )
+
+        events   = merge_timeline(sources, position, reverse, limit=page_size + 1)
+        has_more = len(events) > page_size
+        events   = events[:page_size]
+        if reverse:
+            events.reverse()
+
+        has_next     = has_more if not reverse else position is not None
+        has_previous = has_more if reverse else position is not None
+
+        url = request.build_absolute_uri()
+        self.count = None
+        self.next_url = self.previous_url = None
+        if events and has_next:
+            self.next_url = replace_query_param(
+                url, self.cursor_query_param, self._encode_event(events[-1], reverse=False),
+            )
+        if events and has_previous:
+            self.previous_url = replace_query_param(
+                url, self.cursor_query_param, self._encode_event(events[0], reverse=True),
+            )
+        self.cursor_mode = True
+        return events
+
+    @staticmethod
+    def _encode_event(event, reverse):
+        time, _, pk, source, _ = event
+        payload = {'v': [time.isoformat(), source.name, pk]}
+        if reverse:
+            payload['r'] = 1
+        raw = json.dumps(payload, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def _decode_timeline_cursor(self, token, names):
+        if not token:
+            return None, False
+        try:
+            raw     = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+            payload = json.loads(raw)
+            time, name, pk = payload['v']
+            time = parse_datetime(time)
+            if time is None or name not in names:
+                raise ValueError
+            position = (time, names.index(name), int(pk))
+        except (binascii.Error, ValueError, TypeError, KeyError) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+        return position, bool(payload.get('r'))
+
+
+class TimelineEventSerializer(serializers.Serializer):
+    """`{type, timestamp, data}` where `data` is the source's own serializer output."""
+
+    def to_representation(self, event):
+        time, _, _, source, obj = event
+        return {
+            'type':      source.name,
+            'timestamp': serializers.DateTimeField().to_representation(time),
+            'data':      source.serializer_class(obj, context=self.context).data,
+        }
@@ -2,41 +2,75 @@ from django.urls import path
 from .views import (
     LeadListView,
     LeadCreateView,
+    LeadExportView,
+    LeadChangesView,
     LeadDetailView,
     LeadProcessingTimelineView,
+    ProcessingQueueView,
+    ProcessingClaimView,
+    ProcessingReleaseView,
+    LeadTimelineView,
     LeadAssignView,
     BulkLeadAssignView,
+    LeadRouteBacklogView,
     LeadAssignmentHistoryView,
     MyTeamLeadsView,
+    DuplicateLeadCandidateListView,
+    DuplicateLeadDismissView,
+    LeadMergeView,
     AvailableUsersForAssignmentView,
     UnassignLeadView,
     UpdateLeadView,
     BulkLeadUploadView,
+    ImportJobStatusView,
+    ImportJobErrorReportView,
     TodayLeadsAPI,
+    LeadIntakeView,
+    LeadFunnelView,
     FollowUpListCreateAPIView,
     FollowUpDetailAPIView,
     TodayFollowUpsAPIView,
-    OverdueFollowUpsAPIView
+    OverdueFollowUpsAPIView,
+    FollowUpCalendarAPIView,
+    FollowUpBulkRescheduleAPIView,
+    FollowUpBulkStatusAPIView,
 )
 
 urlpatterns = [
     path('leads/', LeadListView.as_view(), name='lead-list'),
+    path('leads/changes/', LeadChangesView.as_view(), name='lead-changes'),
+    path('leads/export/', LeadExportView.as_view(), name='lead-export'),
     path('leads/create/', LeadCreateView.as_view(), name='lead-create'),
     path('leads/assign/', LeadAssignView.as_view(), name='lead-assign'),
     path('leads/bulk-upload/', BulkLeadUploadView.as_view()),
+    path('leads/bulk-upload/<int:job_id>/', ImportJobStatusView.as_view(), name='lead-import-status'),
+    path('leads/bulk-upload/<int:job_id>/errors/', ImportJobErrorReportView.as_view(), name='lead-import-errors'),
     path('leads/bulk-assign/', BulkLeadAssignView.as_view(), name='bulk-lead-assign'),
+    path('leads/route/', LeadRouteBacklogView.as_view(), name='lead-route'),
     path('leads/unassign/', UnassignLeadView.as_view(), name='lead-unassign'),
     path('leads/my-team/', MyTeamLeadsView.as_view(), name='my-team-leads'),
+    path('leads/duplicates/', DuplicateLeadCandidateListView.as_view(), name='lead-duplicates'),
+    path('leads/duplicates/<int:pk>/dismiss/', DuplicateLeadDismissView.as_view(), name='lead-duplicate-dismiss'),
+    path('leads/merge/', LeadMergeView.as_view(), name='lead-merge'),
     path('leads/available-users/', AvailableUsersForAssignmentView.as_view(), name='available-users'),
     path('leads/<int:pk>/', LeadDetailView.as_view(), name='lead-detail'),
     path('leads/<int:pk>/update/', UpdateLeadView.as_view(), name='lead-update'),
     path('leads/<int:lead_id>/timeline/', LeadProcessingTimelineView.as_view(), name='lead-timeline'),
+    path('leads/<int:lead_id>/activity-timeline/', LeadTimelineView.as_view(), name='lead-activity-timeline'),
+    path('processing/queue/', ProcessingQueueView.as_view(), name='processing-queue'),
+    path('processing/queue/claim/', ProcessingClaimView.as_view(), name='processing-queue-claim'),
+    path('processing/queue/release/', ProcessingReleaseView.as_view(), name='processing-queue-release'),
     path('leads/<int:lead_id>/assignment-history/', LeadAssignmentHistoryView.as_view(), name='lead-assignment-history'),
     path('today-leads/', TodayLeadsAPI.as_view()),
+    path('leads/intake/', LeadIntakeView.as_view(), name='lead-intake'),
+    path('leads/funnel/', LeadFunnelView.as_view(), name='lead-funnel'),
     path('followups/', FollowUpListCreateAPIView.as_view()),
     path('followups/<int:pk>/', FollowUpDetailAPIView.as_view()),
     path('followups/today/', TodayFollowUpsAPIView.as_view()),
     path('followups/overdue/', OverdueFollowUpsAPIView.as_view()),
+    path('followups/calendar/', FollowUpCalendarAPIView.as_view(), name='followup-calendar'),
+    path('followups/bulk-reschedule/', FollowUpBulkRescheduleAPIView.as_view(), name='followup-bulk-reschedule'),
+    path('followups/bulk-status/', FollowUpBulkStatusAPIView.as_view(), name='followup-bulk-status'),
 
 ]
 
@@ -1,18 +1,18 @@
-import pandas as pd
-import math
-from datetime import date
-from .models import Lead, ProcessingUpdate, RemarkHistory, LeadAssignment,FollowUp
-from .email_utils import send_conversion_email
-from rest_framework import generics, filters, status
-from rest_framework.pagination import PageNumberPagination
+import csv
+from datetime import timedelta
+from .models import Lead, ProcessingUpdate, RemarkHistory, LeadAssignment,FollowUp, ImportJob, DuplicateLeadCandidate
+from .email_utils import queue_conversion_email
+from rest_framework import generics, status
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from accounts.models import User
 from django.shortcuts import get_object_or_404
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
 from django.db import models, transaction
 from django.db.models import Count, Q as DQ
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.permissions import IsAuthenticated
 
@@ -21,6 +21,7 @@ from leads.permissions import (
     CanAssignLeads,
     CanViewAllLeads,
     CanModifyAllLeads,
+    CanProcessLeads,
     FULL_ACCESS_ROLES,
     MANAGER_ROLES,
     EXECUTIVE_ROLES,
@@ -28,16 +29,44 @@ from leads.permissions import (
 
 from .serializers import (
     LeadListSerializer,
+    LeadCompactSerializer,
     LeadDetailSerializer,
     LeadCreateSerializer,
     ProcessingUpdateSerializer,
+    ProcessingQueueLeadSerializer,
+    ProcessingClaimSerializer,
+    ProcessingReleaseSerializer,
     LeadAssignSerializer,
     LeadAssignmentSerializer,
     LeadUpdateSerializer,
-    BulkLeadCreateSerializer,
-    FollowUpSerializer
+    FollowUpSerializer,
+    FollowUpBulkRescheduleSerializer,
+    FollowUpBulkStatusSerializer,
+    ImportJobSerializer,
+    DuplicateLeadCandidateSerializer,
+    LeadMergeSerializer,
+)
+from .assignments import bulk_assign_leads
+from .duplicates import merge_leads
+from .exports import build_xlsx, stream_csv
+from .funnel import DIMENSIONS as FUNNEL_DIMENSIONS, funnel_report
+from .intake import day_bounds, intake_report
+from .processing import CLAIM_TTL, claim_processing_leads, release_processing_leads
+from .followups import KEEP_TIME, bulk_reschedule_followups, bulk_update_followup_status
+from .routing import notify_routed_leads, route_backlog, route_leads
+from .search import LeadOrderingFilter, LeadSearchFilter
+from .stats import get_lead_stats
+from .sync import SyncToken, lead_changes
+from .timeline import LeadTimelinePagination, TimelineEventSerializer, lead_timeline_sources
+from .importers import (
+    ImportFileError,
+    MAX_UPLOAD_SIZE,
+    REQUIRED_COLUMNS,
+    read_lead_rows,
 )
 
+from utils.conditional import ConditionalGetMixin
+from utils.pagination import KeysetPagination
 from utils.pusher import pusher_client, trigger_pusher
 from utils import notify_lead_assigned
 from rest_framework import status
@@ -45,31 +74,110 @@ from django.shortcuts import get_object_or_404
 
 
 # ── Helpers
-def clean_value(val):
-    if val is None:
-        return None
-    if isinstance(val, float) and math.isnan(val):
-        return None
-    return val
+def _followup_response(request, queryset, view=None):
+    # Always paginated: ?page= (the first page by default) or ?cursor=
+    paginator  = FollowUpPagination()
+    page       = paginator.paginate_queryset(queryset, request, view=view)
+    serializer = FollowUpSerializer(page, many=True)
+    return paginator.get_paginated_response(serializer.data)
+
+
+def _parse_day_range(request, max_days, default_days=None):
+    """
+    `?start=&end=` (YYYY-MM-DD, inclusive) as (start, end, None), or
+    (None, None, error_response). With `default_days`, `end` defaults to
+    today and `start` to that many days before it (inclusive); without it
+    both are required. The range is at most `max_days` days.
+    """
+    params = request.query_params
+    try:
+        if default_days is None:
+            start = parse_date(params.get('start') or '')
+            end   = parse_date(params.get('end') or '')
+        else:
+            end   = parse_date(params['end']) if params.get('end') else timezone.localdate()
+            start = parse_date(params['start']) if params.get('start') else end - timedelta(days=default_days - 1)
+    except ValueError:  # well formed but not a real date, e.g. 2025-02-30
+        start = end = None
+    if not start or not end:
+        message = 'start and end must be dates' if default_days else 'start and end are required'
+        return None, None, Response(
+            {'error': f'{message} (YYYY-MM-DD)'},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if end < start or (end - start).days >= max_days:
+        return None, None, Response(
+            {'error': f'end must be on or after start and at most {max_days} days later'},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    return start, end, None
+
+
+def _import_jobs_for(user):
+    if user.role in FULL_ACCESS_ROLES:
+        return ImportJob.objects.all()
+    return ImportJob.objects.filter(uploaded_by=user)
 
 
 # ── Pagination
-class LeadPagination(PageNumberPagination):
+class LeadPagination(KeysetPagination):
     page_size = 20
     page_size_query_param = 'page_size'
     max_page_size = 100
+    # Without ?ordering=, ?search= ranks matches (leads.search); a cursor can't follow that
+    reordering_params = ('search',)
+
+
+class FollowUpPagination(KeysetPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    # ?page= lists by date, then time. follow_up_time is nullable, so it can't
+    # key a cursor: in ?cursor= mode same-day follow-ups come in id order
+    cursor_ordering = ('follow_up_date', 'id')
+
+
+# Longest range /followups/calendar/ answers (a month view with padding fits easily)
+MAX_CALENDAR_DAYS = 92
+# Longest range the lead reports (/leads/intake/, /leads/funnel/) answer
+MAX_REPORT_DAYS = 731
+
+
+# Query params that don't narrow the list, so counter-backed stats still apply
+UNFILTERED_LIST_PARAMS = {'page', 'page_size', 'ordering', 'cursor', 'count', 'compact'}
+
+
+class CompactLeadListMixin:
+    """
+    `?compact=true` on a lead list: rows reference users by id and the page
+    carries one `users` map (LeadCompactSerializer) instead of nested user
+    objects, so the user joins are skipped too.
+    """
+    user_relations = ('assigned_to', 'assigned_by', 'sub_assigned_to', 'sub_assigned_by')
+
+    def wants_compact(self):
+        return self.request.query_params.get('compact', '').lower() in ('true', '1', 'yes')
+
+    def get_lead_queryset(self):
+        if self.wants_compact():
+            return Lead.objects.all()
+        return Lead.objects.select_related(*self.user_relations)
+
+    def get_compact_data(self, queryset):
+        page = self.paginate_queryset(queryset)
+        return LeadCompactSerializer.page_data(page if page is not None else queryset)
 
 
 # ── Lead List View
-class LeadListView(generics.ListAPIView):
+class LeadListView(ConditionalGetMixin, CompactLeadListMixin, generics.ListAPIView):
     serializer_class = LeadListSerializer
     permission_classes = [CanAccessLeads]
     pagination_class = LeadPagination
 
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
-        filters.OrderingFilter,
+        LeadSearchFilter,
+        LeadOrderingFilter,
     ]
     filterset_fields = {
         'priority':          ['exact'],
@@ -85,37 +193,116 @@ class LeadListView(generics.ListAPIView):
 
     def get_queryset(self):
         user = self.request.user
-        base_qs = Lead.objects.select_related(
-            'assigned_to', 'assigned_by',
-            'sub_assigned_to', 'sub_assigned_by',
-        )
+        base_qs = self.get_lead_queryset()
+        # No DISTINCT: every join and filter is to-one, so rows can't repeat,
+        # and DISTINCT over all columns defeats the search indexes
         if user.role in FULL_ACCESS_ROLES:
-            return base_qs.all().distinct()
+            return base_qs.all()
         return base_qs.filter(
             models.Q(assigned_to=user) |
             models.Q(sub_assigned_to=user)
-        ).distinct()
+        )
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
+        if self.wants_compact():
+            data = self.get_compact_data(queryset)
         else:
-            serializer = self.get_serializer(queryset, many=True)
-
-        stats = queryset.aggregate(
-            new=Count('id', filter=DQ(status__iexact='ENQUIRY')),
-            qualified=Count('id', filter=DQ(status__iexact='QUALIFIED')),
-            converted=Count('id', filter=DQ(status__iexact='CONVERTED')),
-            total_assigned=Count('id', filter=DQ(assigned_to=request.user)),
-            total_sub_assigned=Count('id', filter=DQ(sub_assigned_to=request.user)),
-        )
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+            else:
+                serializer = self.get_serializer(queryset, many=True)
+            data = {'leads': serializer.data}
+
+        # Unfiltered lists read the maintained counters; filtered ones aggregate live
+        if set(request.query_params) <= UNFILTERED_LIST_PARAMS:
+            stats = get_lead_stats(request.user)
+        else:
+            stats = queryset.aggregate(
+                new=Count('id', filter=DQ(status__iexact='ENQUIRY')),
+                qualified=Count('id', filter=DQ(status__iexact='QUALIFIED')),
+                converted=Count('id', filter=DQ(status__iexact='CONVERTED')),
+                total_assigned=Count('id', filter=DQ(assigned_to=request.user)),
+                total_sub_assigned=Count('id', filter=DQ(sub_assigned_to=request.user)),
+            )
 
-        return self.get_paginated_response({
-            'leads': serializer.data,
-            'stats': stats,
-        })
+        data['stats'] = stats
+        return self.get_paginated_response(data)
+
+
+# ── Lead Export
+class LeadExportView(LeadListView):
+    """
+    The LeadListView result set (same filters, search, ordering and role
+    scoping) as a download: `?type=csv` (default, streamed) or `?type=xlsx`.
+    """
+    EXPORT_TYPES = ('csv', 'xlsx')
+
+    def get(self, request, *args, **kwargs):
+        export_type = request.query_params.get('type', 'csv').lower()
+        if export_type not in self.EXPORT_TYPES:
+            return Response(
+                {'type': f"Must be one of: {', '.join(self.EXPORT_TYPES)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        queryset = self.filter_queryset(self.get_queryset())
+        filename = f"leads-{timezone.localtime():%Y%m%d-%H%M}.{export_type}"
+
+        if export_type == 'xlsx':
+            response = FileResponse(
+                build_xlsx(queryset),
+                as_attachment=True,
+                filename=filename,
+                content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            )
+        else:
+            response = StreamingHttpResponse(stream_csv(queryset), content_type='text/csv; charset=utf-8')
+            response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        response['Cache-Control'] = 'no-store'
+        return response
+
+
+# ── Lead Delta Sync
+class LeadChangesView(LeadListView):
+    """
+    Leads created or updated since `?since=<token>`, plus ids of leads
+    deleted or moved out of the user's scope, with the token to send next
+    time (see leads.sync). Omit `since` for a first full sync; keep calling
+    while `has_more` is true. Same role scoping as LeadListView; list
+    filters are not applied. `?compact=true` works as on the list.
+    """
+    sync_limit     = 500
+    max_sync_limit = 2000
+
+    def get(self, request, *args, **kwargs):
+        token = SyncToken.decode(request.query_params.get('since'))
+        if token.is_expired(timezone.now()):
+            return Response(
+                {'error': 'Sync token expired; start again without `since`.'},
+                status=status.HTTP_410_GONE,
+            )
+
+        try:
+            limit = int(request.query_params.get('limit', self.sync_limit))
+        except ValueError:
+            limit = self.sync_limit
+        limit = max(1, min(limit, self.max_sync_limit))
+
+        changes = lead_changes(request.user, self.get_queryset(), token, limit)
+        if self.wants_compact():
+            data = LeadCompactSerializer.page_data(changes['changed'])
+        else:
+            data = {'leads': self.get_serializer(changes['changed'], many=True).data}
+
+        data.update(
+            deleted=changes['deleted'],
+            unassigned=changes['unassigned'],
+            has_more=changes['has_more'],
+            token=changes['token'],
+        )
+        return Response(data)
 
 
 # ── Lead Create View
@@ -127,7 +314,11 @@ class LeadCreateView(generics.CreateAPIView):
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        lead = serializer.save()
+        with transaction.atomic():
+            lead = serializer.save()
+            # No assignee given: let the routing rules pick one
+            if lead.assigned_to_id is None:
+                route_leads([lead], assigned_by=request.user)
 
         if getattr(lead, 'processing_status', None) and lead.processing_status != 'PENDING':
             ProcessingUpdate.objects.create(
@@ -147,8 +338,9 @@ class LeadCreateView(generics.CreateAPIView):
 
 
         return Response({
-            'message': 'Lead created successfully',
-            'lead_id': lead.id
+            'message':     'Lead created successfully',
+            'lead_id':     lead.id,
+            'assigned_to': lead.assigned_to_id,
         }, status=status.HTTP_201_CREATED)
 
 
@@ -178,18 +370,21 @@ class LeadDetailView(generics.RetrieveUpdateDestroyAPIView):
 
         serializer = self.get_serializer(lead, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
-        updated_lead = serializer.save()
 
-        if old_processing_status != updated_lead.processing_status:
-            ProcessingUpdate.objects.create(
-                lead=updated_lead,
-                status=updated_lead.processing_status,
-                changed_by=request.user,
-                notes='Status updated via API'
-            )
+        # The conversion email is queued with the change and sent by the outbox worker
+        with transaction.atomic():
+            updated_lead = serializer.save()
 
-        if old_status != 'CONVERTED' and updated_lead.status == 'CONVERTED':
-            send_conversion_email(updated_lead)
+            if old_processing_status != updated_lead.processing_status:
+                ProcessingUpdate.objects.create(
+                    lead=updated_lead,
+                    status=updated_lead.processing_status,
+                    changed_by=request.user,
+                    notes='Status updated via API'
+                )
+
+            if old_status != 'CONVERTED' and updated_lead.status == 'CONVERTED':
+                queue_conversion_email(updated_lead)
 
         return Response({
             'message': 'Lead updated successfully',
@@ -236,6 +431,104 @@ class LeadProcessingTimelineView(generics.ListAPIView):
         return ProcessingUpdate.objects.filter(lead=lead).order_by('-timestamp')
 
 
+# ── Processing Work Queue
+class ProcessingQueueView(APIView):
+    """
+    The executive's claimed leads (ACCEPTED/PROCESSING) and how many
+    FORWARDED leads are waiting to be claimed.
+    """
+    permission_classes = [CanProcessLeads]
+
+    def get(self, request):
+        mine = (
+            Lead.objects
+            .filter(processing_executive=request.user, processing_status__in=['ACCEPTED', 'PROCESSING'])
+            .select_related('assigned_to')
+            .order_by('processing_status_date', 'id')
+        )
+        return Response({
+            'waiting':           Lead.objects.filter(processing_status='FORWARDED').count(),
+            'claim_ttl_minutes': int(CLAIM_TTL.total_seconds() // 60),
+            'leads':             ProcessingQueueLeadSerializer(mine, many=True).data,
+        })
+
+
+class ProcessingClaimView(APIView):
+    """Claim the next `count` FORWARDED leads, oldest first (see leads.processing)."""
+    permission_classes = [CanProcessLeads]
+
+    def post(self, request):
+        serializer = ProcessingClaimSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        claimed = claim_processing_leads(request.user, serializer.validated_data['count'])
+        leads   = (
+            Lead.objects
+            .filter(id__in=[lead.id for lead in claimed])
+            .select_related('assigned_to')
+            .order_by('processing_status_date', 'id')
+        )
+        return Response({
+            'message':       f'Claimed {len(claimed)} leads',
+            'claimed_count': len(claimed),
+            'leads':         ProcessingQueueLeadSerializer(leads, many=True).data,
+        }, status=status.HTTP_200_OK)
+
+
+class ProcessingReleaseView(APIView):
+    """Hand the executive's own ACCEPTED claims back to the queue."""
+    permission_classes = [CanProcessLeads]
+
+    def post(self, request):
+        serializer = ProcessingReleaseSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        lead_ids = serializer.validated_data['lead_ids']
+
+        released     = release_processing_leads(request.user, lead_ids)
+        released_ids = [lead.id for lead in released]
+        return Response({
+            'message':        f'Released {len(released)} leads',
+            'released_count': len(released),
+            'released_ids':   released_ids,
+            'not_released':   sorted(set(lead_ids) - set(released_ids)),
+        }, status=status.HTTP_200_OK)
+
+
+# ── Unified Lead Timeline
+class LeadTimelineView(APIView):
+    """
+    Processing updates, assignments, remark edits, follow-up status changes,
+    calls and activity log entries for one lead, newest first, in a single
+    cursor-paginated stream. `?types=processing,call` limits the sources.
+    """
+    permission_classes = [CanAccessLeads]
+    pagination_class   = LeadTimelinePagination
+
+    def get(self, request, lead_id):
+        user  = request.user
+        leads = Lead.objects.all()
+        if user.role not in FULL_ACCESS_ROLES:
+            leads = leads.filter(models.Q(assigned_to=user) | models.Q(sub_assigned_to=user))
+        lead = get_object_or_404(leads, id=lead_id)
+
+        sources = lead_timeline_sources(lead)
+        types   = request.query_params.get('types')
+        if types:
+            wanted  = {name.strip() for name in types.split(',') if name.strip()}
+            unknown = wanted - {source.name for source in sources}
+            if unknown:
+                return Response(
+                    {'types': f"Unknown timeline types: {', '.join(sorted(unknown))}"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            sources = [source for source in sources if source.name in wanted]
+
+        paginator = self.pagination_class()
+        events    = paginator.paginate_timeline(sources, request)
+        data      = TimelineEventSerializer(events, many=True, context={'request': request}).data
+        return paginator.get_paginated_response(data)
+
+
 # ── Lead Assignment View
 class LeadAssignView(APIView):
     permission_classes = [CanAssignLeads]
@@ -309,91 +602,12 @@ class BulkLeadAssignView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        user          = request.user
-        success_count = 0
-        failed_leads  = []
-        assigned_summary = {}
-
-        for lead_id in lead_ids:
-            try:
-                serializer = LeadAssignSerializer(
-                    data={
-                        'lead_id':        lead_id,
-                        'assigned_to_id': assigned_to_id,
-                        'notes':          notes,
-                    },
-                    context={'request': request},
-                )
-
-                if serializer.is_valid():
-                    lead            = serializer.validated_data['lead']
-                    assignee        = serializer.validated_data['assignee']
-                    assignment_type = serializer.validated_data['assignment_type']
-
-                    if assignment_type == 'PRIMARY':
-                        lead.assigned_to       = assignee
-                        lead.assigned_by       = user
-                        lead.assigned_date     = timezone.now()
-                        lead.sub_assigned_to   = None
-                        lead.sub_assigned_by   = None
-                        lead.sub_assigned_date = None
-                    elif assignment_type == 'SUB':
-                        lead.sub_assigned_to   = assignee
-                        lead.sub_assigned_by   = user
-                        lead.sub_assigned_date = timezone.now()
-
-                    lead.save()
-
-                    LeadAssignment.objects.create(
-                        lead=lead,
-                        assigned_to=assignee,
-                        assigned_by=user,
-                        assignment_type=assignment_type,
-                        notes=notes,
-                    )
-                    success_count += 1
-
-                    if assignee == user:
-                        continue
-
-                    uid = assignee.id
-                    if uid not in assigned_summary:
-                        assigned_summary[uid] = {
-                            'user':  assignee,
-                            'leads': [],
-                            'type':  assignment_type,
-                        }
-                    assigned_summary[uid]['leads'].append({
-                        'lead_id':   lead.id,
-                        'lead_name': lead.name,
-                        'priority':  lead.priority,
-                    })
-
-                else:
-                    failed_leads.append({'lead_id': lead_id, 'errors': serializer.errors})
-
-            except Exception as e:
-                failed_leads.append({'lead_id': lead_id, 'error': str(e)})
-
-        # 🔔 One grouped Pusher notification per assignee (self-assignments already excluded above)
-        for uid, summary in assigned_summary.items():
-            count = len(summary['leads'])
-            trigger_pusher(
-                channel=f'private-user-{uid}',
-                event='lead.assigned',
-                data={
-                    'bulk':             True,
-                    'count':            count,
-                    'leads':            summary['leads'],
-                    'assignment_type':  summary['type'],
-                    'assigned_by_id':   user.id,
-                    'assigned_by_name': user.get_full_name() or user.username,
-                    'message': (
-                        f"{count} lead{'s' if count > 1 else ''} assigned to you "
-                        f"by {user.get_full_name() or user.username}"
-                    ),
-                }
-            )
+        success_count, failed_leads = bulk_assign_leads(
+            user=request.user,
+            lead_ids=lead_ids,
+            assigned_to_id=assigned_to_id,
+            notes=notes,
+        )
 
         return Response({
             'message':       f'Successfully assigned {success_count} leads',
@@ -403,6 +617,35 @@ class BulkLeadAssignView(APIView):
         }, status=status.HTTP_200_OK)
 
 
+# ── Lead Routing View
+class LeadRouteBacklogView(APIView):
+    """Route open unassigned leads through the routing rules (see leads.routing)."""
+    permission_classes = [CanModifyAllLeads]
+
+    def post(self, request):
+        limit = request.data.get('limit')
+        if limit is not None:
+            try:
+                limit = int(limit)
+            except (TypeError, ValueError):
+                limit = 0
+            if limit < 1:
+                return Response(
+                    {'error': 'limit must be a positive integer'},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        routed_count, unrouted_count, routed = route_backlog(assigned_by=request.user, limit=limit)
+        notify_routed_leads(routed, assigned_by=request.user)
+
+        return Response({
+            'message':        f'Routed {routed_count} leads',
+            'routed_count':   routed_count,
+            'unrouted_count': unrouted_count,
+            'assignments':    {assignee.id: len(leads) for assignee, leads in routed.items()},
+        }, status=status.HTTP_200_OK)
+
+
 # ── Lead Assignment History View
 class LeadAssignmentHistoryView(generics.ListAPIView):
     serializer_class   = LeadAssignmentSerializer
@@ -422,18 +665,74 @@ class LeadAssignmentHistoryView(generics.ListAPIView):
         return LeadAssignment.objects.filter(lead=lead).order_by('-timestamp')
 
 
+# ── Duplicate Leads (admin)
+class DuplicateLeadPagination(KeysetPagination):
+    page_size       = 50
+    cursor_ordering = ('-score', 'id')
+
+
+class DuplicateLeadCandidateListView(generics.ListAPIView):
+    """
+    Pairs found by `manage.py find_duplicate_leads`, best match first.
+    `?status=DISMISSED` lists dismissed pairs; `?min_score=` raises the bar.
+    """
+    serializer_class   = DuplicateLeadCandidateSerializer
+    permission_classes = [CanModifyAllLeads]
+    pagination_class   = DuplicateLeadPagination
+
+    def get_queryset(self):
+        params = self.request.query_params
+        qs = DuplicateLeadCandidate.objects.select_related(
+            'lead_a__assigned_to', 'lead_b__assigned_to',
+        ).filter(status=params.get('status', 'OPEN').upper())
+
+        min_score = params.get('min_score')
+        if min_score:
+            try:
+                qs = qs.filter(score__gte=float(min_score))
+            except ValueError:
+                pass
+        return qs.order_by('-score', 'id')
+
+
+class DuplicateLeadDismissView(APIView):
+    permission_classes = [CanModifyAllLeads]
+
+    def post(self, request, pk):
+        candidate = get_object_or_404(DuplicateLeadCandidate, pk=pk)
+        candidate.status = 'DISMISSED'
+        candidate.save(update_fields=['status', 'updated_at'])
+        return Response(DuplicateLeadCandidateSerializer(candidate).data)
+
+
+class LeadMergeView(APIView):
+    """Merge `duplicate_ids` into `primary_id` (see leads.duplicates.merge_leads)."""
+    permission_classes = [CanModifyAllLeads]
+
+    def post(self, request):
+        serializer = LeadMergeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        primary = serializer.validated_data['primary']
+        merged  = merge_leads(primary, serializer.validated_data['duplicate_ids'], user=request.user)
+        primary.refresh_from_db()
+
+        return Response({
+            'message':      f'Merged {merged} leads into {primary.name}',
+            'merged_count': merged,
+            'lead':         LeadDetailSerializer(primary, context={'request': request}).data,
+        }, status=status.HTTP_200_OK)
+
+
 # ── My Team Leads View
-class MyTeamLeadsView(generics.ListAPIView):
+class MyTeamLeadsView(CompactLeadListMixin, generics.ListAPIView):
     serializer_class   = LeadListSerializer
     permission_classes = [CanAccessLeads]
     pagination_class   = LeadPagination
 
     def get_queryset(self):
         user = self.request.user
-        base_qs = Lead.objects.select_related(
-            'assigned_to', 'assigned_by',
-            'sub_assigned_to', 'sub_assigned_by',
-        )
+        base_qs = self.get_lead_queryset()
         if user.role in FULL_ACCESS_ROLES:
             return base_qs.all().distinct()
         return base_qs.filter(
@@ -441,6 +740,12 @@ class MyTeamLeadsView(generics.ListAPIView):
             models.Q(sub_assigned_to=user)
         ).distinct()
 
+    def list(self, request, *args, **kwargs):
+        if not self.wants_compact():
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.get_paginated_response(self.get_compact_data(queryset))
+
 
 # ── Available Users for Assignment
 class AvailableUsersForAssignmentView(APIView):
@@ -554,10 +859,12 @@ class UpdateLeadView(APIView):
             context={'request': request},
         )
         serializer.is_valid(raise_exception=True)
-        updated_lead = serializer.save()
 
-        if old_status != 'CONVERTED' and updated_lead.status == 'CONVERTED':
-            send_conversion_email(updated_lead)
+        with transaction.atomic():
+            updated_lead = serializer.save()
+
+            if old_status != 'CONVERTED' and updated_lead.status == 'CONVERTED':
+                queue_conversion_email(updated_lead)
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -573,16 +880,20 @@ class BulkLeadUploadView(APIView):
         if not file:
             return Response({'error': 'No file uploaded'}, status=status.HTTP_400_BAD_REQUEST)
 
-        if file.size > 5 * 1024 * 1024:
-            return Response({'error': 'File too large (max 5MB)'}, status=status.HTTP_400_BAD_REQUEST)
+        if file.size > MAX_UPLOAD_SIZE:
+            return Response(
+                {'error': f'File too large (max {MAX_UPLOAD_SIZE // (1024 * 1024)}MB)'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         try:
-            df = pd.read_excel(file)
-        except Exception:
-            return Response({'error': 'Invalid Excel file'}, status=status.HTTP_400_BAD_REQUEST)
+            sheet = read_lead_rows(file)
+        except ImportFileError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        required_columns = ['name', 'phone', 'assigned_to']
-        missing_cols = [col for col in required_columns if col not in df.columns]
+        # Only the header is read here; the `process_import_jobs` worker reads the rows
+        with sheet:
+            missing_cols = [col for col in REQUIRED_COLUMNS if col not in sheet.columns]
 
         if missing_cols:
             return Response(
@@ -590,147 +901,52 @@ class BulkLeadUploadView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        user_map = {
-            user.username.lower(): user
-            for user in User.objects.filter(is_active=True)
-        }
+        file.seek(0)
+        job = ImportJob.objects.create(
+            uploaded_by=request.user,
+            file=file,
+            original_filename=file.name,
+            total_rows=sheet.total_rows,
+        )
 
-        success_count    = 0
-        failed_rows      = []
-        assigned_summary = {}
-        seen_phones      = set()  #  tracks phones already processed in this batch
+        return Response({
+            'message': 'Bulk upload queued',
+            'job':     ImportJobSerializer(job).data,
+        }, status=status.HTTP_202_ACCEPTED)
 
-        for index, row in df.iterrows():
-            try:
-                name       = clean_value(row.get('name'))
-                email      = clean_value(row.get('email'))
-                source     = clean_value(row.get('source'))
-                status_val = clean_value(row.get('status'))
-                priority   = clean_value(row.get('priority'))
-                program    = clean_value(row.get('program'))
-                location   = clean_value(row.get('location'))
-                raw_username = clean_value(row.get('assigned_to'))
-                username = str(raw_username).strip() if raw_username is not None else None
-
-                # Preserve leading zeros: treat phone as string from the start
-                phone = clean_value(row.get('phone'))
-                if phone is not None:
-                    # Excel stores numbers as floats; strip the decimal and keep as string
-                    phone = str(int(float(str(phone)))) if str(phone).replace('.', '', 1).isdigit() else str(phone).strip()
-
-                #  Within-batch duplicate check (before any DB or serializer work)
-                if phone and phone in seen_phones:
-                    failed_rows.append({
-                        'row':   index + 2,
-                        'error': f"Duplicate phone '{phone}' already exists in this file.",
-                    })
-                    continue
-
-                #  DB duplicate check
-                if phone and Lead.objects.filter(phone=phone).exists():
-                    failed_rows.append({
-                        'row':   index + 2,
-                        'error': f"Phone '{phone}' already exists in the system.",
-                    })
-                    continue
-
-                # Phone passed both duplicate checks — reserve it for this batch
-                if phone:
-                    seen_phones.add(phone)
-
-                if not username:
-                    failed_rows.append({'row': index + 2, 'error': 'assigned_to is required'})
-                    continue
-
-                assignee_user = user_map.get(str(username).lower())
-                if not assignee_user:
-                    failed_rows.append({
-                        'row':   index + 2,
-                        'error': f"User '{username}' not found",
-                    })
-                    continue
-
-                data = {
-                    'name':        name,
-                    'phone':       phone,
-                    'email':       email,
-                    'status':      str(status_val).upper() if status_val else 'ENQUIRY',
-                    'priority':    str(priority).upper()   if priority   else 'MEDIUM',
-                    'program':     program,
-                    'location':    location,
-                    'assigned_to': str(username),
-                }
-                if source:
-                    data['source'] = str(source).upper()
-
-                serializer = BulkLeadCreateSerializer(
-                    data=data,
-                    context={'request': request, 'user_map': user_map},
-                )
 
-                if serializer.is_valid():
-                    # Each row saved in its own savepoint — a failure here won't roll back prior successes
-                    try:
-                        with transaction.atomic():
-                            lead = serializer.save()
-                    except Exception as db_err:
-                        failed_rows.append({'row': index + 2, 'error': str(db_err)})
-                        continue
-
-                    success_count += 1
-
-                    # Skip notification summary if uploader assigned to themselves
-                    if assignee_user == request.user:
-                        continue
-
-                    uid = assignee_user.id
-                    if uid not in assigned_summary:
-                        assigned_summary[uid] = {
-                            'user':  assignee_user,
-                            'leads': [],
-                        }
-                    assigned_summary[uid]['leads'].append({
-                        'lead_id':   lead.id,
-                        'lead_name': lead.name,
-                        'priority':  lead.priority,
-                    })
-
-                else:
-                    failed_rows.append({
-                        'row':    index + 2,
-                        'data':   data,
-                        'errors': serializer.errors,
-                    })
-
-            except Exception as e:
-                failed_rows.append({'row': index + 2, 'error': str(e)})
-
-        # 🔔 One grouped Pusher notification per assignee (self-assignments already excluded above)
-        for uid, summary in assigned_summary.items():
-            count = len(summary['leads'])
-            trigger_pusher(
-                channel=f'private-user-{uid}',
-                event='lead.assigned',
-                data={
-                    'bulk':             True,
-                    'count':            count,
-                    'leads':            summary['leads'],
-                    'assignment_type':  'PRIMARY',
-                    'assigned_by_id':   request.user.id,
-                    'assigned_by_name': request.user.get_full_name() or request.user.username,
-                    'message': (
-                        f"{count} new lead{'s' if count > 1 else ''} uploaded and "
-                        f"assigned to you by {request.user.get_full_name() or request.user.username}"
-                    ),
-                }
-            )
+# ── Bulk Lead Upload Job Status
+class ImportJobStatusView(APIView):
+    permission_classes = [CanAccessLeads]
 
-        return Response({
-            'message':       'Bulk upload completed',
-            'success_count': success_count,
-            'failed_count':  len(failed_rows),
-            'failed_rows':   failed_rows,
-        }, status=status.HTTP_200_OK)
+    def get(self, request, job_id):
+        job = get_object_or_404(_import_jobs_for(request.user), id=job_id)
+        return Response(ImportJobSerializer(job).data, status=status.HTTP_200_OK)
+
+
+# ── Bulk Lead Upload Error Report (CSV download)
+class ImportJobErrorReportView(APIView):
+    permission_classes = [CanAccessLeads]
+
+    def get(self, request, job_id):
+        job = get_object_or_404(_import_jobs_for(request.user), id=job_id)
+
+        response = HttpResponse(content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="import-{job.id}-errors.csv"'
+
+        writer = csv.writer(response)
+        writer.writerow(['row', 'error'])
+        for failed in job.failed_rows:
+            if 'errors' in failed:
+                message = '; '.join(
+                    f"{field}: {' '.join(str(m) for m in messages)}"
+                    for field, messages in failed['errors'].items()
+                )
+            else:
+                message = failed.get('error', '')
+            writer.writerow([failed.get('row'), message])
+
+        return response
 
 
 # ── Today's Leads
@@ -738,13 +954,67 @@ class TodayLeadsAPI(APIView):
     permission_classes = [CanAccessLeads]
 
     def get(self, request):
-        today = date.today()
+        # Local-midnight range rather than created_at__date, so the index is used
+        start, end = day_bounds(timezone.localdate(), timezone.localdate())
         leads = Lead.objects.filter(
-            created_at__date=today
+            created_at__gte=start, created_at__lt=end,
         ).values('id', 'name', 'status', 'assigned_to')
         return Response(list(leads))
 
 
+# ── Lead Conversion Funnel
+class LeadFunnelView(APIView):
+    """
+    ENQUIRY → QUALIFIED → CONVERTED/REGISTERED conversion and median hours
+    in stage for leads created in `?start=&end=` (YYYY-MM-DD, default the
+    last 90 days), overall and per `?dimension=source|program|assignee`
+    (see leads.funnel).
+    """
+    permission_classes = [CanViewAllLeads]
+
+    def get(self, request):
+        params = request.query_params
+        start, end, error = _parse_day_range(request, MAX_REPORT_DAYS, default_days=90)
+        if error:
+            return error
+
+        dimension = params.get('dimension') or None
+        if dimension and dimension not in FUNNEL_DIMENSIONS:
+            return Response(
+                {'error': f"dimension must be one of: {', '.join(FUNNEL_DIMENSIONS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(funnel_report(start, end, dimension))
+
+
+# ── Lead Intake Analytics
+class LeadIntakeView(APIView):
+    """
+    Leads created per day (zero filled), hour, source and assignee for
+    `?start=&end=` (YYYY-MM-DD, inclusive, default the last 30 days), from
+    the intake rollups plus a live count of days not rolled up yet (see
+    leads.intake). Optional `?source=` and `?assigned_to=` narrow it.
+    """
+    permission_classes = [CanViewAllLeads]
+
+    def get(self, request):
+        params = request.query_params
+        start, end, error = _parse_day_range(request, MAX_REPORT_DAYS, default_days=30)
+        if error:
+            return error
+
+        assigned_to = params.get('assigned_to')
+        if assigned_to and not assigned_to.isdigit():
+            return Response({'error': 'assigned_to must be a user id'}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(intake_report(
+            start, end,
+            source=(params.get('source') or '').upper() or None,
+            assigned_to_id=int(assigned_to) if assigned_to else None,
+        ))
+
+
 
 
 class FollowUpListCreateAPIView(APIView):
@@ -752,7 +1022,8 @@ class FollowUpListCreateAPIView(APIView):
 
     def get(self, request):
         user = request.user
-        queryset = FollowUp.objects.filter(assigned_to=user)
+        # contact_display reads lead; join it instead of one query per row
+        queryset = FollowUp.objects.filter(assigned_to=user).select_related('lead')
 
         # ── Filters ─────────────────────────────────────────────────────────────
         lead_id      = request.query_params.get('lead')
@@ -799,10 +1070,8 @@ class FollowUpListCreateAPIView(APIView):
                 models.Q(phone_number__icontains=search)
             )
 
-        queryset = queryset.order_by('follow_up_date', 'follow_up_time')
-
-        serializer = FollowUpSerializer(queryset, many=True)
-        return Response(serializer.data)
+        queryset = queryset.order_by('follow_up_date', 'follow_up_time', 'id')
+        return _followup_response(request, queryset, view=self)
 
     def post(self, request):
         serializer = FollowUpSerializer(data=request.data)
@@ -849,10 +1118,9 @@ class TodayFollowUpsAPIView(APIView):
         queryset = FollowUp.objects.filter(
             assigned_to=request.user,
             follow_up_date=today
-        )
+        ).select_related('lead').order_by('follow_up_date', 'follow_up_time', 'id')
 
-        serializer = FollowUpSerializer(queryset, many=True)
-        return Response(serializer.data)
+        return _followup_response(request, queryset, view=self)
 
 
 class OverdueFollowUpsAPIView(APIView):
@@ -864,7 +1132,94 @@ class OverdueFollowUpsAPIView(APIView):
             assigned_to=request.user,
             follow_up_date__lt=today,
             status='pending'
+        ).select_related('lead').order_by('follow_up_date', 'follow_up_time', 'id')
+
+        return _followup_response(request, queryset, view=self)
+
+
+class FollowUpBulkRescheduleAPIView(APIView):
+    """Move many of the user's follow-ups to a new date/time (see leads.followups)."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = FollowUpBulkRescheduleSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        updated, missing = bulk_reschedule_followups(
+            user=request.user,
+            ids=data['ids'],
+            follow_up_date=data['follow_up_date'],
+            follow_up_time=data.get('follow_up_time', KEEP_TIME),
+            notes=data['notes'],
+        )
+        return Response({
+            'message':       f'Rescheduled {len(updated)} follow-ups',
+            'updated_count': len(updated),
+            'updated_ids':   updated,
+            'not_found':     missing,
+        }, status=status.HTTP_200_OK)
+
+
+class FollowUpBulkStatusAPIView(APIView):
+    """Set the status of many of the user's follow-ups (see leads.followups)."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = FollowUpBulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        updated, missing = bulk_update_followup_status(
+            user=request.user,
+            ids=data['ids'],
+            status=data['status'],
+            notes=data['notes'],
+        )
+        return Response({
+            'message':       f'Updated {len(updated)} follow-ups',
+            'updated_count': len(updated),
+            'updated_ids':   updated,
+            'not_found':     missing,
+        }, status=status.HTTP_200_OK)
+
+
+class FollowUpCalendarAPIView(APIView):
+    """
+    Per-day follow-up counts for `?start=YYYY-MM-DD&end=YYYY-MM-DD`
+    (inclusive, at most MAX_CALENDAR_DAYS), by status and type, from one
+    GROUP BY. Days without follow-ups are left out.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        start, end, error = _parse_day_range(request, MAX_CALENDAR_DAYS)
+        if error:
+            return error
+
+        rows = (
+            FollowUp.objects
+            .filter(assigned_to=request.user, follow_up_date__range=(start, end))
+            .values_list('follow_up_date', 'status', 'followup_type')
+            .annotate(total=Count('id'))
+            .order_by('follow_up_date')
         )
 
-        serializer = FollowUpSerializer(queryset, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        today = timezone.now().date()
+        days  = {}
+        for day, followup_status, followup_type, total in rows:
+            entry = days.setdefault(day, {
+                'date': day, 'total': 0, 'overdue': 0, 'by_status': {}, 'by_type': {},
+            })
+            entry['total'] += total
+            entry['by_status'][followup_status] = entry['by_status'].get(followup_status, 0) + total
+            entry['by_type'][followup_type]     = entry['by_type'].get(followup_type, 0) + total
+            if followup_status == 'pending' and day < today:
+                entry['overdue'] += total
+
+        return Response({
+            'start': start,
+            'end':   end,
+            'total': sum(entry['total'] for entry in days.values()),
+            'days':  list(days.values()),
+        })
\ No newline at end of file
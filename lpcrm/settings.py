@@ -32,6 +32,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'accounts.apps.AccountsConfig',
     'leads.apps.LeadsConfig',
     'tasks.apps.TasksConfig',
@@ -232,8 +233,12 @@ CORS_ALLOW_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
+    'if-none-match',
 ]
 
+# Lets the frontend read ETag and revalidate polled lists (utils.conditional)
+CORS_EXPOSE_HEADERS = ['etag']
+
 #  Security Settings (Production)
 SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
@@ -260,8 +265,18 @@ DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
 # Cron jobs
 CRONJOBS = [
     ('0 * * * *', 'tasks.cron.update_overdue_tasks', '>> /tmp/overdue_tasks.log 2>&1'),
+    # Email outbox, on a server with crontab; on Vercel see vercel.json "crons"
+    ('* * * * *', 'django.core.management.call_command', ['send_outbox_emails'], {'once': True},
+     '>> /tmp/outbox_emails.log 2>&1'),
+    # Expired processing claims back to the queue when nobody is claiming
+    ('*/15 * * * *', 'django.core.management.call_command', ['release_stale_processing_claims'], {},
+     '>> /tmp/processing_claims.log 2>&1'),
 ]
 
+# Activity logs older than this many days are moved to the archive table
+# by `manage.py archive_activity_logs`
+ACTIVITY_LOG_HOT_DAYS = config('ACTIVITY_LOG_HOT_DAYS', default=90, cast=int)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -291,13 +306,30 @@ LOGGING = {
 
 
 
-EMAIL_HOST_USER = "lifeplannerinfo1@gmail.com"
-EMAIL_HOST_PASSWORD = "jbfuqgcbwxnxhsmw"
+# SMTP server the `send_outbox_emails` worker delivers through
+EMAIL_HOST = config("EMAIL_HOST", "smtp.gmail.com")
+EMAIL_PORT = config("EMAIL_PORT", 587, cast=int)
+EMAIL_USE_TLS = config("EMAIL_USE_TLS", True, cast=bool)
+EMAIL_TIMEOUT = config("EMAIL_TIMEOUT", 30, cast=int)
+EMAIL_HOST_USER = config("EMAIL_HOST_USER", "lifeplannerinfo1@gmail.com")
+# Set in the environment; never commit it
+EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD", "")
 
 DEFAULT_FROM_EMAIL = "Lifeplanner Universal <lifeplannerinfo1@gmail.com>"
+# Vercel Cron sends it as a bearer token to /api/notifications/outbox/deliver/
+CRON_SECRET = config("CRON_SECRET", "")
 
 
 PUSHER_APP_ID = config("PUSHER_APP_ID", "2135420")
 PUSHER_KEY = config("PUSHER_KEY", "a8ecd560b1c203ba4cdf")
 PUSHER_SECRET = config("PUSHER_SECRET", "9da391240e3535b95cb0")
 PUSHER_CLUSTER = config("PUSHER_CLUSTER", "ap2")
+# Another Pusher-compatible server (e.g. utils.fake_pusher); blank: the cluster's API host
+PUSHER_HOST = config("PUSHER_HOST", "")
+PUSHER_PORT = config("PUSHER_PORT", 0, cast=int)
+PUSHER_SSL = config("PUSHER_SSL", True, cast=bool)
+# Background threads sending events per process; 0 sends them inline, batched
+# when the request finishes.
+# Only raise it on a long-running server (gunicorn, runserver): on Vercel's
+# serverless functions threads freeze once the response is out and atexit never runs
+PUSHER_DISPATCH_THREADS = config("PUSHER_DISPATCH_THREADS", 0, cast=int)
@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from notifications.outbox import (
+    MAX_PER_MINUTE,
+    OUTBOX_BATCH_SIZE,
+    PerMinuteThrottle,
+    SMTPSender,
+    SMTPUnavailable,
+    deliver_outbox,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Send queued outbox emails over one reused SMTP connection (polls the '
+        'database; safe to run on several nodes at once)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Exit once the outbox is empty instead of polling forever',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=10,
+            help='Seconds to wait between polls',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=OUTBOX_BATCH_SIZE,
+            help='Emails claimed per transaction',
+        )
+        parser.add_argument(
+            '--per-minute', type=int, default=MAX_PER_MINUTE,
+            help='Most emails sent in any one minute, across all workers',
+        )
+
+    def handle(self, *args, **options):
+        throttle = PerMinuteThrottle(options['per_minute'])
+        while True:
+            # The connection is only opened when there is mail, and closed while idle
+            with SMTPSender() as sender:
+                try:
+                    sent, retried, failed = deliver_outbox(sender, throttle, options['batch_size'])
+                except SMTPUnavailable as exc:
+                    self.stdout.write(self.style.ERROR(f'SMTP server unavailable: {exc}'))
+                else:
+                    if sent or retried or failed:
+                        self.stdout.write(self.style.SUCCESS(
+                            f'Sent {sent} emails, {retried} to retry, {failed} failed'
+                        ))
+
+            if options['once']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-17 00:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='type',
+            field=models.CharField(choices=[('task', 'Task'), ('lead', 'Lead'), ('chat', 'Chat'), ('followup', 'Follow-up')], max_length=20),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-17 01:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0003_email_outbox'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emailoutbox',
+            index=models.Index(condition=models.Q(('status', 'SENT')), fields=['sent_at'], name='email_outbox_sent_idx'),
+        ),
+    ]
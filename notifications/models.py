@@ -1,6 +1,7 @@
 # notifications/models.py
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 User = settings.AUTH_USER_MODEL
 
@@ -9,6 +10,7 @@ class Notification(models.Model):
         ('task', 'Task'),
         ('lead', 'Lead'),
         ('chat', 'Chat'),
+        ('followup', 'Follow-up'),
     ]
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
     type = models.CharField(max_length=20, choices=TYPE_CHOICES)
@@ -21,4 +23,53 @@ class Notification(models.Model):
         ordering = ['-created_at']
 
     def __str__(self):
-        return f"{self.user} - {self.message}"
\ No newline at end of file
+        return f"{self.user} - {self.message}"
+
+
+class EmailOutbox(models.Model):
+    """
+    A transactional email waiting for the `send_outbox_emails` worker.
+
+    Written in the same transaction as the change that triggers it, so an
+    email goes out only if that change commits, and never blocks the
+    request on SMTP. See notifications.outbox.
+    """
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('SENDING', 'Sending'),
+        ('SENT', 'Sent'),
+        ('FAILED', 'Failed'),
+    ]
+    kind = models.CharField(max_length=50, blank=True)
+    to_email = models.EmailField()
+    from_email = models.CharField(max_length=255, blank=True)
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveIntegerField(default=0)
+    # When the row may next be claimed: retry time for PENDING, claim expiry for SENDING
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+            # Claim scan in notifications.outbox: only rows still to be delivered
+            models.Index(
+                fields=['next_attempt_at', 'id'],
+                name='email_outbox_due_idx',
+                condition=models.Q(status__in=['PENDING', 'SENDING']),
+            ),
+            # Sends in the last minute, for the throttle in notifications.outbox
+            models.Index(
+                fields=['sent_at'],
+                name='email_outbox_sent_idx',
+                condition=models.Q(status='SENT'),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind or 'email'} to {self.to_email} [{self.status}]"
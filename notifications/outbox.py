@@ -0,0 +1,248 @@
+import logging
+import smtplib
+import time
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+
+OUTBOX_BATCH_SIZE       = 50
+MAX_PER_MINUTE          = 30                      # stay well under Gmail's sending limits
+MESSAGES_PER_CONNECTION = 100                     # then log in again; servers drop long sessions
+CLAIM_TIMEOUT           = timedelta(minutes=10)   # a SENDING row not renewed this long is retried (worker died)
+MAX_ATTEMPTS            = 6
+RETRY_BASE              = timedelta(minutes=1)    # 1, 2, 4, 8, 16 minutes between attempts
+RETRY_MAX               = timedelta(hours=1)
+SCHEDULED_LIMIT         = 10                      # per scheduled call; fits a serverless time limit
+
+
+class SMTPUnavailable(Exception):
+    """Could not connect or log in to the SMTP server; nothing was sent."""
+
+
+def queue_email(to_email, subject, body, kind='', from_email=''):
+    """
+    Add an email to the outbox. Call it inside the transaction that makes
+    the change the email reports, so it is only sent if that commits.
+    """
+    return EmailOutbox.objects.create(
+        kind=kind,
+        to_email=to_email,
+        from_email=from_email,
+        subject=subject,
+        body=body,
+    )
+
+
+# ── Sending
+class SMTPSender:
+    """
+    One authenticated SMTP connection (Django's SMTP backend, configured by
+    the EMAIL_* settings) reused for many messages. It is opened on the
+    first send, re-opened after MESSAGES_PER_CONNECTION messages or when
+    the server hangs up, and closed on exit.
+    """
+
+    def __init__(self, connection=None, messages_per_connection=MESSAGES_PER_CONNECTION):
+        self.connection              = connection or get_connection(fail_silently=False)
+        self.messages_per_connection = messages_per_connection
+        self.sent_on_connection      = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def open(self):
+        if self.sent_on_connection >= self.messages_per_connection:
+            self.close()
+        try:
+            self.connection.open()
+        except (OSError, smtplib.SMTPException) as exc:
+            self.close()
+            raise SMTPUnavailable(str(exc) or exc.__class__.__name__) from exc
+
+    def close(self):
+        self.connection.close()
+        self.sent_on_connection = 0
+
+    def send(self, message):
+        self.open()
+        try:
+            self.connection.send_messages([message])
+        except smtplib.SMTPServerDisconnected:
+            # Idle or recycled session: retry once on a fresh one
+            self.close()
+            self.open()
+            self.connection.send_messages([message])
+        self.sent_on_connection += 1
+
+
+class PerMinuteThrottle:
+    """
+    Blocks in wait() until fewer than `per_minute` outbox emails went out in
+    the last 60 s. The count comes from EmailOutbox.sent_at, so the limit
+    holds across every worker node, not per process. Workers checking at
+    the same moment can each send one more, so keep `per_minute` under the
+    provider's limit by the number of workers.
+    """
+
+    def __init__(self, per_minute=MAX_PER_MINUTE, clock=timezone.now, sleep=time.sleep):
+        self.per_minute = per_minute
+        self.clock      = clock
+        self.sleep      = sleep
+
+    def _recent(self, now):
+        return list(
+            EmailOutbox.objects.filter(status='SENT', sent_at__gt=now - timedelta(seconds=60))
+            .order_by('sent_at').values_list('sent_at', flat=True)
+        )
+
+    def available(self):
+        """How many sends the limit allows right now."""
+        return max(self.per_minute - len(self._recent(self.clock())), 0)
+
+    def wait(self):
+        while True:
+            now    = self.clock()
+            recent = self._recent(now)
+            if len(recent) < self.per_minute:
+                return
+            # Until the send that frees a slot is a minute old
+            oldest = recent[len(recent) - self.per_minute]
+            self.sleep(max((oldest + timedelta(seconds=60) - now).total_seconds(), 0.1))
+
+
+# ── Delivery
+def retry_delay(attempts):
+    return min(RETRY_BASE * 2 ** (attempts - 1), RETRY_MAX)
+
+
+def is_permanent(exc):
+    """A 5xx refusal of this message (bad recipient, rejected content)."""
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in exc.recipients.values())
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return exc.smtp_code >= 500
+    return False
+
+
+def claim_outbox(batch_size=OUTBOX_BATCH_SIZE, now=None):
+    """
+    Claim up to `batch_size` due rows, oldest first.
+
+    The rows are locked with SKIP LOCKED (another worker takes different
+    rows) and moved to SENDING with next_attempt_at pushed CLAIM_TIMEOUT
+    ahead, so a batch left behind by a crashed worker is picked up again.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        rows = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status__in=['PENDING', 'SENDING'], next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        if rows:
+            EmailOutbox.objects.filter(id__in=[row.id for row in rows]).update(
+                status='SENDING',
+                next_attempt_at=now + CLAIM_TIMEOUT,
+            )
+    return rows
+
+
+def renew_claim(rows, now=None):
+    """Push the claim on `rows` still SENDING CLAIM_TIMEOUT ahead again; returns `now`."""
+    now = now or timezone.now()
+    EmailOutbox.objects.filter(id__in=[row.id for row in rows], status='SENDING').update(
+        next_attempt_at=now + CLAIM_TIMEOUT,
+    )
+    return now
+
+
+def _message(row):
+    return EmailMessage(
+        subject=row.subject,
+        body=row.body,
+        from_email=row.from_email or None,  # None: DEFAULT_FROM_EMAIL
+        to=[row.to_email],
+    )
+
+
+def deliver_outbox(sender, throttle=None, batch_size=OUTBOX_BATCH_SIZE, limit=None):
+    """
+    Send every due outbox row (at most `limit`) through `sender`, batch by batch.
+
+    Each row is marked as soon as the server answers: SENT, retried with
+    exponential backoff, or FAILED after a 5xx refusal or MAX_ATTEMPTS.
+    The claim on the rest of the batch is renewed every CLAIM_TIMEOUT / 2,
+    so a batch slowed down by the throttle is never re-claimed (and sent
+    twice) by another worker.
+    If the server cannot be reached the rest of the batch goes back to
+    PENDING (attempts unchanged) and SMTPUnavailable is raised.
+    Returns (sent, retried, failed).
+    """
+    sent = retried = failed = 0
+    while True:
+        size = batch_size if limit is None else min(batch_size, limit - sent - retried - failed)
+        if size <= 0:
+            return sent, retried, failed
+        rows       = claim_outbox(size)
+        claimed_at = timezone.now()
+        for index, row in enumerate(rows):
+            if throttle:
+                throttle.wait()
+            if timezone.now() - claimed_at >= CLAIM_TIMEOUT / 2:
+                claimed_at = renew_claim(rows[index:])
+            try:
+                sender.send(_message(row))
+            except SMTPUnavailable as exc:
+                EmailOutbox.objects.filter(id__in=[pending.id for pending in rows[index:]]).update(
+                    status='PENDING',
+                    next_attempt_at=timezone.now() + RETRY_BASE,
+                    last_error=str(exc),
+                )
+                raise
+            except Exception as exc:
+                attempts = row.attempts + 1
+                if is_permanent(exc) or attempts >= MAX_ATTEMPTS:
+                    EmailOutbox.objects.filter(id=row.id).update(
+                        status='FAILED', attempts=attempts, last_error=str(exc),
+                    )
+                    logger.error("Outbox email #%s to %s failed: %s", row.id, row.to_email, exc)
+                    failed += 1
+                else:
+                    EmailOutbox.objects.filter(id=row.id).update(
+                        status='PENDING',
+                        attempts=attempts,
+                        next_attempt_at=timezone.now() + retry_delay(attempts),
+                        last_error=str(exc),
+                    )
+                    retried += 1
+            else:
+                EmailOutbox.objects.filter(id=row.id).update(
+                    status='SENT', attempts=row.attempts + 1, sent_at=timezone.now(), last_error='',
+                )
+                sent += 1
+        if len(rows) < size:
+            return sent, retried, failed
+
+
+def deliver_scheduled():
+    """
+    One scheduled run (Vercel Cron, crontab): send as many due emails as the
+    per-minute limit allows right now, at most SCHEDULED_LIMIT, and return.
+    Returns (sent, retried, failed); raises SMTPUnavailable.
+    """
+    throttle = PerMinuteThrottle()
+    limit    = min(throttle.available(), SCHEDULED_LIMIT)
+    if not limit:
+        return 0, 0, 0
+    with SMTPSender() as sender:
+        return deliver_outbox(sender, throttle, limit=limit)
@@ -1,3 +1,212 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.core.signals import request_finished
+from django.db import close_old_connections, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from utils.fake_pusher import FakePusherServer
+from utils.fake_smtp import FakeSMTPServer
+from utils.pusher import PusherDispatcher
+
+from .models import EmailOutbox
+from .outbox import (
+    CLAIM_TIMEOUT,
+    SCHEDULED_LIMIT,
+    SMTPSender,
+    SMTPUnavailable,
+    claim_outbox,
+    deliver_outbox,
+    queue_email,
+)
+
+
+class FakePusherMixin:
+    def setUp(self):
+        super().setUp()
+        self.server = FakePusherServer().start()
+        self.addCleanup(self.server.stop)
+        settings = override_settings(**self.server.settings())
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+
+class PusherDispatcherTests(FakePusherMixin, TestCase):
+    def send(self, dispatcher, events):
+        with self.captureOnCommitCallbacks(execute=True):
+            for channel, data in events:
+                dispatcher.enqueue(channel, 'test.event', data)
+        self.assertTrue(dispatcher.flush())
+
+    def test_inline_after_commit(self):
+        dispatcher = PusherDispatcher(threads=0)
+        self.send(dispatcher, [('private-user-1', {'n': 1})])
+
+        self.assertEqual(self.server.events, [
+            {'channel': 'private-user-1', 'name': 'test.event', 'data': {'n': 1}},
+        ])
+        self.assertEqual(dispatcher.metrics()['sent'], 1)
+
+    def test_rolled_back_events_are_not_sent(self):
+        dispatcher = PusherDispatcher(threads=0)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    dispatcher.enqueue('private-user-1', 'test.event', {'n': 1})
+                    raise ValueError
+            except ValueError:
+                pass
+
+        self.assertEqual(callbacks, [])
+        self.assertEqual(self.server.events, [])
+
+    def test_inline_events_are_held_until_the_request_finishes(self):
+        dispatcher = PusherDispatcher(threads=0)
+        with self.captureOnCommitCallbacks(execute=True):
+            for n in range(25):
+                dispatcher.enqueue(f'private-user-{n}', 'test.event', {'n': n})
+
+        # Full batches go out at once, the rest when the request ends
+        self.assertEqual([n for _, n in self.server.requests], [10, 10])
+        request_finished.connect(dispatcher.send_held, dispatch_uid='test-send-held')
+        self.addCleanup(request_finished.disconnect, dispatch_uid='test-send-held')
+        # As the test client does: closing the connection would end the test's transaction
+        request_finished.disconnect(close_old_connections)
+        self.addCleanup(request_finished.connect, close_old_connections)
+        request_finished.send(sender=self.__class__)
+
+        self.assertEqual([n for _, n in self.server.requests], [10, 10, 5])
+        self.assertEqual(sorted(event['data']['n'] for event in self.server.events), list(range(25)))
+
+    def test_worker_batches_queued_events(self):
+        dispatcher = PusherDispatcher(threads=1)
+        self.send(dispatcher, [(f'private-user-{n}', {'n': n}) for n in range(25)])
+
+        self.assertEqual(sorted(n for _, n in self.server.requests), [5, 10, 10])
+        self.assertEqual(sorted(event['data']['n'] for event in self.server.events), list(range(25)))
+        self.assertEqual(dispatcher.metrics()['batches'], 3)
+
+    def test_retries_once_after_server_error(self):
+        dispatcher = PusherDispatcher(threads=0)
+        self.server.fail_next(500)
+        self.send(dispatcher, [('private-user-1', {'n': 1})])
+
+        self.assertEqual(len(self.server.events), 1)
+        self.assertEqual(dispatcher.metrics()['failed'], 0)
+
+    def test_gives_up_after_second_error(self):
+        dispatcher = PusherDispatcher(threads=0)
+        self.server.fail_next(500, count=2)
+        self.send(dispatcher, [('private-user-1', {'n': 1})])
+
+        self.assertEqual(self.server.events, [])
+        self.assertEqual(dispatcher.metrics()['failed'], 1)
+
+    def test_invalid_event_falls_back_to_one_by_one(self):
+        dispatcher = PusherDispatcher(threads=1)
+        self.send(dispatcher, [
+            ('private-user-1', {'n': 1}),
+            ('not a channel!', {'n': 2}),
+            ('private-user-3', {'n': 3}),
+        ])
+
+        self.assertEqual([event['data']['n'] for event in self.server.events], [1, 3])
+        self.assertEqual([n for _, n in self.server.requests], [1, 1])
+        metrics = dispatcher.metrics()
+        self.assertEqual((metrics['sent'], metrics['failed']), (2, 1))
+
+
+class GroupConversationPusherTests(FakePusherMixin, TransactionTestCase):
+    def test_one_batch_for_all_members(self):
+        owner   = User.objects.create_user(username='owner', password='x', role='ADMIN')
+        members = [User.objects.create_user(username=f'member{n}', password='x', role='ADM_EXEC') for n in range(4)]
+        client  = APIClient()
+        client.force_authenticate(owner)
+
+        response = client.post(
+            '/api/create-group/', {'name': 'Intake', 'user_ids': [m.id for m in members]}, format='json',
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.server.requests, [('/apps/1/batch_events', 4)])
+        self.assertEqual(
+            sorted(event['channel'] for event in self.server.events),
+            sorted(f'private-user-{m.id}' for m in members),
+        )
+
+
+class OutboxDeliveryTests(TestCase):
+    def setUp(self):
+        self.server = FakeSMTPServer().start()
+        self.addCleanup(self.server.stop)
+        settings = override_settings(**self.server.settings())
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.row = queue_email('lead@example.com', 'Welcome', 'Hello', kind='lead_converted')
+
+    def deliver(self):
+        with SMTPSender() as sender:
+            return deliver_outbox(sender)
+
+    def test_sent(self):
+        self.assertEqual(self.deliver(), (1, 0, 0))
+
+        self.row.refresh_from_db()
+        self.assertEqual((self.row.status, self.row.attempts), ('SENT', 1))
+        self.assertIsNotNone(self.row.sent_at)
+        self.assertEqual([message['to'] for message in self.server.messages], [['lead@example.com']])
+
+    def test_4xx_is_retried_later(self):
+        self.server.fail_next('RCPT', 451)
+        self.assertEqual(self.deliver(), (0, 1, 0))
+
+        self.row.refresh_from_db()
+        self.assertEqual((self.row.status, self.row.attempts), ('PENDING', 1))
+        self.assertGreater(self.row.next_attempt_at, timezone.now())
+        self.assertIn('451', self.row.last_error)
+        self.assertEqual(self.server.messages, [])
+
+    def test_5xx_fails(self):
+        self.server.fail_next('DATA', 554)
+        self.assertEqual(self.deliver(), (0, 0, 1))
+
+        self.row.refresh_from_db()
+        self.assertEqual((self.row.status, self.row.attempts), ('FAILED', 1))
+
+    def test_server_down_keeps_the_row_pending(self):
+        self.server.stop()
+        with self.assertRaises(SMTPUnavailable):
+            self.deliver()
+
+        self.row.refresh_from_db()
+        self.assertEqual((self.row.status, self.row.attempts), ('PENDING', 0))
+        self.assertGreater(self.row.next_attempt_at, timezone.now())
+
+    def test_expired_claim_is_claimed_again(self):
+        EmailOutbox.objects.filter(id=self.row.id).update(
+            status='SENDING', next_attempt_at=timezone.now() - timedelta(seconds=1),
+        )
+        live = queue_email('other@example.com', 'Welcome', 'Hello')
+        EmailOutbox.objects.filter(id=live.id).update(
+            status='SENDING', next_attempt_at=timezone.now() + CLAIM_TIMEOUT,
+        )
+
+        self.assertEqual([row.id for row in claim_outbox()], [self.row.id])
+        self.row.refresh_from_db()
+        self.assertEqual(self.row.status, 'SENDING')
+        self.assertGreater(self.row.next_attempt_at, timezone.now())
+
+    @override_settings(CRON_SECRET='cron-secret')
+    def test_scheduled_entry_point(self):
+        for n in range(SCHEDULED_LIMIT + 5):
+            queue_email(f'lead{n}@example.com', 'Welcome', 'Hello')
+        url = '/api/notifications/outbox/deliver/'
+
+        self.assertEqual(self.client.get(url).status_code, 403)
+        response = self.client.get(url, HTTP_AUTHORIZATION='Bearer cron-secret')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'sent': SCHEDULED_LIMIT, 'retried': 0, 'failed': 0})
+        self.assertEqual(len(self.server.messages), SCHEDULED_LIMIT)
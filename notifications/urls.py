@@ -1,9 +1,14 @@
 # notifications/urls.py
 from django.urls import path
-from .views import NotificationListView, MarkNotificationsReadView, ClearNotificationsView
+from .views import (
+    NotificationListView, MarkNotificationsReadView, ClearNotificationsView, PusherDispatchMetricsView,
+    DeliverOutboxView,
+)
 
 urlpatterns = [
     path('notifications/', NotificationListView.as_view()),
     path('notifications/mark-read/', MarkNotificationsReadView.as_view()),
     path('notifications/clear/', ClearNotificationsView.as_view()),
+    path('notifications/pusher-metrics/', PusherDispatchMetricsView.as_view()),
+    path('notifications/outbox/deliver/', DeliverOutboxView.as_view()),
 ]
\ No newline at end of file
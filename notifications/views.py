@@ -1,15 +1,32 @@
 # notifications/views.py
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
-from rest_framework import status
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework import generics, status
+from django.conf import settings
+from django.db.models import Count, Max, Q
+from django.utils.crypto import constant_time_compare
 from .models import Notification
+from .outbox import SMTPUnavailable, deliver_scheduled
+from accounts.permissions import IsSuperAdmin
+from utils.conditional import ConditionalGetMixin
+from utils.pusher import dispatcher
 
-class NotificationListView(APIView):
+class NotificationListView(ConditionalGetMixin, generics.ListAPIView):
     permission_classes = [IsAuthenticated]
+    pagination_class   = None
+    # Notifications are never edited, only marked read or deleted
+    etag_aggregates    = {
+        'count':  Count('id'),
+        'latest': Max('id'),
+        'unread': Count('id', filter=Q(is_read=False)),
+    }
 
-    def get(self, request):
-        notifs = Notification.objects.filter(user=request.user)
+    def get_queryset(self):
+        return Notification.objects.filter(user=self.request.user)
+
+    def list(self, request, *args, **kwargs):
+        notifs = self.get_queryset()
         data = [{
             'id': n.id,
             'type': n.type,
@@ -32,4 +49,30 @@ class ClearNotificationsView(APIView):
 
     def delete(self, request):
         Notification.objects.filter(user=request.user).delete()
-        return Response({'status': 'ok'})
\ No newline at end of file
+        return Response({'status': 'ok'})
+
+class PusherDispatchMetricsView(APIView):
+    """Queue depth, counters and send latency of this process's Pusher dispatcher."""
+    permission_classes = [IsSuperAdmin]
+
+    def get(self, request):
+        return Response(dispatcher.metrics())
+
+
+class DeliverOutboxView(APIView):
+    """
+    Vercel Cron entry point for the email outbox (see vercel.json): one
+    deliver_scheduled() run. Vercel sends `Authorization: Bearer <CRON_SECRET>`.
+    """
+    permission_classes     = [AllowAny]
+    authentication_classes = []
+
+    def get(self, request):
+        expected = f'Bearer {settings.CRON_SECRET}'
+        if not settings.CRON_SECRET or not constant_time_compare(request.headers.get('Authorization', ''), expected):
+            return Response({'error': 'Forbidden'}, status=status.HTTP_403_FORBIDDEN)
+        try:
+            sent, retried, failed = deliver_scheduled()
+        except SMTPUnavailable as exc:
+            return Response({'error': f'SMTP server unavailable: {exc}'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return Response({'sent': sent, 'retried': retried, 'failed': failed})
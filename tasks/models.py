@@ -1,9 +1,12 @@
 from django.db import models
 from django.utils import timezone
 from accounts.models import User
+from utils.models import DirtyFieldsMixin
 
 
-class Task(models.Model):
+class Task(DirtyFieldsMixin, models.Model):
+    tracked_fields = ['status']  # read by tasks.signals
+
     STATUS_CHOICES = [
         ('PENDING', 'Pending'),
         ('IN_PROGRESS', 'In Progress'),
@@ -6,13 +6,7 @@ from accounts.utils import log_activity
  
 @receiver(pre_save, sender=Task)
 def capture_task_old_state(sender, instance, **kwargs):
-    if instance.pk:
-        try:
-            instance._old_task_status = Task.objects.get(pk=instance.pk).status
-        except Task.DoesNotExist:
-            instance._old_task_status = None
-    else:
-        instance._old_task_status = None
+    instance._old_task_status = instance.old_value('status')
  
  
 @receiver(post_save, sender=Task)
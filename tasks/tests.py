@@ -1,3 +1,51 @@
+from datetime import date, timedelta
+from unittest import mock
+
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+
+from .models import Task
+
+
+class TaskListConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin', password='x', role='ADMIN')
+        cls.exec  = User.objects.create_user(username='exec', password='x', role='ADM_EXEC')
+        Task.objects.bulk_create([
+            Task(
+                title=f'Task {i}',
+                description='Call back',
+                assigned_by=cls.admin,
+                assigned_to=cls.exec,
+                deadline=timezone.localdate() + timedelta(days=i),
+            )
+            for i in range(5)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_200_then_304_query_counts(self):
+        # Fingerprint, count, page
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/tasks/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 5)
+
+        # Only the fingerprint query
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/tasks/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
 
-# Create your tests here.
+    def test_etag_changes_the_next_day(self):
+        # A task due today becomes overdue tomorrow without any row changing
+        with mock.patch('utils.conditional.timezone.localdate', return_value=date(2026, 1, 1)):
+            etag = self.client.get('/api/tasks/')['ETag']
+        with mock.patch('utils.conditional.timezone.localdate', return_value=date(2026, 1, 2)):
+            response = self.client.get('/api/tasks/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
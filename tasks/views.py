@@ -28,6 +28,7 @@ from .permissions import (
 
 # removed duplicate local pusher definitions — import from utils (single source of truth)
 from utils import notify_task_assigned, notify_task_status_updated
+from utils.conditional import ConditionalGetMixin
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -138,7 +139,7 @@ class EmployeeListAPIView(generics.ListAPIView):
 
 # ── Task List / Create ────────────────────────────────────────────────────────
 
-class TaskListCreateAPIView(generics.ListCreateAPIView):
+class TaskListCreateAPIView(ConditionalGetMixin, generics.ListCreateAPIView):
     serializer_class = TaskSerializer
     pagination_class = TaskPagination
     filter_backends = [filters.SearchFilter]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-17 00:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('telephony', '0004_voxbayagent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='voxbaycalllog',
+            name='phone_normalized',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Canonical digits of the other party (caller for incoming, destination for outgoing)', max_length=20),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-17 00:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('telephony', '0005_phone_normalized'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='voxbaycalllog',
+            index=models.Index(fields=['phone_normalized', 'created_at', 'id'], name='telephony_v_phone_n_1f655c_idx'),
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 
+from utils.phone import normalize_phone
+
 
 class VoxbayAgent(models.Model):
     name         = models.CharField(max_length=100)
@@ -40,6 +42,7 @@ class VoxbayCallLog(models.Model):
     call_end                = models.DateTimeField(null=True, blank=True)
     dtmf                = models.CharField(max_length=100, null=True, blank=True)
     transferred_number  = models.CharField(max_length=200, null=True, blank=True)
+    phone_normalized    = models.CharField(max_length=30, blank=True, db_index=True, editable=False,help_text="Canonical digits of the other party (caller for incoming, destination for outgoing)")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -49,8 +52,20 @@ class VoxbayCallLog(models.Model):
             models.Index(fields=['call_status']),
             models.Index(fields=['call_type']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['phone_normalized', 'created_at', 'id']),
         ]
 
+    def save(self, *args, **kwargs):
+        self.phone_normalized = normalize_phone(self.party_number)
+        super().save(*args, **kwargs)
+
+    @property
+    def party_number(self):
+        """The lead-side number of the call: who called us, or who we called."""
+        if self.call_type == 'outgoing':
+            return self.destination
+        return self.caller_number
+
     def __str__(self):
         if self.call_type == 'outgoing':
             return f"OUT {self.extension} → {self.destination} [{self.call_status}]"
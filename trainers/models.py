@@ -1,11 +1,14 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.core.validators import MinLengthValidator
+from utils.models import DirtyFieldsMixin
 
 User = get_user_model()
 
 
-class Trainer(models.Model):
+class Trainer(DirtyFieldsMixin, models.Model):
+    tracked_fields = ['status']  # read by trainers.signals
+
     user = models.OneToOneField(
         User,
         on_delete=models.CASCADE,
@@ -33,7 +36,9 @@ class Trainer(models.Model):
         return self.user.get_full_name() or self.user.username
 
 
-class Student(models.Model):
+class Student(DirtyFieldsMixin, models.Model):
+    tracked_fields = ['status', 'trainer', 'batch']  # read by trainers.signals
+
     BATCH_CHOICES = [
         ('A1', 'A1 (Beginner)'),
         ('A2', 'A2 (Elementary)'),
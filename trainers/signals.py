@@ -25,13 +25,7 @@ def _user_label(user):
 
 @receiver(pre_save, sender=Trainer)
 def capture_trainer_old_state(sender, instance, **kwargs):
-    if instance.pk:
-        try:
-            instance._old_trainer_status = Trainer.objects.get(pk=instance.pk).status
-        except Trainer.DoesNotExist:
-            instance._old_trainer_status = None
-    else:
-        instance._old_trainer_status = None
+    instance._old_trainer_status = instance.old_value('status')
 
 
 @receiver(post_save, sender=Trainer)
@@ -84,20 +78,9 @@ def log_trainer_deleted(sender, instance, **kwargs):
 
 @receiver(pre_save, sender=Student)
 def capture_student_old_state(sender, instance, **kwargs):
-    if instance.pk:
-        try:
-            old = Student.objects.get(pk=instance.pk)
-            instance._old_student_status  = old.status
-            instance._old_student_trainer = old.trainer_id
-            instance._old_student_batch   = old.batch
-        except Student.DoesNotExist:
-            instance._old_student_status  = None
-            instance._old_student_trainer = None
-            instance._old_student_batch   = None
-    else:
-        instance._old_student_status  = None
-        instance._old_student_trainer = None
-        instance._old_student_batch   = None
+    instance._old_student_status  = instance.old_value('status')
+    instance._old_student_trainer = instance.old_value('trainer')
+    instance._old_student_batch   = instance.old_value('batch')
 
 
 @receiver(post_save, sender=Student)
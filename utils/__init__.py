@@ -3,6 +3,8 @@ from .pusher import (
     notify_task_assigned,
     notify_task_status_updated,
     notify_lead_assigned,
+    notify_leads_bulk_assigned,
+    notify_followup_reminders,
     notify_new_message,
     notify_new_conversation,
 )
@@ -12,6 +14,8 @@ __all__ = [
     "notify_task_assigned",
     "notify_task_status_updated",
     "notify_lead_assigned",
+    "notify_leads_bulk_assigned",
+    "notify_followup_reminders",
     "notify_new_message",
     "notify_new_conversation",
 ]
\ No newline at end of file
@@ -0,0 +1,55 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils import timezone
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    """
+    ETag revalidation for list endpoints the frontend polls.
+
+    Before the list is built, one aggregate query over `get_etag_queryset()`
+    (`etag_aggregates`, by default row count and latest `updated_at`) is
+    hashed together with the user, the full query string and today's date.
+    When the request's If-None-Match carries that tag, a 304 goes back
+    without fetching or serializing the rows. Otherwise the normal response
+    gets the tag, with `Cache-Control: private, no-cache` so the browser
+    revalidates each poll.
+
+    Put it before the generic view class:
+
+        class TaskListCreateAPIView(ConditionalGetMixin, generics.ListCreateAPIView):
+            etag_aggregates = {'count': Count('id'), 'updated': Max('updated_at')}
+    """
+    etag_aggregates = {'count': Count('id'), 'updated': Max('updated_at')}
+
+    def get_etag_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    def get_etag(self, request):
+        values = self.get_etag_queryset().order_by().aggregate(**self.etag_aggregates)
+        # Today's date too: serializers derive fields from it (e.g. a task's
+        # is_overdue), so a list unchanged since yesterday is still stale
+        parts  = [type(self).__name__, request.user.pk, request.get_full_path(), timezone.localdate()]
+        parts += [values[name] for name in sorted(values)]
+        digest = hashlib.md5('|'.join(map(str, parts)).encode(), usedforsecurity=False).hexdigest()
+        return f'W/"{digest}"'
+
+    def get(self, request, *args, **kwargs):
+        etag = self.get_etag(request)
+        # Weak comparison (RFC 9110 13.1.2): W/"x" matches "x"
+        wanted = {tag.removeprefix('W/') for tag in parse_etags(request.headers.get('If-None-Match', ''))}
+        if etag.removeprefix('W/') in wanted or '*' in wanted:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = super().get(request, *args, **kwargs)
+
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ['Authorization'])
+        return response
@@ -0,0 +1,121 @@
+# utils/fake_pusher.py
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from pusher.http import make_query_string
+from pusher.signature import verify
+
+
+class FakePusherServer:
+    """
+    Local stand-in for Pusher's HTTP API, for tests and local development.
+
+    Accepts signed POSTs to /apps/<id>/events and /apps/<id>/batch_events
+    and records every event in `events` (channel, name, decoded data).
+    Requests with a bad signature get a 401. `fail_next` answers the next
+    requests with an error status, and `delay` slows every response.
+
+        with FakePusherServer() as server, override_settings(**server.settings()):
+            ...
+            dispatcher.flush()
+            server.events   # [{'channel': ..., 'name': ..., 'data': {...}}]
+    """
+
+    def __init__(self, key='key', secret='secret', delay=0):
+        self.key       = key
+        self.secret    = secret
+        self.delay     = delay
+        self.events    = []
+        self.requests  = []    # (path, number of events)
+        self._failures = []
+        self._lock     = threading.Lock()
+        self._server   = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def settings(self, app_id='1'):
+        """Settings pointing utils.pusher at this server."""
+        return {
+            'PUSHER_APP_ID': app_id,
+            'PUSHER_KEY':    self.key,
+            'PUSHER_SECRET': self.secret,
+            'PUSHER_HOST':   '127.0.0.1',
+            'PUSHER_PORT':   self.port,
+            'PUSHER_SSL':    False,
+        }
+
+    def fail_next(self, status=500, count=1):
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _record(self, path, body):
+        events = body.get('batch') or [{'channel': channel, 'name': body['name'], 'data': body['data']}
+                                       for channel in body.get('channels', [])]
+        with self._lock:
+            self.requests.append((path, len(events)))
+            for event in events:
+                try:
+                    data = json.loads(event['data'])
+                except (TypeError, ValueError):
+                    data = event['data']
+                self.events.append({'channel': event['channel'], 'name': event['name'], 'data': data})
+            return {'batch': [{} for _ in events]} if 'batch' in body else {}
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'   # keep-alive, like the real API
+
+            def do_POST(self):
+                url    = urlsplit(self.path)
+                params = dict(parse_qsl(url.query))
+                body   = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                signed = make_query_string({k: v for k, v in params.items() if k != 'auth_signature'})
+
+                if fake.delay:
+                    time.sleep(fake.delay)
+                with fake._lock:
+                    failure = fake._failures.pop(0) if fake._failures else None
+
+                if failure:
+                    self._reply(failure, {'error': 'injected failure'})
+                elif not verify(fake.secret, '\n'.join(['POST', url.path, signed]), params.get('auth_signature', '')):
+                    self._reply(401, {'error': 'invalid signature'})
+                elif url.path.endswith(('/events', '/batch_events')):
+                    self._reply(200, fake._record(url.path, json.loads(body)))
+                else:
+                    self._reply(404, {'error': 'not found'})
+
+            def _reply(self, status, payload):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,121 @@
+# utils/fake_smtp.py
+import socketserver
+import threading
+
+
+class FakeSMTPServer:
+    """
+    Local stand-in for an SMTP server, for tests and local development.
+
+    Speaks enough plain SMTP for smtplib and Django's SMTP backend (no TLS,
+    no AUTH) and records every accepted message in `messages` as
+    {'from': ..., 'to': [...], 'data': ...}. `fail_next('RCPT', 550)`
+    answers the next RCPT (or MAIL, or the end of DATA) with that code.
+
+        with FakeSMTPServer() as server, override_settings(**server.settings()):
+            ...
+            server.messages
+    """
+
+    def __init__(self):
+        self.messages  = []
+        self._failures = {}
+        self._lock     = threading.Lock()
+        self._server   = socketserver.ThreadingTCPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def settings(self):
+        """Settings pointing Django's SMTP backend at this server."""
+        return {
+            'EMAIL_BACKEND':       'django.core.mail.backends.smtp.EmailBackend',
+            'EMAIL_HOST':          '127.0.0.1',
+            'EMAIL_PORT':          self.port,
+            'EMAIL_USE_TLS':       False,
+            'EMAIL_USE_SSL':       False,
+            'EMAIL_HOST_USER':     '',
+            'EMAIL_HOST_PASSWORD': '',
+        }
+
+    def fail_next(self, command, code, count=1):
+        with self._lock:
+            self._failures.setdefault(command, []).extend([code] * count)
+
+    def _failure(self, command):
+        with self._lock:
+            codes = self._failures.get(command)
+            return codes.pop(0) if codes else None
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _handler(self):
+        fake = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                self._reply(220, 'fake-smtp ready')
+                envelope = {'from': None, 'to': []}
+                while True:
+                    line = self.rfile.readline()
+                    if not line:
+                        return
+                    line    = line.decode().rstrip('\r\n')
+                    command = line[:4].upper()
+
+                    if command in ('EHLO', 'HELO'):
+                        self._reply(250, 'fake-smtp')
+                    elif command in ('MAIL', 'RCPT') and (code := fake._failure(command)):
+                        self._reply(code, 'injected failure')
+                    elif command == 'MAIL':
+                        envelope = {'from': line.partition(':')[2].strip(' <>'), 'to': []}
+                        self._reply(250, 'OK')
+                    elif command == 'RCPT':
+                        envelope['to'].append(line.partition(':')[2].strip(' <>'))
+                        self._reply(250, 'OK')
+                    elif command == 'DATA':
+                        self._reply(354, 'End data with <CR><LF>.<CR><LF>')
+                        data = self._read_data()
+                        if code := fake._failure('DATA'):
+                            self._reply(code, 'injected failure')
+                        else:
+                            with fake._lock:
+                                fake.messages.append({**envelope, 'data': data})
+                            self._reply(250, 'OK')
+                        envelope = {'from': None, 'to': []}
+                    elif command in ('RSET', 'NOOP'):
+                        envelope = {'from': None, 'to': []} if command == 'RSET' else envelope
+                        self._reply(250, 'OK')
+                    elif command == 'QUIT':
+                        self._reply(221, 'Bye')
+                        return
+                    else:
+                        self._reply(502, 'Command not implemented')
+
+            def _read_data(self):
+                lines = []
+                for line in self.rfile:
+                    line = line.decode().rstrip('\r\n')
+                    if line == '.':
+                        break
+                    lines.append(line[1:] if line.startswith('..') else line)
+                return '\n'.join(lines)
+
+            def _reply(self, code, text):
+                self.wfile.write(f'{code} {text}\r\n'.encode())
+
+        return Handler
@@ -0,0 +1,101 @@
+# utils/models.py
+
+
+class DirtyFieldsMixin:
+    """
+    Remembers the values of `tracked_fields` as they were loaded from (or
+    last saved to) the database, so save() overrides and pre/post_save
+    signals can compare old and new values without re-reading the row.
+
+        class Lead(DirtyFieldsMixin, models.Model):
+            tracked_fields = ['status', 'assigned_to']
+
+        lead.has_changed('status')      # True / False
+        lead.old_value('assigned_to')   # old assigned_to_id
+
+    The snapshot is refreshed after save() returns, so post_save receivers
+    still see the pre-save values. For an unsaved instance old_value() is
+    None and has_changed() is True. A tracked field that was deferred when
+    the row was loaded is fetched on first use (one query for all of them).
+    """
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = instance._tracked_values()
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._remember(kwargs.get('update_fields'))
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._remember(fields)
+
+    # ── Public API
+    def old_value(self, field):
+        """Value of `field` when the row was loaded/last saved (None if unsaved)."""
+        if self._state.adding:
+            return None
+        attname = self._tracked_attname(field)
+        if attname not in self._loaded_values:
+            self._load_missing_values()
+        return self._loaded_values.get(attname)
+
+    def has_changed(self, field):
+        if self._state.adding:
+            return True
+        return self.old_value(field) != getattr(self, self._tracked_attname(field))
+
+    def changed_fields(self):
+        """Names of tracked fields whose value differs from the snapshot."""
+        return [name for name in self.tracked_fields if self.has_changed(name)]
+
+    # ── Internals
+    @property
+    def _loaded_values(self):
+        return self.__dict__.setdefault('_dirty_snapshot', {})
+
+    @_loaded_values.setter
+    def _loaded_values(self, values):
+        self.__dict__['_dirty_snapshot'] = values
+
+    def _remember(self, fields=None):
+        """Copy the current values of `fields` (default: all tracked) into the snapshot."""
+        current = self._tracked_values()
+        if fields is None:
+            self._loaded_values = current
+            return
+        names = {self._meta.get_field(name).attname for name in fields}
+        self._loaded_values.update(
+            (name, value) for name, value in current.items() if name in names
+        )
+
+    def _tracked_attname(self, field):
+        attname = self._meta.get_field(field).attname
+        if attname not in self._tracked_attnames():
+            raise ValueError(f'{type(self).__name__}.{field} is not in tracked_fields')
+        return attname
+
+    def _tracked_attnames(self):
+        return [self._meta.get_field(name).attname for name in self.tracked_fields]
+
+    def _tracked_values(self):
+        # Deferred fields are absent from __dict__; they are loaded lazily
+        return {
+            attname: self.__dict__[attname]
+            for attname in self._tracked_attnames()
+            if attname in self.__dict__
+        }
+
+    def _load_missing_values(self):
+        missing = [name for name in self._tracked_attnames() if name not in self._loaded_values]
+        row = (
+            type(self)._base_manager.using(self._state.db)
+            .filter(pk=self.pk)
+            .values(*missing)
+            .first()
+        )
+        self._loaded_values.update(row or dict.fromkeys(missing))
@@ -0,0 +1,189 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _flip(field):
+    return field[1:] if field.startswith('-') else f'-{field}'
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Page-number pagination with an opt-in keyset (cursor) mode.
+
+    `?page=N` behaves exactly like PageNumberPagination. Sending `?cursor=`
+    (empty for the first page) switches to keyset mode: rows are ordered by
+    `cursor_ordering` and each page starts right after the last row of the
+    previous one, so page 500 costs the same as page 1. The next/previous
+    links carry an opaque cursor token.
+
+    `?count=false` skips the COUNT(*) in either mode; `count` is then null.
+
+    Keyset mode always lists in `cursor_ordering` (or its reverse), so it
+    answers 400 to an `?ordering=` on another field and, without
+    `?ordering=`, to any of `reordering_params` (e.g. a ranked `?search=`).
+    """
+    cursor_query_param   = 'cursor'
+    count_query_param    = 'count'
+    ordering_query_param = 'ordering'
+    reordering_params    = ()
+    cursor_ordering      = ('-created_at', '-id')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request       = request
+        self.cursor_mode   = self.cursor_query_param in request.query_params
+        self.include_count = request.query_params.get(
+            self.count_query_param, ''
+        ).lower() not in ('false', '0', 'no')
+
+        if self.cursor_mode:
+            self._check_cursor_params(request)
+            return self._paginate_by_cursor(queryset, request, view)
+        if self.include_count:
+            return super().paginate_queryset(queryset, request, view)
+        return self._paginate_without_count(queryset, request)
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode and self.include_count:
+            return super().get_paginated_response(data)
+        return Response({
+            'count':    self.count,
+            'next':     self.next_url,
+            'previous': self.previous_url,
+            'results':  data,
+        })
+
+    # ── Page numbers without COUNT(*)
+    def _paginate_without_count(self, queryset, request):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        try:
+            number = int(request.query_params.get(self.page_query_param, 1))
+        except ValueError:
+            number = 0
+        if number < 1:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=request.query_params.get(self.page_query_param),
+                message='That page number is not valid',
+            ))
+
+        offset = (number - 1) * page_size
+        rows   = list(queryset[offset:offset + page_size + 1])
+        if not rows and number > 1:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=number, message='That page contains no results',
+            ))
+
+        url = request.build_absolute_uri()
+        self.count        = None
+        self.next_url     = replace_query_param(url, self.page_query_param, number + 1) if len(rows) > page_size else None
+        self.previous_url = None
+        if number == 2:
+            self.previous_url = remove_query_param(url, self.page_query_param)
+        elif number > 2:
+            self.previous_url = replace_query_param(url, self.page_query_param, number - 1)
+        return rows[:page_size]
+
+    # ── Keyset pages
+    def _check_cursor_params(self, request):
+        params    = request.query_params
+        ordering  = (params.get(self.ordering_query_param) or '').split(',')[0].strip()
+        conflicts = []
+        if not ordering:
+            conflicts = [param for param in self.reordering_params if params.get(param)]
+        elif ordering not in (self.cursor_ordering[0], _flip(self.cursor_ordering[0])):
+            conflicts = [self.ordering_query_param]
+        if conflicts:
+            raise ParseError(
+                f"?{self.cursor_query_param}= lists by {', '.join(self.cursor_ordering)}; "
+                f"drop ?{'= and ?'.join(conflicts)}= or use ?page="
+            )
+
+    def get_cursor_ordering(self, queryset):
+        """cursor_ordering, flipped when the view asked for the opposite direction."""
+        ordering = list(self.cursor_ordering)
+        current  = queryset.query.order_by
+        if current and current[0] == _flip(ordering[0]):
+            ordering = [_flip(field) for field in ordering]
+        return ordering
+
+    def _paginate_by_cursor(self, queryset, request, view):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        ordering = self.get_cursor_ordering(queryset)
+        fields   = [queryset.model._meta.get_field(field.lstrip('-')) for field in ordering]
+        position, reverse = self._decode_cursor(request.query_params.get(self.cursor_query_param), fields)
+
+        self.count = queryset.count() if self.include_count else None
+
+        walk = [_flip(field) for field in ordering] if reverse else ordering
+        qs   = queryset.order_by(*walk)
+        if position is not None:
+            qs = qs.filter(self._after(walk, position))
+
+        rows     = list(qs[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows     = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        has_next     = has_more if not reverse else position is not None
+        has_previous = has_more if reverse else position is not None
+
+        url = request.build_absolute_uri()
+        self.next_url = self.previous_url = None
+        if rows and has_next:
+            self.next_url = replace_query_param(
+                url, self.cursor_query_param, self._encode_cursor(rows[-1], fields, reverse=False),
+            )
+        if rows and has_previous:
+            self.previous_url = replace_query_param(
+                url, self.cursor_query_param, self._encode_cursor(rows[0], fields, reverse=True),
+            )
+        return rows
+
+    @staticmethod
+    def _after(ordering, position):
+        """WHERE clause for rows strictly after `position` in `ordering`."""
+        condition = Q()
+        equal     = Q()
+        for field, value in zip(ordering, position):
+            name   = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal     &= Q(**{name: value})
+        return condition
+
+    @staticmethod
+    def _encode_cursor(row, fields, reverse):
+        payload = {'v': [field.value_to_string(row) for field in fields]}
+        if reverse:
+            payload['r'] = 1
+        raw = json.dumps(payload, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def _decode_cursor(self, token, fields):
+        if not token:
+            return None, False
+        try:
+            raw     = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+            payload = json.loads(raw)
+            values  = payload['v']
+            if len(values) != len(fields):
+                raise ValueError
+            position = [field.to_python(value) for field, value in zip(fields, values)]
+        except (binascii.Error, ValueError, TypeError, KeyError, ValidationError) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+        return position, bool(payload.get('r'))
@@ -0,0 +1,44 @@
+# utils/phone.py
+import re
+
+DEFAULT_COUNTRY_CODE = '91'
+NATIONAL_LENGTH      = 10
+
+_EXCEL_FLOAT = re.compile(r'^\d+\.0+$')
+_EXCEL_SCI   = re.compile(r'^\d(\.\d+)?[eE]\+?\d+$')
+
+
+def normalize_phone(value, country_code=DEFAULT_COUNTRY_CODE):
+    """
+    Canonical digits for a phone number, used for equality matching.
+
+    '98470 12345', '+91 98470-12345', '09847012345', '919847012345',
+    9847012345.0 (Excel) and '9.847012345E9' all become '919847012345'.
+    A bare 10-digit number gets `country_code`; numbers written with '+' or
+    '00' keep their own country code. Returns '' when there are no digits.
+    """
+    if value is None:
+        return ''
+
+    text = str(value).strip()
+    if _EXCEL_FLOAT.match(text) or _EXCEL_SCI.match(text):
+        try:
+            text = str(int(float(text)))
+        except (ValueError, OverflowError):  # e.g. '1e400': keep the raw digits
+            pass
+
+    international = text.startswith('+') or text.startswith('00')
+    digits        = re.sub(r'\D', '', text)
+    if not digits:
+        return ''
+
+    if text.startswith('00'):
+        digits = digits[2:]
+    if international:
+        return digits
+
+    if len(digits) == NATIONAL_LENGTH + 1 and digits.startswith('0'):
+        digits = digits[1:]
+    if len(digits) == NATIONAL_LENGTH:
+        return country_code + digits
+    return digits
@@ -1,6 +1,17 @@
 # utils/pusher.py
+import atexit
+import os
+import queue
+import threading
+import time
+from collections import deque
+
 import pusher
+import requests
 from django.conf import settings
+from django.core.signals import request_finished
+from django.db import transaction
+from pusher.errors import PusherBadStatus
 
 def get_pusher_client():
     try:
@@ -9,21 +20,188 @@ def get_pusher_client():
             key=settings.PUSHER_KEY,
             secret=settings.PUSHER_SECRET,
             cluster=settings.PUSHER_CLUSTER,
-            ssl=True
+            # PUSHER_HOST/PORT point at another server, e.g. utils.fake_pusher
+            host=settings.PUSHER_HOST or None,
+            port=settings.PUSHER_PORT or None,
+            ssl=settings.PUSHER_SSL,
         )
     except Exception as e:
         print(f"[Pusher] Init failed: {e}")
         return None
 
+# Used for channel auth in the request; events go through `dispatcher`
 pusher_client = get_pusher_client()
 
+
+# ── Dispatcher ────────────────────────────────────────
+
+MAX_BATCH_EVENTS = 10      # Pusher's limit for one batch_events call
+BATCH_LINGER     = 0.01    # seconds a worker waits for more events to fill a batch
+LATENCY_SAMPLES  = 1000    # recent events the latency percentiles are taken over
+FLUSH_TIMEOUT    = 5       # seconds queued events get to go out at interpreter exit
+
+# Worth one retry: a dropped keep-alive connection or a 5xx from Pusher
+RETRYABLE_ERRORS = (requests.RequestException, PusherBadStatus)
+
+
+class PusherDispatcher:
+    """
+    Sends Pusher events after the surrounding transaction commits, from
+    background threads, so requests never wait on Pusher's HTTP API.
+
+    Each worker takes up to MAX_BATCH_EVENTS queued events into one
+    trigger_batch call through its own Pusher client, whose requests
+    session keeps the HTTPS connection alive between calls.
+
+    With `threads=0` (the default, for serverless deploys) committed events
+    are held per thread and sent inline, MAX_BATCH_EVENTS per call, as soon
+    as a batch fills and when the request finishes (see send_held). Metrics
+    cover this process only.
+    """
+
+    def __init__(self, threads=None, client_factory=get_pusher_client):
+        self.threads        = settings.PUSHER_DISPATCH_THREADS if threads is None else threads
+        self.client_factory = client_factory
+        self._lock          = threading.Lock()
+        self._pid           = None
+        self._pending       = 0
+        self._latencies     = deque(maxlen=LATENCY_SAMPLES)
+        self._counts        = {'enqueued': 0, 'sent': 0, 'failed': 0, 'batches': 0}
+        self._local         = threading.local()
+        self._held          = threading.local()
+
+    def enqueue(self, channel, event, data):
+        transaction.on_commit(lambda: self._put({'channel': channel, 'name': event, 'data': data}))
+
+    def _put(self, event):
+        item = (time.monotonic(), event)
+        with self._lock:
+            self._counts['enqueued'] += 1
+            self._pending            += 1
+        if not self.threads:
+            held = getattr(self._held, 'items', None)
+            if held is None:
+                held = self._held.items = []
+            held.append(item)
+            if len(held) >= MAX_BATCH_EVENTS:
+                self.send_held()
+            return
+        self._ensure_workers()
+        self._queue.put(item)
+
+    def _ensure_workers(self):
+        # Started lazily, and again in a forked child (threads don't survive fork)
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue()
+            self._local = threading.local()
+            for number in range(self.threads):
+                threading.Thread(target=self._work, name=f'pusher-dispatch-{number}', daemon=True).start()
+            self._pid = os.getpid()
+
+    def _work(self):
+        while True:
+            batch    = [self._queue.get()]
+            deadline = time.monotonic() + BATCH_LINGER
+            while len(batch) < MAX_BATCH_EVENTS:
+                try:
+                    batch.append(self._queue.get(timeout=max(0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            self._send(batch)
+
+    def _client(self):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.client_factory()
+        return client
+
+    def _call(self, send):
+        try:
+            return send()
+        except RETRYABLE_ERRORS:
+            return send()
+
+    def _send(self, items):
+        client = self._client()
+        events = [event for _, event in items]
+        sent   = []
+        try:
+            if client:
+                # trigger_batch encodes the data in place, so it gets copies
+                self._call(lambda: client.trigger_batch([dict(event) for event in events]))
+                sent = items
+        except ValueError:
+            # One invalid event (bad channel, data over the 10KB batch limit)
+            # fails the whole call: send them one by one instead
+            for item in items:
+                _, event = item
+                try:
+                    self._call(lambda: client.trigger(event['channel'], event['name'], event['data']))
+                    sent.append(item)
+                except Exception as e:
+                    print(f"[Pusher] Trigger error: {e}")
+        except Exception as e:
+            print(f"[Pusher] Trigger error: {e}")
+
+        now = time.monotonic()
+        with self._lock:
+            self._counts['batches'] += 1
+            self._counts['sent']    += len(sent)
+            self._counts['failed']  += len(items) - len(sent)
+            self._pending           -= len(items)
+            self._latencies.extend(now - queued_at for queued_at, _ in sent)
+
+    def send_held(self, **kwargs):
+        """Send the events this thread holds in inline mode (a request_finished receiver)."""
+        items, self._held.items = getattr(self._held, 'items', []), []
+        for start in range(0, len(items), MAX_BATCH_EVENTS):
+            self._send(items[start:start + MAX_BATCH_EVENTS])
+
+    def flush(self, timeout=FLUSH_TIMEOUT):
+        """Wait up to `timeout` seconds for queued events to be sent. Returns True if none are left."""
+        self.send_held()
+        deadline = time.monotonic() + timeout
+        while self._pending and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return not self._pending
+
+    def metrics(self):
+        with self._lock:
+            counts    = dict(self._counts)
+            pending   = self._pending
+            latencies = sorted(self._latencies)
+
+        def percentile(share):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * share))] * 1000, 1)
+
+        return {
+            'threads':     self.threads,
+            'queue_depth': pending,
+            **counts,
+            'latency_ms':  {
+                'samples': len(latencies),
+                'p50':     percentile(0.5),
+                'p95':     percentile(0.95),
+                'max':     percentile(1),
+            },
+        }
+
+
+dispatcher = PusherDispatcher()
+# Inline mode: everything a request committed goes out in batches as it ends
+request_finished.connect(dispatcher.send_held, dispatch_uid='pusher-send-held')
+# Cron commands exit right after their last event
+atexit.register(dispatcher.flush)
+
 def trigger_pusher(channel: str, event: str, data: dict):
-    if not pusher_client:
-        return
-    try:
-        pusher_client.trigger(channel, event, data)
-    except Exception as e:
-        print(f"[Pusher] Trigger error: {e}")
+    """Queue an event; it is sent after the current transaction commits."""
+    dispatcher.enqueue(channel, event, data)
 
 def save_notification(user_id, type, message, by=None):
     """Save notification to DB — import inside function to avoid circular imports"""
@@ -124,6 +302,51 @@ def notify_lead_assigned(assignee, assigned_by, lead, assignment_type):
     )
 
 
+def notify_leads_bulk_assigned(assignee_id, assigned_by, leads, assignment_type, uploaded=False):
+    """One grouped event for many leads assigned to the same user (assigned_by None: lead routing)."""
+    by_name = (assigned_by.get_full_name() or assigned_by.username) if assigned_by else 'lead routing'
+    count   = len(leads)
+    if uploaded:
+        message = (
+            f"{count} new lead{'s' if count > 1 else ''} uploaded and "
+            f"assigned to you by {by_name}"
+        )
+    else:
+        message = f"{count} lead{'s' if count > 1 else ''} assigned to you by {by_name}"
+
+    trigger_pusher(
+        channel=f"private-user-{assignee_id}",
+        event="lead.assigned",
+        data={
+            "bulk":             True,
+            "count":            count,
+            "leads":            leads,
+            "assignment_type":  assignment_type,
+            "assigned_by_id":   assigned_by.id if assigned_by else None,
+            "assigned_by_name": by_name,
+            "message":          message,
+        }
+    )
+
+
+# ── Follow-up helpers ─────────────────────────────────
+
+def notify_followup_reminders(user_id, followups, total=None):
+    """One event for all follow-ups coming due for a user in a reminder run."""
+    count   = total if total is not None else len(followups)
+    message = f"{count} follow-up{'s' if count > 1 else ''} due"
+
+    trigger_pusher(
+        channel=f"private-user-{user_id}",
+        event="followup.reminder",
+        data={
+            "count":     count,
+            "followups": followups,
+            "message":   message,
+        }
+    )
+
+
 # ── Chat helpers ──────────────────────────────────────
 
 def notify_new_message(conversation_id, message_data):